@@ -0,0 +1,4 @@
+"""
+Benchmarks for Express Wash Laundry Billing System
+Run each module with `python -m benchmarks.<name>` from the project folder.
+"""
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Order Frame Memory Benchmark for Express Wash Laundry Billing System
+Compares the memory and build time of the orders DataFrame as
+pd.read_sql_query('SELECT * ...') builds it (object strings, dates and ids)
+with the typed frame of streamlit_pages.common (categories, float32, int32,
+datetime64). Every Streamlit session used to hold its own copy of the first;
+the second is loaded once and shared.
+
+    python -m benchmarks.order_frames                  # 1,000,000 orders
+    python -m benchmarks.order_frames --orders 100000
+
+Needs no database: the rows are synthetic orders in the types MySQL Connector
+returns (Decimal amounts, date and datetime objects, None for NULL).
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from benchmarks.suite import SEED, SEED_END_DATE
+
+
+def connector_rows(count):
+    """count synthetic orders as MySQL Connector tuples in order_archive.ORDER_COLUMNS order"""
+    from synthetic_data import CHUNK_SIZE, GeneratorSettings, generate_chunk
+
+    settings = GeneratorSettings(count, seed=SEED, end=SEED_END_DATE)
+    rows = []
+    for chunk in range((count + CHUNK_SIZE - 1) // CHUNK_SIZE):
+        frame = generate_chunk(settings, chunk)
+        first_id = len(rows) + 1
+        order_dates = frame['order_date'].dt.date
+        collected = [value.to_pydatetime() if value == value else None for value in frame['collection_date']]
+        created = list(frame['created_at'].dt.to_pydatetime())
+        for i, order in enumerate(frame.itertuples(index=False)):
+            rows.append((
+                first_id + i, order.receipt_number, None, order.customer_name, order.mobile_number or None,
+                order_dates.iat[i], Decimal(f"{order.regular_clothes_kg:.2f}"), Decimal(f"{order.blankets_kg:.2f}"),
+                int(order.white_clothes_pieces), Decimal(f"{order.total_amount:.2f}"), order.price_list_id,
+                collected[i], created[i]
+            ))
+    return rows
+
+
+def measure_frame(build, rows):
+    """Return (seconds to build, bytes used) of the frame build(rows) returns"""
+    start = time.perf_counter()
+    frame = build(rows)
+    elapsed = time.perf_counter() - start
+    return elapsed, int(frame.memory_usage(deep=True).sum())
+
+
+def main():
+    """Print the memory and build time of the untyped and typed orders frames"""
+    parser = argparse.ArgumentParser(description="Express Wash order frame memory benchmark")
+    parser.add_argument('--orders', type=int, default=1_000_000, help="orders in the frame")
+    args = parser.parse_args()
+
+    import pandas as pd
+    from order_archive import ORDER_COLUMNS
+    from streamlit_pages.common import ORDER_PAGE_COLUMNS, _order_frame
+
+    print(f"🧪 Generating {args.orders:,} orders...")
+    rows = connector_rows(args.orders)
+    page_rows = [tuple(row[ORDER_COLUMNS.index(column)] for column in ORDER_PAGE_COLUMNS) for row in rows]
+
+    # read_sql_query builds its frame with from_records(coerce_float=True)
+    cases = {
+        'read_sql_query, SELECT *': (lambda r: pd.DataFrame.from_records(r, columns=ORDER_COLUMNS, coerce_float=True), rows),
+        'typed, SELECT *': (lambda r: _order_frame(r, ORDER_COLUMNS), rows),
+        'typed, page columns': (_order_frame, page_rows),
+    }
+    print(f"{'Frame':<28}{'Memory':>12}{'Build':>10}")
+    baseline = None
+    for name, (build, case_rows) in cases.items():
+        seconds, used = measure_frame(build, case_rows)
+        baseline = baseline or used
+        print(f"{name:<28}{used / 2**20:>9,.1f} MB{seconds:>9.2f}s  ({used / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Query Plan Checks for Express Wash Laundry Billing System
+Runs EXPLAIN FORMAT=JSON for every statement in query_catalogue.py against a
+seeded benchmark database and fails when a plan reads more rows than the
+threshold with a full table scan, a full index scan, a filesort or a
+temporary table that the catalogue does not accept for that query. Also fails
+when a catalogued statement no longer appears in its source files.
+
+    python -m benchmarks.query_plans                       # express_wash_bench_100k
+    python -m benchmarks.query_plans --scale 1m --threshold 5000
+    python -m benchmarks.query_plans --output plans.json   # keep the plans for review
+
+Only EXPLAIN is run, so the INSERT/UPDATE/DELETE statements change nothing.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import date, timedelta
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from benchmarks.suite import SCALES, seed_database
+from query_catalogue import FRAGMENTS, QUERIES
+
+DEFAULT_THRESHOLD = 1000  # rows examined before an issue counts
+
+
+def normalize(sql):
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def missing_sources(queries, project_dir=PROJECT_DIR):
+    """Return (query name, file) for every catalogued statement not found in its source"""
+    sources = {}
+    missing = []
+    for query in queries:
+        for path in query.sources:
+            if path not in sources:
+                with open(os.path.join(project_dir, path), encoding='utf-8') as f:
+                    sources[path] = normalize(f.read())
+            if normalize(query.sql) not in sources[path]:
+                missing.append((query.name, path))
+    return missing
+
+
+def plan_issues(plan):
+    """Walk an EXPLAIN FORMAT=JSON plan; return [(issue, table, rows)]"""
+    issues = []
+
+    def rows_below(node):
+        if isinstance(node, dict):
+            rows = node.get('rows_examined_per_scan', 0) if 'table_name' in node else 0
+            return max([rows] + [rows_below(value) for value in node.values()])
+        if isinstance(node, list):
+            return max([0] + [rows_below(value) for value in node])
+        return 0
+
+    def walk(node):
+        if isinstance(node, list):
+            for value in node:
+                walk(value)
+            return
+        if not isinstance(node, dict):
+            return
+        if 'table_name' in node:
+            access = node.get('access_type')
+            if access == 'ALL':
+                issues.append(('full_scan', node['table_name'], node.get('rows_examined_per_scan', 0)))
+            elif access == 'index':
+                issues.append(('full_index_scan', node['table_name'], node.get('rows_examined_per_scan', 0)))
+        if node.get('using_filesort'):
+            issues.append(('filesort', None, rows_below(node)))
+        if node.get('using_temporary_table'):
+            issues.append(('temporary', None, rows_below(node)))
+        for value in node.values():
+            walk(value)
+
+    walk(plan)
+    return issues
+
+
+def sample_values(cursor):
+    """Values for the {receipt}, {order_id}, {customer_id} and {since} placeholders"""
+    cursor.execute("SELECT id, receipt_number, customer_id FROM orders ORDER BY id DESC LIMIT 1")
+    row = cursor.fetchone() or (1, 'RW-20251231-001', 1)
+    return {'order_id': row[0], 'receipt': row[1], 'customer_id': row[2],
+            'since': (date.today() - timedelta(weeks=12)).isoformat()}
+
+
+def explain(cursor, query, values):
+    """Return the parsed EXPLAIN FORMAT=JSON plan of a catalogued query"""
+    params = tuple(values[p[1:-1]] if isinstance(p, str) and p.startswith('{') else p for p in query.params)
+    sql = query.sql.format(**FRAGMENTS) if '{' in query.sql else query.sql
+    if params:
+        cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params)
+    else:
+        cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+    return json.loads(cursor.fetchone()[0])
+
+
+def check(config, queries, threshold):
+    """Explain every query; returns [{name, issues, unexpected, plan}]"""
+    import mysql.connector
+
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    values = sample_values(cursor)
+    results = []
+    for query in queries:
+        try:
+            plan = explain(cursor, query, values)
+        except mysql.connector.Error as err:
+            results.append({'name': query.name, 'error': str(err), 'issues': [], 'unexpected': []})
+            continue
+        issues = [(kind, table, rows) for kind, table, rows in plan_issues(plan) if rows >= threshold]
+        results.append({
+            'name': query.name,
+            'issues': issues,
+            'unexpected': [issue for issue in issues if issue[0] not in query.allow],
+            'plan': plan
+        })
+    conn.close()
+    return results
+
+
+def main():
+    """Seed, explain every catalogued query and report plan regressions"""
+    parser = argparse.ArgumentParser(description="Check Express Wash query plans with EXPLAIN")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='100k', help="benchmark database to explain against")
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help=f"rows examined before a scan/sort counts (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--reseed', action='store_true', help="regenerate the benchmark data")
+    parser.add_argument('--output', help="write the plans and issues as JSON")
+    args = parser.parse_args()
+
+    failed = False
+    for name, path in missing_sources(QUERIES):
+        print(f"❌ {name}: statement not found in {path} (update query_catalogue.py)")
+        failed = True
+
+    config = seed_database(args.scale, SCALES[args.scale], reseed=args.reseed)
+    results = check(config, QUERIES, args.threshold)
+
+    print(f"\n🔎 {len(results)} queries on {config['database']}, threshold {args.threshold:,} rows")
+    for result in results:
+        if result.get('error'):
+            print(f"❌ {result['name']}: {result['error']}")
+            failed = True
+            continue
+        if result['unexpected']:
+            failed = True
+        marker = "❌" if result['unexpected'] else ("☑️" if result['issues'] else "✅")
+        described = ", ".join(f"{kind}{f' on {table}' if table else ''} ({rows:,} rows)"
+                              for kind, table, rows in result['issues'])
+        print(f"{marker} {result['name']:<26}{described or 'indexed'}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'database': config['database'], 'threshold': args.threshold, 'results': results},
+                      f, indent=2, default=str)
+        print(f"\n💾 Plans written to {args.output}")
+
+    if failed:
+        print("\n❌ Query plan regressions found (☑️ marks issues the catalogue accepts)")
+        return 1
+    print("\n✅ No unexpected full scans, filesorts or temporary tables")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
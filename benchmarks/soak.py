@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Soak Test for Express Wash Laundry Billing System
+Drives the desktop app (tkinter_app.py) through a counter session for a long
+time with the memory monitor on: open the order list, load and search orders,
+open the reports window, switch tabs and chart types, close everything, and
+repeat. Fails when memory, widgets or matplotlib figures keep growing after
+the warm-up cycles.
+
+    xvfb-run -a python -m benchmarks.soak                      # one hour
+    xvfb-run -a python -m benchmarks.soak --duration 600 --interval 30
+
+Runs against express_wash_bench_1k (seeded by synthetic_data.py on first use).
+Without a display the test re-runs itself under xvfb-run when it is installed.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from benchmarks.suite import SCALES, SEARCH_TERM, _answer_dialogs, has_display, seed_database
+
+VIZ_TYPES = ["Bar Charts", "Pie Charts", "Line Charts", "Area Charts", "Scatter Plots"]
+
+
+def pump(root, seconds=0.05):
+    """Let Tk process events (and the monitor's timer) for a moment"""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        root.update()
+        time.sleep(0.01)
+
+
+def find_widgets(parent, widget_type):
+    """All descendants of parent that are instances of widget_type"""
+    found = []
+    for child in parent.winfo_children():
+        if isinstance(child, widget_type):
+            found.append(child)
+        found.extend(find_widgets(child, widget_type))
+    return found
+
+
+def run_cycle(app, root, cycle):
+    """One pass over the screens a cashier uses, leaving no window open"""
+    import tkinter as tk
+    from tkinter import ttk
+
+    # Order list: load, type a search one key at a time, clear, close
+    app.open_order_list_window()
+    pump(root)
+    app.load_orders()
+    for length in range(1, len(SEARCH_TERM) + 1):
+        app.search_var.set(SEARCH_TERM[:length])
+        pump(root, 0.01)
+    app.search_var.set('')
+    app.order_window.grab_release()
+    app.order_window.destroy()
+    pump(root)
+
+    # Reports: every tab, then every tab again with another chart type
+    known = set(root.winfo_children())
+    app.show_reports()
+    reports_window = next(w for w in root.winfo_children()
+                          if w not in known and isinstance(w, tk.Toplevel))
+    notebook = app.reports_notebook
+    viz_dropdown = find_widgets(reports_window, ttk.Combobox)[0]
+    for viz_type in (VIZ_TYPES[0], VIZ_TYPES[cycle % len(VIZ_TYPES)]):
+        app.current_viz_type.set(viz_type)
+        viz_dropdown.event_generate("<<ComboboxSelected>>")
+        for tab in notebook.tabs():
+            notebook.select(tab)
+            pump(root)
+    app.close_reports_window(reports_window)
+    pump(root)
+
+
+def main():
+    """Run the soak test and check the memory report for growth"""
+    parser = argparse.ArgumentParser(description="Express Wash desktop soak test")
+    parser.add_argument('--duration', type=float, default=3600, help="seconds to run (default: 3600)")
+    parser.add_argument('--interval', type=float, default=60, help="seconds between memory samples")
+    parser.add_argument('--warmup', type=int, default=3,
+                        help="cycles before the baseline is taken (caches, imports, pools)")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='1k', help="benchmark database to use")
+    parser.add_argument('--max-growth', type=float, default=5.0,
+                        help="allowed growth of traced memory after warm-up, in MiB (default: 5)")
+    parser.add_argument('--report', default='soak_memory_report.txt', help="memory report file")
+    args = parser.parse_args()
+
+    if not has_display():
+        if shutil.which('xvfb-run') and not os.environ.get('EXPRESS_WASH_SOAK_XVFB'):
+            print("🖥️ No display: re-running under xvfb-run")
+            env = dict(os.environ, EXPRESS_WASH_SOAK_XVFB='1')
+            return subprocess.call(['xvfb-run', '-a', sys.executable, '-m', 'benchmarks.soak'] + sys.argv[1:],
+                                   cwd=PROJECT_DIR, env=env)
+        print("❌ No display and xvfb-run is not installed")
+        return 1
+
+    import tkinter as tk
+    import tkinter_app
+    from memory_monitor import MemoryMonitor
+
+    config = seed_database(args.scale, SCALES[args.scale])
+    export_dir = tempfile.mkdtemp(prefix='express_wash_soak_')
+    _answer_dialogs(export_dir)
+
+    class SoakApp(tkinter_app.ExpressWashApp):
+        def init_database(self):
+            self.DB_CONFIG = dict(config)
+            super().init_database()
+
+    root = tk.Tk()
+    try:
+        app = SoakApp(root)
+        app.finish_database_init()
+        pump(root)
+
+        monitor = MemoryMonitor(root, interval=args.interval, report_path=args.report)
+        monitor.start()
+        for cycle in range(args.warmup):
+            run_cycle(app, root, cycle)
+        baseline = monitor.take_sample()
+
+        print(f"🔁 Soaking for {args.duration / 60:.0f} min")
+        cycles = 0
+        deadline = time.monotonic() + args.duration
+        while time.monotonic() < deadline:
+            run_cycle(app, root, cycles)
+            cycles += 1
+        monitor.stop()
+        final = monitor.samples[-1]
+    finally:
+        root.destroy()
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+    growth_mib = (final['traced'] - baseline['traced']) / 2**20
+    widget_growth = sum(final['widgets'].values()) - sum(baseline['widgets'].values())
+    print(f"📊 {cycles} cycles; traced memory {growth_mib:+.2f} MiB, widgets {widget_growth:+d}, "
+          f"pyplot figures {final['pyplot_figures']}, live figures {final['live_figures']}")
+    print(f"🧠 Memory report written to {args.report}")
+
+    failures = []
+    if growth_mib > args.max_growth:
+        failures.append(f"traced memory grew {growth_mib:.2f} MiB (limit {args.max_growth} MiB)")
+    if widget_growth > 0:
+        failures.append(f"{widget_growth} widgets were never destroyed")
+    if final['pyplot_figures'] > baseline['pyplot_figures']:
+        failures.append(f"{final['pyplot_figures']} figures still held by pyplot")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print("✅ No growth after warm-up")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
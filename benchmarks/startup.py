@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for Express Wash Laundry Billing System
+Measures how long the desktop apps take to show their first window, and uses
+`python -X importtime` to list the imports that startup pays for.
+
+    python -m benchmarks.startup                 # tkinter_app.py
+    python -m benchmarks.startup --app t --runs 3
+
+Exits with status 1 when the median time to first window is over --target.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> (app class, expression creating the root window)
+APPS = {
+    'tkinter_app': ('ExpressWashApp', "tk.Tk()"),
+    't': ('ExpressWashAppModern', "__import__('ttkbootstrap').Window(themename='litera')"),
+}
+
+# Modules the first window should not need
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib', 'PIL', 'plotly')
+
+DEFAULT_TARGET = 1.0  # seconds
+
+# Child process: build the app, draw the first window, report and exit.
+# Dialogs are printed instead of shown so a missing database cannot block the run.
+FIRST_WINDOW_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import tkinter as tk
+from tkinter import messagebox
+for name in ('showerror', 'showwarning', 'showinfo'):
+    setattr(messagebox, name, lambda title=None, message=None, **kw: print(f"[dialog] {{title}}: {{message}}", file=sys.stderr))
+import {module} as app_module
+if hasattr(app_module, 'Messagebox'):
+    for name in ('show_error', 'show_warning', 'show_info'):
+        setattr(app_module.Messagebox, name, staticmethod(lambda message=None, title=None, **kw: print(f"[dialog] {{title}}: {{message}}", file=sys.stderr)))
+root = {root_factory}
+app = app_module.{app_class}(root)
+root.update()
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"FIRST_WINDOW {{elapsed:.4f}} {{','.join(heavy)}}", flush=True)
+root.destroy()
+'''
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_profile(module, top=10):
+    """Return (total seconds, [(seconds, name), ...]) for importing module, heaviest first"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=PROJECT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total = 0.0
+    imports = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2)) / 1e6
+        depth = len(match.group(3)) // 2
+        name = match.group(4)
+        if name == module:
+            total = cumulative
+        elif depth == 1:
+            # Direct imports of the app module, including everything they pull in
+            imports.append((cumulative, name))
+    imports.sort(reverse=True)
+    return total, imports[:top]
+
+
+def first_window(module):
+    """Run the app once; return (seconds in process, seconds incl. interpreter start, heavy modules)"""
+    app_class, root_factory = APPS[module]
+    script = FIRST_WINDOW_SCRIPT.format(module=module, app_class=app_class,
+                                        root_factory=root_factory, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - start
+    for line in result.stdout.splitlines():
+        if line.startswith('FIRST_WINDOW '):
+            parts = line.split(' ')
+            heavy = [m for m in parts[2].split(',') if m] if len(parts) > 2 else []
+            return float(parts[1]), wall, heavy
+    raise RuntimeError((result.stderr.strip().splitlines() or ['app did not start'])[-1])
+
+
+def has_display():
+    """Return True when Tk can open a window"""
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def main():
+    """Report import costs and time to first window"""
+    parser = argparse.ArgumentParser(description="Express Wash desktop startup benchmark")
+    parser.add_argument('--app', choices=sorted(APPS), default='tkinter_app', help="desktop app module")
+    parser.add_argument('--runs', type=int, default=5, help="number of app starts to time")
+    parser.add_argument('--top', type=int, default=10, help="number of imports to list")
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET,
+                        help="maximum median seconds to first window (default: 1.0)")
+    args = parser.parse_args()
+
+    try:
+        total, imports = import_profile(args.app, args.top)
+    except RuntimeError as err:
+        print(f"❌ Could not import {args.app}: {err}")
+        return 1
+    print(f"📦 import {args.app}: {total * 1000:.0f} ms")
+    for seconds, name in imports:
+        print(f"   {seconds * 1000:8.1f} ms  {name}")
+
+    if not has_display():
+        print("⚠️ No display available; skipping the first-window timing (try xvfb-run)")
+        return 0
+
+    timings = []
+    for _ in range(args.runs):
+        try:
+            in_process, wall, heavy = first_window(args.app)
+        except (RuntimeError, subprocess.TimeoutExpired) as err:
+            print(f"❌ {args.app} failed to start: {err}")
+            return 1
+        timings.append(wall)
+        print(f"🪟 first window after {wall:.3f}s ({in_process:.3f}s after interpreter start)")
+    if heavy:
+        print(f"⚠️ Loaded before the first window: {', '.join(heavy)}")
+
+    median = statistics.median(timings)
+    status = "✅" if median <= args.target else "❌"
+    print(f"{status} median {median:.3f}s (target {args.target:.1f}s)")
+    return 0 if median <= args.target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
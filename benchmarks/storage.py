@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Storage Engine Benchmark for Express Wash Laundry Billing System
+Runs the same order workload against each OrderRepository engine (in-memory,
+SQLite and optionally MySQL) and prints p50/p95 per operation side by side,
+so engines can be compared without the apps or a display.
+
+    python -m benchmarks.storage                        # memory + sqlite, 100k orders
+    python -m benchmarks.storage --orders 1000000 --engines memory,sqlite,mysql
+    python -m benchmarks.storage --sqlite-path orders.db --output storage.json
+
+MySQL runs against express_wash_bench_storage (emptied first). Orders come
+from synthetic_data.py with the suite's seed, so every engine gets the same data.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from benchmarks.suite import BENCH_DB_CONFIG, SEARCH_TERM, SEED, SEED_END_DATE, measure, summarize
+
+STORAGE_DATABASE = 'express_wash_bench_storage'
+
+
+def synthetic_orders(count):
+    """Generate count orders as dicts (same data for every engine)"""
+    from order_repository import orders_from_frame
+    from synthetic_data import CHUNK_SIZE, GeneratorSettings, generate_chunk
+
+    settings = GeneratorSettings(count, seed=SEED, end=SEED_END_DATE)
+    orders = []
+    for chunk in range((count + CHUNK_SIZE - 1) // CHUNK_SIZE):
+        orders.extend(orders_from_frame(generate_chunk(settings, chunk)))
+    return orders
+
+
+def open_engine(name, sqlite_path=None):
+    """Create an empty repository for an engine"""
+    from order_repository import InMemoryOrderRepository, MySQLOrderRepository, SQLiteOrderRepository
+
+    if name == 'memory':
+        return InMemoryOrderRepository()
+    if name == 'sqlite':
+        if sqlite_path and os.path.exists(sqlite_path):
+            os.remove(sqlite_path)
+        return SQLiteOrderRepository(sqlite_path or ':memory:')
+    if name == 'mysql':
+        import mysql.connector
+        from schema import ensure_schema
+
+        conn = mysql.connector.connect(**BENCH_DB_CONFIG)
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {STORAGE_DATABASE}")
+        cursor.execute(f"USE {STORAGE_DATABASE}")
+        ensure_schema(cursor)
+        conn.commit()
+        conn.close()
+        repository = MySQLOrderRepository(dict(BENCH_DB_CONFIG, database=STORAGE_DATABASE))
+        repository.clear()
+        return repository
+    raise ValueError(f"Unknown engine {name!r}")
+
+
+def run_workload(repository, orders, repeat, budget, seed=SEED):
+    """Load the orders and time every repository operation; returns ({operation: samples}, summary)"""
+    rng = random.Random(seed)
+    results = {}
+
+    start = time.perf_counter()
+    repository.insert_many(orders)
+    results['insert_many'] = [time.perf_counter() - start]
+
+    receipts = [rng.choice(orders)['receipt_number'] for _ in range(repeat)]
+    ids = [repository.get_by_receipt(receipt)['id'] for receipt in receipts]
+    pending = [o['receipt_number'] for o in orders if o['collection_date'] is None]
+    pending = rng.sample(pending, min(repeat, len(pending)))
+    total = repository.count()
+    last_day = max(o['order_date'] for o in orders)
+
+    results['get'] = measure(lambda i=iter(ids): repository.get(next(i)), repeat, budget)
+    results['get_by_receipt'] = measure(lambda i=iter(receipts): repository.get_by_receipt(next(i)), repeat, budget)
+    results['search'] = measure(lambda: repository.search(SEARCH_TERM), repeat, budget)
+    results['search_limit_50'] = measure(lambda: repository.search(SEARCH_TERM, limit=50), repeat, budget)
+    results['list_page'] = measure(lambda: repository.list_page(rng.randrange(max(total - 50, 1)), 50),
+                                   repeat, budget)
+    results['count'] = measure(repository.count, repeat, budget)
+    results['last_receipt_number'] = measure(lambda: repository.last_receipt_number('S'), repeat, budget)
+    results['summary'] = measure(repository.summary, repeat, budget)
+    results['service_totals'] = measure(repository.service_totals, repeat, budget)
+    results['revenue_by_day_30d'] = measure(
+        lambda: repository.revenue_by_period('day', last_day - timedelta(days=30)), repeat, budget)
+    results['revenue_by_week_12w'] = measure(
+        lambda: repository.revenue_by_period('week', last_day - timedelta(weeks=12)), repeat, budget)
+    results['revenue_by_month_12m'] = measure(
+        lambda: repository.revenue_by_period('month', last_day - timedelta(days=365)), repeat, budget)
+    results['status_by_day_30d'] = measure(
+        lambda: repository.status_by_day(last_day - timedelta(days=30)), repeat, budget)
+
+    results['update'] = measure(lambda i=iter(ids): repository.update(next(i), {'mobile_number': '9000000000'}),
+                                repeat, budget)
+    results['collect'] = measure(lambda i=iter(pending): repository.collect(next(i)), len(pending), budget)
+
+    new_ids = []
+
+    def insert(i):
+        new_ids.append(repository.insert({
+            'receipt_number': f"BENCH-{i:06d}", 'customer_name': "Benchmark Customer",
+            'mobile_number': '9000000000', 'order_date': last_day, 'regular_clothes_kg': 2.5,
+            'blankets_kg': 1, 'white_clothes_pieces': 3, 'total_amount': 500, 'price_list_id': None
+        }))
+    counter = iter(range(repeat))
+    results['insert'] = measure(lambda: insert(next(counter)), repeat, budget)
+    results['delete'] = measure(lambda i=iter(new_ids): repository.delete(next(i)), len(new_ids), budget)
+
+    return results, repository.summary()
+
+
+def main():
+    """Run the workload against each engine and print a comparison"""
+    parser = argparse.ArgumentParser(description="Compare Express Wash storage engines")
+    parser.add_argument('--orders', type=int, default=100_000, help="orders to load (default: 100,000)")
+    parser.add_argument('--engines', default='memory,sqlite', help="comma-separated: memory, sqlite, mysql")
+    parser.add_argument('--repeat', type=int, default=50, help="samples per operation (default: 50)")
+    parser.add_argument('--budget', type=float, default=30,
+                        help="stop sampling an operation after this many seconds (default: 30)")
+    parser.add_argument('--sqlite-path', help="SQLite file to use instead of an in-memory database")
+    parser.add_argument('--output', help="write the results as JSON")
+    args = parser.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    unknown = [e for e in engines if e not in ('memory', 'sqlite', 'mysql')]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+
+    print(f"🌱 Generating {args.orders:,} orders")
+    orders = synthetic_orders(args.orders)
+
+    results = {}
+    summaries = {}
+    for engine in engines:
+        print(f"⏱️ {engine}")
+        try:
+            repository = open_engine(engine, args.sqlite_path)
+        except Exception as err:
+            print(f"⚠️ Skipping {engine}: {err}")
+            continue
+        try:
+            samples, summaries[engine] = run_workload(repository, orders, args.repeat, args.budget)
+        finally:
+            repository.close()
+        results[engine] = {operation: summarize(values) for operation, values in samples.items() if values}
+
+    if not results:
+        print("❌ No engine could be benchmarked")
+        return 1
+
+    # Every engine ran the same workload, so the totals must agree
+    reference = next(iter(summaries.values()))
+    for engine, summary in summaries.items():
+        if summary != reference:
+            print(f"⚠️ {engine} totals differ: {summary} vs {reference}")
+
+    names = list(results)
+    print(f"\n📊 {args.orders:,} orders, p50 / p95 in ms")
+    print(f"{'Operation':<24}" + "".join(f"{name:>22}" for name in names))
+    for operation in results[names[0]]:
+        cells = []
+        for name in names:
+            stats = results[name].get(operation)
+            cells.append(f"{stats['p50_ms']:>10.3f} / {stats['p95_ms']:<9.3f}" if stats else f"{'-':>22}")
+        print(f"{operation:<24}" + "".join(cells))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'orders': args.orders, 'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
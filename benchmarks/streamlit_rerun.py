@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Streamlit Rerun Benchmark for Express Wash Laundry Billing System
+Streamlit re-executes app.py on every interaction, so rerun latency is what
+users feel. Uses Streamlit's AppTest harness to time the first run, the first
+visit to each page (which imports that page's modules) and repeated reruns.
+
+    python -m benchmarks.streamlit_rerun
+    python -m benchmarks.streamlit_rerun --reruns 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(PROJECT_DIR, 'app.py')
+
+
+def timed_run(at, timeout):
+    """Run the script once and return the elapsed seconds"""
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    return time.perf_counter() - start
+
+
+def benchmark(reruns=10, timeout=60):
+    """Return (first run seconds, {page: (first visit, median rerun, max rerun)}, errors)"""
+    from streamlit.testing.v1 import AppTest
+
+    # Pages import modules relative to the project folder, like `streamlit run app.py`
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    first_run = timed_run(at, timeout)
+    errors = [str(e.value) for e in at.exception]
+
+    pages = {}
+    for page in at.sidebar.selectbox[0].options:
+        at.sidebar.selectbox[0].select(page)
+        first_visit = timed_run(at, timeout)
+        samples = [timed_run(at, timeout) for _ in range(reruns)]
+        pages[page] = (first_visit, statistics.median(samples), max(samples))
+        errors += [f"{page}: {e.value}" for e in at.exception]
+    return first_run, pages, errors
+
+
+def main():
+    """Print startup and rerun latency for every page"""
+    parser = argparse.ArgumentParser(description="Express Wash Streamlit rerun benchmark")
+    parser.add_argument('--reruns', type=int, default=10, help="reruns to time per page")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds allowed per script run")
+    args = parser.parse_args()
+
+    first_run, pages, errors = benchmark(args.reruns, args.timeout)
+    print(f"🚀 First run: {first_run * 1000:.0f} ms")
+    print(f"{'Page':<20}{'First visit':>14}{'Median rerun':>14}{'Max rerun':>12}")
+    for page, (first_visit, median, worst) in pages.items():
+        print(f"{page:<20}{first_visit * 1000:>11.0f} ms{median * 1000:>11.0f} ms{worst * 1000:>9.0f} ms")
+    for error in errors:
+        print(f"⚠️ {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
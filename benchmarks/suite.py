@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Express Wash Laundry Billing System
+Times the hot paths of the desktop and Streamlit apps against seeded MySQL
+databases (express_wash_bench_<scale>, filled by synthetic_data.py) and writes
+JSON with percentiles. A stored result can be used as a baseline to catch
+regressions.
+
+    xvfb-run -a python -m benchmarks.suite --scales 1k,100k --output results.json
+    xvfb-run -a python -m benchmarks.suite --scales 1k --compare results.json
+
+Desktop paths drive the real Tk handlers and need a display (Xvfb on Linux);
+without one only the Streamlit paths are run. Dialogs are answered
+automatically and exports go to a temporary folder.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+BENCH_DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995'
+}
+
+SEED = 2024
+SEED_END_DATE = date(2025, 12, 31)
+
+# Typed one character at a time into the order search box
+SEARCH_TERM = 'Sharma'
+
+# Customer of the orders saved by the timed save_order path (removed again afterwards)
+BENCH_CUSTOMER = ("Benchmark Customer", "9000000000")
+
+# Emptied together before a reseed, so no customer or item of the old seed survives
+SEEDED_TABLES = ('order_items', 'orders_archive', 'orders', 'customers')
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# --- Measurement ---
+
+def percentile(sorted_samples, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    position = (len(sorted_samples) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Return count, mean, min, max and percentiles in milliseconds"""
+    ordered = sorted(s * 1000 for s in samples)
+    stats = {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3)
+    }
+    for pct in PERCENTILES:
+        stats[f'p{pct}_ms'] = round(percentile(ordered, pct), 3)
+    return stats
+
+
+def measure(func, repeat, budget, setup=None):
+    """Time func() up to repeat times, stopping early once budget seconds are used (min. 1 run)"""
+    samples = []
+    started = time.perf_counter()
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget:
+            break
+    return samples
+
+
+# --- Seeded databases ---
+
+def bench_config(scale):
+    return dict(BENCH_DB_CONFIG, database=f"express_wash_bench_{scale}")
+
+
+def seed_database(scale, orders, reseed=False, workers=None):
+    """Create express_wash_bench_<scale> and fill it with synthetic orders if needed"""
+    import mysql.connector
+    from pricing import PricingEngine
+    from schema import ensure_schema
+    from synthetic_data import GeneratorSettings, generate
+
+    config = bench_config(scale)
+    conn = mysql.connector.connect(**BENCH_DB_CONFIG)
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {config['database']}")
+    cursor.execute(f"USE {config['database']}")
+    ensure_schema(cursor)
+    cursor.execute("SELECT COUNT(*) FROM orders")
+    existing = cursor.fetchone()[0]
+    if existing != orders or reseed:
+        print(f"🌱 Seeding {config['database']} with {orders:,} orders")
+        # orders references customers, which TRUNCATE refuses while the key is checked
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in SEEDED_TABLES:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        price_lists = PricingEngine.from_cursor(cursor).price_lists
+        conn.commit()
+        settings = GeneratorSettings(orders, seed=SEED, end=SEED_END_DATE, price_lists=price_lists)
+        generate(settings, workers=workers, db_config=config)
+    conn.commit()
+    conn.close()
+    return config
+
+
+def pending_receipts(config, limit):
+    """Receipt numbers of uncollected orders, for the mark_as_collected path"""
+    import mysql.connector
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    cursor.execute("SELECT receipt_number FROM orders WHERE collection_date IS NULL LIMIT %s", (limit,))
+    receipts = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return receipts
+
+
+def undo_timed_writes(config, receipt_prefix, collected):
+    """Remove the orders saved and reopen the orders collected by the timed paths
+
+    The seeded database then still has the seeded orders only, so the next run
+    does not see a changed order count and reseed.
+    """
+    import mysql.connector
+    from data_version import bump_data_version
+
+    conn = mysql.connector.connect(**config)
+    cursor = conn.cursor()
+    pattern = f"{receipt_prefix}%"
+    cursor.execute('''
+        DELETE i FROM order_items i JOIN orders o ON o.id = i.order_id
+        WHERE o.receipt_number LIKE %s
+    ''', (pattern,))
+    cursor.execute('DELETE FROM orders WHERE receipt_number LIKE %s', (pattern,))
+    cursor.execute('''
+        DELETE c FROM customers c LEFT JOIN orders o ON o.customer_id = c.id
+        WHERE c.name = %s AND c.mobile_number = %s AND o.id IS NULL
+    ''', BENCH_CUSTOMER)
+    if collected:
+        cursor.execute(f"UPDATE orders SET collection_date = NULL "
+                       f"WHERE receipt_number IN ({', '.join(['%s'] * len(collected))})", collected)
+    bump_data_version(cursor)
+    conn.commit()
+    conn.close()
+
+
+# --- Desktop (Tkinter) paths ---
+
+def _answer_dialogs(export_dir):
+    """Replace modal dialogs so handlers run unattended"""
+    from tkinter import filedialog, messagebox
+    for name in ('showinfo', 'showwarning', 'showerror'):
+        setattr(messagebox, name, lambda *args, **kwargs: 'ok')
+    messagebox.askyesno = lambda *args, **kwargs: True
+    counter = iter(range(1_000_000))
+    filedialog.asksaveasfilename = lambda *args, **kwargs: os.path.join(export_dir, f"export_{next(counter)}.csv")
+    import webbrowser
+    webbrowser.open = lambda *args, **kwargs: True
+
+
+def run_desktop_paths(config, repeat, budget):
+    """Time the Tkinter handlers against one database; returns {path: samples}"""
+    import tkinter as tk
+    import tkinter_app
+    import matplotlib.pyplot as plt
+
+    export_dir = tempfile.mkdtemp(prefix='express_wash_bench_')
+    _answer_dialogs(export_dir)
+
+    class BenchmarkApp(tkinter_app.ExpressWashApp):
+        def init_database(self):
+            self.DB_CONFIG = dict(config)
+            super().init_database()
+
+    root = tk.Tk()
+    results = {}
+    receipt_prefix = f"BENCH-{datetime.now().strftime('%H%M%S')}-"
+    receipts = []
+    try:
+        app = BenchmarkApp(root)
+        app.finish_database_init()
+        root.update()
+
+        results['desktop.generate_receipt_number'] = measure(app.generate_receipt_number, repeat, budget)
+
+        app.open_order_list_window()
+        root.update()
+
+        def load_orders():
+            app.load_orders()
+            root.update_idletasks()
+        results['desktop.load_orders'] = measure(load_orders, repeat, budget)
+
+        # Every keystroke runs filter_orders through the search_var trace
+        keystrokes = []
+        for _ in range(max(1, repeat // len(SEARCH_TERM))):
+            for length in range(1, len(SEARCH_TERM) + 1):
+                start = time.perf_counter()
+                app.search_var.set(SEARCH_TERM[:length])
+                root.update_idletasks()
+                keystrokes.append(time.perf_counter() - start)
+            app.search_var.set('')
+        results['desktop.filter_orders_keystroke'] = keystrokes
+
+        def fill_form(i):
+            app.receipt_number_var.set(f"{receipt_prefix}{i}")
+            app.customer_name_var.set(BENCH_CUSTOMER[0])
+            app.mobile_var.set(BENCH_CUSTOMER[1])
+            app.order_date_var.set(date.today().strftime('%Y-%m-%d'))
+            app.regular_clothes_var.set("2.5")
+            app.blankets_var.set("1")
+            app.white_clothes_var.set("3")
+        results['desktop.save_order'] = measure(app.save_order, repeat, budget, setup=fill_form)
+
+        receipts = pending_receipts(config, repeat)
+        if receipts:
+            results['desktop.mark_as_collected'] = measure(
+                app.mark_as_collected, len(receipts), budget,
+                setup=lambda i: app.collection_receipt_var.set(receipts[i]))
+
+        results['desktop.export_data'] = measure(app.export_data, repeat, budget)
+
+        results['desktop.report.get_summary_data'] = measure(app.get_summary_data, repeat, budget)
+        results['desktop.report.get_status_data'] = measure(app.get_status_data, repeat, budget)
+        reports_window = tk.Toplevel(root)
+        for name in ('create_summary_dashboard', 'create_revenue_analysis',
+                     'create_order_status_analysis', 'create_time_based_reports'):
+            builder = getattr(app, name)
+
+            def build_tab(builder=builder):
+                frame = tk.Frame(reports_window)
+                frame.pack()
+                builder(frame)
+                root.update_idletasks()
+                frame.destroy()
+                plt.close('all')
+            results[f'desktop.report.{name}'] = measure(build_tab, repeat, budget)
+        reports_window.destroy()
+    finally:
+        root.destroy()
+        shutil.rmtree(export_dir, ignore_errors=True)
+        undo_timed_writes(config, receipt_prefix, receipts)
+    return results
+
+
+# --- Streamlit paths ---
+
+def run_streamlit_paths(config, repeat, budget, timeout=300):
+    """Time Streamlit pages through AppTest against one database; returns {path: samples}"""
+    from streamlit.testing.v1 import AppTest
+    from streamlit_pages import common
+
+    # Page modules share this dict, so updating it points every page at the benchmark database
+    common.DB_CONFIG.update(config)
+    common.get_pricing_engine.clear()
+    common.init_database.clear()
+
+    at = AppTest.from_file(os.path.join(PROJECT_DIR, 'app.py'), default_timeout=timeout)
+    at.run()
+
+    results = {'streamlit.load_orders': measure(common.load_orders, repeat, budget)}
+    for page, key in (("📊 Order History", 'order_history_page'), ("📈 Analytics", 'analytics_page')):
+        at.sidebar.selectbox[0].select(page)
+        results[f'streamlit.{key}'] = measure(lambda: at.run(timeout=timeout), repeat, budget)
+    errors = [str(e.value) for e in at.exception]
+    if errors:
+        print(f"⚠️ Streamlit errors: {errors}")
+    return results
+
+
+# --- Results ---
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Return (scale, path, metric, baseline ms, current ms) for every regression over threshold"""
+    regressions = []
+    for scale, paths in results['results'].items():
+        for path, stats in paths.items():
+            before = baseline.get('results', {}).get(scale, {}).get(path)
+            if not before:
+                continue
+            for metric in ('p50_ms', 'p95_ms'):
+                if before[metric] > 0 and stats[metric] > before[metric] * (1 + threshold):
+                    regressions.append((scale, path, metric, before[metric], stats[metric]))
+    return regressions
+
+
+def has_display():
+    return bool(os.environ.get('DISPLAY')) or sys.platform.startswith('win') or sys.platform == 'darwin'
+
+
+def main():
+    """Seed, run every path at each scale, write JSON and optionally compare with a baseline"""
+    parser = argparse.ArgumentParser(description="Express Wash end-to-end benchmark suite")
+    parser.add_argument('--scales', default='1k,100k,1m',
+                        help=f"comma-separated scales from {', '.join(SCALES)} (default: all)")
+    parser.add_argument('--repeat', type=int, default=10, help="samples per path (default: 10)")
+    parser.add_argument('--budget', type=float, default=60,
+                        help="stop sampling a path after this many seconds (default: 60)")
+    parser.add_argument('--only', choices=['desktop', 'streamlit'], help="run only one front end")
+    parser.add_argument('--reseed', action='store_true', help="regenerate the benchmark databases")
+    parser.add_argument('--workers', type=int, help="worker processes for seeding")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare against a stored results file")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed slowdown before a path counts as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    run_desktop = args.only != 'streamlit'
+    if run_desktop and not has_display():
+        print("⚠️ No display: skipping desktop paths (run under xvfb-run for the full suite)")
+        run_desktop = False
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'scales': {s: SCALES[s] for s in scales}
+        },
+        'results': {}
+    }
+
+    for scale in scales:
+        config = seed_database(scale, SCALES[scale], args.reseed, args.workers)
+        samples = {}
+        if run_desktop:
+            samples.update(run_desktop_paths(config, args.repeat, args.budget))
+        if args.only != 'desktop':
+            samples.update(run_streamlit_paths(config, args.repeat, args.budget))
+        results['results'][scale] = {path: summarize(values) for path, values in samples.items() if values}
+
+        print(f"\n📊 {scale} ({SCALES[scale]:,} orders)")
+        print(f"{'Path':<48}{'p50 (ms)':>11}{'p95 (ms)':>11}{'max (ms)':>11}")
+        for path, stats in results['results'][scale].items():
+            print(f"{path:<48}{stats['p50_ms']:>11.1f}{stats['p95_ms']:>11.1f}{stats['max_ms']:>11.1f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for scale, path, metric, before, after in regressions:
+                print(f"   {scale} {path} {metric}: {before:.1f} → {after:.1f} ms")
+            return 1
+        print(f"✅ No regressions over {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
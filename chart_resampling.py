@@ -0,0 +1,90 @@
+"""
+Chart Resampling for Express Wash Laundry Billing System
+Fits a daily series into the width of a chart without losing revenue.
+
+Bars, areas and pies show sums, so long periods are bucketed into weeks or
+months (whichever is the smallest that fits) and each bucket is the sum of
+its days, computed with numpy's reduceat. Line and scatter charts keep the
+daily values and drop points with Largest-Triangle-Three-Buckets (LTTB),
+which keeps the peaks and dips that a plain every-nth sample skips.
+"""
+
+import numpy as np
+
+MIN_BAR_PX = 20  # narrower bars are unreadable
+MIN_POINT_PX = 4  # closer line points add nothing visible
+BUCKET_DAYS = {'day': 1, 'week': 7, 'month': 30}
+
+
+def choose_period(days, width_px, min_px=MIN_BAR_PX):
+    """Smallest of day/week/month whose buckets over days fit width_px"""
+    slots = max(width_px // min_px, 1)
+    for period, length in BUCKET_DAYS.items():
+        if days / length <= slots:
+            return period
+    return 'month'
+
+
+def bucket_starts(dates, period):
+    """First day of the day/week/month bucket of each date (datetime64[D] array)"""
+    days = np.asarray(dates, dtype='datetime64[D]')
+    if period == 'day':
+        return days
+    if period == 'week':
+        weekday = (days.view('int64') - 4) % 7  # 1970-01-01 was a Thursday; weeks start on Monday
+        return days - weekday.astype('timedelta64[D]')
+    if period == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(BUCKET_DAYS)}")
+
+
+def bucket_sums(dates, values, period):
+    """Sum values per bucket; dates must be sorted. Returns (bucket start dates, sums)"""
+    if len(dates) == 0:
+        return np.array([], dtype='datetime64[D]'), np.array([], dtype=float)
+    starts = bucket_starts(dates, period)
+    # Sorted dates give sorted buckets: each bucket begins where its start first appears
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    return starts[first], np.add.reduceat(np.asarray(values, dtype=float), first)
+
+
+def lttb(x, y, threshold):
+    """Indexes of the threshold points that best keep the shape of (x, y); x ascending"""
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # First and last points stay; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    chosen = np.empty(threshold, dtype=int)
+    chosen[0], chosen[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The next bucket's average is the third corner of the triangle
+        following = slice(edges[bucket + 1], edges[bucket + 2] if bucket + 2 < len(edges) else count)
+        next_x, next_y = x[following].mean(), y[following].mean()
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(area.argmax())
+        chosen[bucket + 1] = previous
+    return chosen
+
+
+def downsample(dates, values, width_px, kind='bar'):
+    """Resample a sorted daily series for a chart; returns (dates, values, period)
+
+    kind 'bar' (also areas and pies) sums into day/week/month buckets;
+    kind 'line' (also scatter plots) keeps daily values and thins them with LTTB.
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    values = np.asarray(values, dtype=float)
+    if kind == 'line':
+        keep = lttb(dates.view('int64'), values, max(width_px // MIN_POINT_PX, 3))
+        return dates[keep], values[keep], 'day'
+    days = int((dates[-1] - dates[0]).astype(int)) + 1 if len(dates) else 0
+    period = choose_period(days, width_px)
+    starts, sums = bucket_sums(dates, values, period)
+    return starts, sums, period
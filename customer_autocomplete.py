@@ -0,0 +1,119 @@
+"""
+Customer Suggestions for Express Wash Laundry Billing System
+Drop-down list under the customer name and mobile entries of the desktop
+order forms. Each keystroke looks the text up in a CustomerIndex; choosing
+a suggestion (Enter for the first one, a click, or Down then Enter) fills
+in the form.
+"""
+
+import tkinter as tk
+
+from customer_index import DEFAULT_LIMIT, REFRESH_INTERVAL, describe
+
+# Keys that move through the list instead of changing the text
+NAVIGATION_KEYS = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab', 'Shift_L', 'Shift_R',
+                   'Control_L', 'Control_R', 'Alt_L', 'Alt_R', 'Left', 'Right', 'Home', 'End'}
+
+
+class CustomerAutocomplete:
+    """Suggestion list shared by the name and mobile entries of one form"""
+
+    def __init__(self, index, entries, on_pick, rows=DEFAULT_LIMIT):
+        self.index = index
+        self.entries = entries
+        self.on_pick = on_pick
+        self.rows = rows
+        self.matches = []
+        self.active_entry = None
+
+        self.listbox = tk.Listbox(entries[0].winfo_toplevel(), height=rows, activestyle='dotbox',
+                                  font=('Arial', 10), bg='white', fg='#1f2937',
+                                  selectbackground='#3b82f6', selectforeground='white',
+                                  relief='solid', borderwidth=1, exportselection=False)
+        self.listbox.bind('<Return>', self.pick_selected)
+        self.listbox.bind('<KP_Enter>', self.pick_selected)
+        self.listbox.bind('<ButtonRelease-1>', self.pick_selected)
+        self.listbox.bind('<Escape>', self.close_and_return)
+        self.listbox.bind('<Up>', self.on_listbox_up)
+        self.listbox.bind('<FocusOut>', self.on_focus_out)
+
+        for entry in entries:
+            entry.bind('<KeyRelease>', self.on_key, add='+')
+            entry.bind('<Down>', self.focus_list, add='+')
+            entry.bind('<Return>', self.pick_first, add='+')
+            entry.bind('<Escape>', lambda event: self.hide(), add='+')
+            entry.bind('<FocusIn>', lambda event: self.index.refresh_async(REFRESH_INTERVAL), add='+')
+            entry.bind('<FocusOut>', self.on_focus_out, add='+')
+
+    def on_key(self, event):
+        if event.keysym in NAVIGATION_KEYS:
+            return
+        self.active_entry = event.widget
+        self.show(self.index.search(event.widget.get(), self.rows))
+
+    def show(self, matches):
+        """Show matches under the active entry (hide the list when there are none)"""
+        self.matches = matches
+        if not matches or self.active_entry is None:
+            self.hide()
+            return
+        self.listbox.delete(0, tk.END)
+        for customer in matches:
+            self.listbox.insert(tk.END, describe(customer))
+        self.listbox.configure(height=len(matches), width=max(len(describe(c)) for c in matches) + 2)
+        self.listbox.place(in_=self.active_entry, x=0, rely=1.0, y=2)
+        self.listbox.lift()
+
+    def hide(self):
+        self.matches = []
+        self.listbox.place_forget()
+
+    def focus_list(self, event=None):
+        if not self.matches:
+            return None
+        self.listbox.focus_set()
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+        return 'break'
+
+    def on_listbox_up(self, event):
+        # Up from the first suggestion goes back to the entry
+        if self.listbox.curselection() == (0,) and self.active_entry is not None:
+            self.active_entry.focus_set()
+            return 'break'
+        return None
+
+    def pick_first(self, event=None):
+        if not self.matches:
+            return None
+        self.pick(self.matches[0])
+        return 'break'
+
+    def pick_selected(self, event=None):
+        selection = self.listbox.curselection()
+        if selection and selection[0] < len(self.matches):
+            self.pick(self.matches[selection[0]])
+        return 'break'
+
+    def pick(self, customer):
+        self.hide()
+        self.on_pick(customer)
+
+    def close_and_return(self, event=None):
+        self.hide()
+        if self.active_entry is not None:
+            self.active_entry.focus_set()
+        return 'break'
+
+    def on_focus_out(self, event):
+        # Clicking a suggestion moves the focus to the list first; only hide when it went elsewhere
+        self.listbox.after(150, self._hide_unless_focused)
+
+    def _hide_unless_focused(self):
+        try:
+            focused = self.listbox.focus_get()
+        except (KeyError, tk.TclError):
+            focused = None
+        if focused is not self.listbox and focused not in self.entries:
+            self.hide()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Duplicate Customer Detection for Express Wash Laundry Billing System
+Finds customers entered more than once (the same mobile number with another
+spelling of the name, a mistyped mobile, a walk-in without a mobile number)
+and merges them: the orders move to one surviving customer and the others
+are deleted, in a single transaction.
+
+Customers are only compared within blocks that share a normalised mobile
+number or the phonetic key of the name, so the work grows with the block
+sizes instead of with the square of the customer count. The pairs of a block
+are scored with numpy over the whole block at once, and the blocks are spread
+over worker processes.
+
+    python customer_dedup.py                          # find duplicates, write customer_merges.csv
+    python customer_dedup.py --plan review.csv --workers 8
+    python customer_dedup.py --apply review.csv       # merge a reviewed plan
+"""
+
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from data_version import bump_data_version
+from fuzzy_names import folded, phonetic_key
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995',
+    'database': 'express_wash'
+}
+
+MOBILE_DIGITS = 10  # Indian mobiles; +91 and leading 0 prefixes are dropped
+MERGE_SCORE = 0.75
+MAX_BLOCK = 500  # larger blocks are common names, not duplicates; they are skipped
+PARALLEL_MIN = 50_000  # fewer customers are scored in-process
+APPLY_BATCH = 10_000
+
+PLAN_COLUMNS = ['survivor_id', 'survivor_name', 'survivor_mobile', 'merged_id', 'merged_name',
+                'merged_mobile', 'merged_orders', 'score', 'reason']
+
+# Orders are counted in both tables (from customer_idx), so archived history counts too
+CUSTOMERS_QUERY = '''
+    SELECT c.id, c.name, c.mobile_number, COALESCE(o.orders, 0) + COALESCE(a.orders, 0)
+    FROM customers c
+    LEFT JOIN (SELECT customer_id, COUNT(*) AS orders FROM orders GROUP BY customer_id) o
+        ON o.customer_id = c.id
+    LEFT JOIN (SELECT customer_id, COUNT(*) AS orders FROM orders_archive GROUP BY customer_id) a
+        ON a.customer_id = c.id
+'''
+
+
+def name_features(name):
+    """(folded name, phonetic key of the name, key of the first word, word count)"""
+    words = str(name or '').split()
+    keys = [phonetic_key(word) for word in words]
+    return ' '.join(folded(word) for word in words), ' '.join(keys), keys[0] if keys else '', len(words)
+
+
+def customer_features(customers):
+    """Add the mobile (as a number, 0 when missing) and integer codes of the name features"""
+    features = customers.copy()
+    # The last MOBILE_DIGITS digits; shorter numbers count as missing
+    digits = features['mobile_number'].fillna('').astype(str).str.replace(r'\D', '', regex=True)
+    mobiles = digits.str[-MOBILE_DIGITS:].where(digits.str.len() >= MOBILE_DIGITS, '0')
+    features['mobile'] = pd.to_numeric(mobiles).astype(np.int64)
+    # Names repeat a lot, so work out each distinct name once; codes make the pair comparisons integer ones
+    names = pd.Series(features['name'].unique())
+    table = pd.DataFrame(names.map(name_features).tolist(), index=names,
+                         columns=['folded', 'name_key', 'first_key', 'words'])
+    for column in ('folded', 'name_key', 'first_key'):
+        codes, _ = pd.factorize(table[column])
+        # Code -1 stands for a blank name
+        table[column] = np.where(table[column] == '', -1, codes)
+    return features.join(table, on='name')
+
+
+def blocks(features):
+    """(block, row) for every customer under its mobile and under its name key"""
+    by_mobile = features.loc[features['mobile'] != 0, 'mobile']
+    by_name = features.loc[features['name_key'] >= 0, 'name_key']
+    # Name blocks are numbered below zero so they never meet a mobile block
+    keyed = pd.concat([by_mobile, -1 - by_name]).rename('block')
+    return keyed.rename_axis('row').reset_index()
+
+
+def mobile_typos(a, b):
+    """(one digit differs, two neighbouring digits are swapped) for two arrays of mobiles (as numbers)"""
+    digits_a = np.stack([a // 10 ** place % 10 for place in range(MOBILE_DIGITS)])
+    digits_b = np.stack([b // 10 ** place % 10 for place in range(MOBILE_DIGITS)])
+    differing = digits_a != digits_b
+    count = differing.sum(axis=0)
+    swapped = (differing[:-1] & differing[1:]
+               & (digits_a[:-1] == digits_b[1:]) & (digits_a[1:] == digits_b[:-1])).any(axis=0)
+    present = (a != 0) & (b != 0)
+    return present & (count == 1), present & (count == 2) & swapped
+
+
+def score_pairs(left, right):
+    """Score candidate pairs (dicts of aligned feature arrays); returns (score, reason) arrays"""
+    same_name = left['folded'] == right['folded']
+    sounds_same = left['name_key'] == right['name_key']
+    # "Sita" and "Sita Verma": one name is just the first word of the other
+    short_name = ((left['words'] == 1) | (right['words'] == 1)) & (left['first_key'] == right['first_key'])
+    name_score = np.select([same_name, sounds_same, short_name], [1.0, 0.85, 0.7], 0.0)
+
+    mobile_a, mobile_b = left['mobile'], right['mobile']
+    same_mobile = (mobile_a == mobile_b) & (mobile_a != 0)
+    missing_mobile = (mobile_a == 0) | (mobile_b == 0)
+    # Digit by digit comparison only for the pairs whose names match at all
+    one_digit = np.zeros(len(mobile_a), dtype=bool)
+    swapped = np.zeros(len(mobile_a), dtype=bool)
+    check = (name_score > 0) & ~same_mobile & ~missing_mobile
+    one_digit[check], swapped[check] = mobile_typos(mobile_a[check], mobile_b[check])
+    # Family members often have numbers one digit apart (9000000001, 9000000002), so a single
+    # changed digit is a typo only for a customer with one order: a number mistyped once
+    mistyped_once = one_digit & ((left['orders'] == 1) | (right['orders'] == 1))
+    mobile_score = np.select([same_mobile, swapped, mistyped_once, missing_mobile], [1.0, 0.9, 0.8, 0.5], 0.0)
+
+    # Two different mobile numbers are two customers, however alike the names
+    score = np.where(mobile_score > 0, (name_score + mobile_score) / 2, 0.0)
+    reason = np.select([same_mobile, swapped, mistyped_once, missing_mobile],
+                       ['same mobile', 'mobile digits swapped', 'mobile typo on a single order', 'no mobile'], '')
+    return score, reason
+
+
+def score_blocks(features, keyed):
+    """Candidate pairs of every block scoring at least MERGE_SCORE, as a DataFrame"""
+    sizes = keyed.groupby('block')['row'].transform('size')
+    keyed = keyed[(sizes > 1) & (sizes <= MAX_BLOCK)]
+    pairs = keyed.merge(keyed, on='block', suffixes=('_a', '_b'))
+    pairs = pairs[pairs['row_a'] < pairs['row_b']]
+    columns = ['id', 'mobile', 'orders', 'folded', 'name_key', 'first_key', 'words']
+    rows_a = features.index.get_indexer(pairs['row_a'])
+    rows_b = features.index.get_indexer(pairs['row_b'])
+    left = {column: features[column].to_numpy()[rows_a] for column in columns}
+    right = {column: features[column].to_numpy()[rows_b] for column in columns}
+    score, reason = score_pairs(left, right)
+    matched = score >= MERGE_SCORE
+    return pd.DataFrame({
+        'id_a': left['id'][matched],
+        'id_b': right['id'][matched],
+        'score': score[matched],
+        'reason': reason[matched]
+    })
+
+
+def _score_partition(args):
+    features, keyed = args
+    return score_blocks(features, keyed)
+
+
+def find_duplicate_pairs(features, workers=None):
+    """Score every block, in worker processes for large customer lists; returns (pairs, skipped blocks)"""
+    keyed = blocks(features)
+    sizes = keyed['block'].value_counts()
+    skipped = int((sizes > MAX_BLOCK).sum())
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(features) < PARALLEL_MIN:
+        pairs = score_blocks(features, keyed)
+    else:
+        # A block never spans partitions, so each worker sees all the pairs of its blocks
+        partition = pd.util.hash_pandas_object(keyed['block'], index=False).to_numpy() % workers
+        tasks = []
+        for number in range(workers):
+            part = keyed[partition == number]
+            rows = part['row'].unique()
+            tasks.append((features.loc[rows], part))
+        with Pool(workers) as pool:
+            pairs = pd.concat(pool.map(_score_partition, tasks), ignore_index=True)
+
+    # A pair found under both its mobile and its name keeps the better score
+    pairs = pairs.sort_values('score', ascending=False).drop_duplicates(['id_a', 'id_b'])
+    return pairs, skipped
+
+
+def _drop_ambiguous(pairs, features):
+    """A customer without a mobile that matches customers with different mobiles could be any of them"""
+    mobiles = features.set_index('id')['mobile']
+    mobile_a = pairs['id_a'].map(mobiles)
+    mobile_b = pairs['id_b'].map(mobiles)
+    walk_in = pd.concat([
+        pd.DataFrame({'id': pairs['id_a'], 'other_mobile': mobile_b})[mobile_a.eq(0).to_numpy()],
+        pd.DataFrame({'id': pairs['id_b'], 'other_mobile': mobile_a})[mobile_b.eq(0).to_numpy()]
+    ])
+    walk_in = walk_in[walk_in['other_mobile'] != 0]
+    counts = walk_in.groupby('id')['other_mobile'].nunique()
+    ambiguous = counts.index[counts > 1]
+    return pairs[~pairs['id_a'].isin(ambiguous) & ~pairs['id_b'].isin(ambiguous)]
+
+
+def build_merge_plan(customers, workers=None):
+    """Return (plan DataFrame with PLAN_COLUMNS, blocks skipped as too large)"""
+    features = customer_features(customers.reset_index(drop=True))
+    pairs, skipped = find_duplicate_pairs(features, workers)
+    pairs = _drop_ambiguous(pairs, features)
+
+    # Group the pairs into clusters of one customer each
+    parent = {}
+
+    def root(customer_id):
+        parent.setdefault(customer_id, customer_id)
+        while parent[customer_id] != customer_id:
+            parent[customer_id] = parent[parent[customer_id]]
+            customer_id = parent[customer_id]
+        return customer_id
+
+    for id_a, id_b in zip(pairs['id_a'], pairs['id_b']):
+        parent[root(id_a)] = root(id_b)
+    if not parent:
+        return pd.DataFrame(columns=PLAN_COLUMNS), skipped
+
+    # The survivor has a mobile number if any does, then the most orders, then the lowest id
+    members = features[features['id'].isin(list(parent))].copy()
+    members['cluster'] = members['id'].map(root)
+    members['has_mobile'] = members['mobile'] != 0
+    members = members.sort_values(['cluster', 'has_mobile', 'orders', 'id'], ascending=[True, False, False, True])
+    survivors = members.groupby('cluster').head(1).set_index('cluster')
+    merged = members[~members['id'].isin(survivors['id'])]
+
+    best = pd.concat([pairs[['id_a', 'score', 'reason']].rename(columns={'id_a': 'id'}),
+                      pairs[['id_b', 'score', 'reason']].rename(columns={'id_b': 'id'})])
+    best = best.sort_values('score', ascending=False).drop_duplicates('id').set_index('id')
+    survivor = survivors.loc[merged['cluster']].reset_index(drop=True)
+    plan = pd.DataFrame({
+        'survivor_id': survivor['id'],
+        'survivor_name': survivor['name'],
+        'survivor_mobile': survivor['mobile_number'],
+        'merged_id': merged['id'].to_numpy(),
+        'merged_name': merged['name'].to_numpy(),
+        'merged_mobile': merged['mobile_number'].to_numpy(),
+        'merged_orders': merged['orders'].to_numpy(),
+        'score': best.loc[merged['id'], 'score'].round(3).to_numpy(),
+        'reason': best.loc[merged['id'], 'reason'].to_numpy()
+    }, columns=PLAN_COLUMNS)
+    return plan.sort_values(['survivor_id', 'merged_id'], ignore_index=True), skipped
+
+
+def load_customers(cursor):
+    """Every customer with their order count, as a DataFrame (id, name, mobile_number, orders)"""
+    cursor.execute(CUSTOMERS_QUERY)
+    customers = pd.DataFrame(cursor.fetchall(), columns=['id', 'name', 'mobile_number', 'orders'])
+    customers['mobile_number'] = customers['mobile_number'].fillna('')
+    return customers
+
+
+def apply_merge_plan(conn, plan):
+    """Move the orders of every merged customer to its survivor and delete it, in one transaction"""
+    if plan.empty:
+        return 0, 0
+    if plan['merged_id'].isin(plan['survivor_id']).any() or plan['merged_id'].duplicated().any():
+        raise ValueError("merge plan is inconsistent: a merged customer is also a survivor or listed twice")
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            CREATE TEMPORARY TABLE customer_merges (
+                merged_id INT PRIMARY KEY,
+                survivor_id INT NOT NULL
+            )
+        ''')
+        rows = list(zip(plan['merged_id'].astype(int).tolist(), plan['survivor_id'].astype(int).tolist()))
+        for start in range(0, len(rows), APPLY_BATCH):
+            cursor.executemany('INSERT INTO customer_merges (merged_id, survivor_id) VALUES (%s, %s)',
+                               rows[start:start + APPLY_BATCH])
+        cursor.execute('''
+            UPDATE orders o
+            JOIN customer_merges m ON m.merged_id = o.customer_id
+            SET o.customer_id = m.survivor_id
+        ''')
+        orders_moved = cursor.rowcount
+        cursor.execute('''
+            UPDATE orders_archive o
+            JOIN customer_merges m ON m.merged_id = o.customer_id
+            SET o.customer_id = m.survivor_id
+        ''')
+        orders_moved += cursor.rowcount
+        cursor.execute('''
+            DELETE c FROM customers c
+            JOIN customer_merges m ON m.merged_id = c.id
+        ''')
+        customers_deleted = cursor.rowcount
+        bump_data_version(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute('DROP TEMPORARY TABLE IF EXISTS customer_merges')
+    return orders_moved, customers_deleted
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Find and merge duplicate Express Wash customers")
+    parser.add_argument('--plan', default='customer_merges.csv', help="where to write the merge plan (default: customer_merges.csv)")
+    parser.add_argument('--apply', metavar='PLAN', help="merge the customers listed in a reviewed plan")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    import mysql.connector
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        if args.apply:
+            plan = pd.read_csv(args.apply, dtype={'survivor_mobile': str, 'merged_mobile': str})
+            orders_moved, customers_deleted = apply_merge_plan(conn, plan)
+            print(f"✅ Merged {customers_deleted:,} customers; {orders_moved:,} orders moved to their survivors")
+            print("🔄 Restart the apps so customer suggestions drop the merged customers")
+            return
+
+        start = time.perf_counter()
+        customers = load_customers(conn.cursor())
+        loaded = time.perf_counter()
+        plan, skipped = build_merge_plan(customers, args.workers)
+        done = time.perf_counter()
+    finally:
+        conn.close()
+
+    plan.to_csv(args.plan, index=False)
+    print(f"👥 {len(customers):,} customers loaded in {loaded - start:.1f}s, compared in {done - loaded:.1f}s")
+    if skipped:
+        print(f"⚠️ {skipped:,} blocks over {MAX_BLOCK} customers skipped (common names)")
+    print(f"🔁 {len(plan):,} duplicates of {plan['survivor_id'].nunique():,} customers "
+          f"({int(plan['merged_orders'].sum()):,} orders)")
+    for reason, count in plan['reason'].value_counts().items():
+        print(f"   {reason}: {count:,}")
+    print(f"📄 Plan written to {args.plan}; review it, then run with --apply {args.plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Customer Autocomplete for Express Wash Laundry Billing System
+In-memory index of the customers who have ordered, used by the new-order
+forms to suggest a returning customer while the cashier types.
+
+Every word of a customer's name and every mobile number is kept in a sorted
+array of (key, customer id), so a prefix lookup is a bisect plus a scan over
+the matches only. Matches are ranked by order count, halved for every
+RECENCY_HALF_LIFE days since the last order. refresh() only reads orders
+newer than the last one it has seen, so keeping the index current costs a
+primary-key range query.
+
+fuzzy_search() finds names spelled differently (see fuzzy_names.py); the
+order lists use it next to their substring search.
+"""
+
+import bisect
+import heapq
+import threading
+import time
+from datetime import date
+
+from fuzzy_names import FuzzyNameIndex
+
+RECENCY_HALF_LIFE = 90  # days
+REFRESH_INTERVAL = 30  # seconds between refreshes triggered by the forms
+DEFAULT_LIMIT = 8
+FUZZY_LIMIT = 50
+MIN_NAME_CHARS = 2  # shorter prefixes match most customers
+MIN_MOBILE_DIGITS = 3
+BULK_LOAD = 1000  # rebuild the arrays instead of inserting when more customers change
+
+# Customers with the orders added since last_order_id (0 loads everyone)
+CUSTOMER_ACTIVITY_QUERY = '''
+    SELECT c.id, c.name, c.mobile_number, COUNT(*), MAX(o.order_date), MAX(o.id)
+    FROM orders o
+    JOIN customers c ON c.id = o.customer_id
+    WHERE o.id > %s
+    GROUP BY c.id, c.name, c.mobile_number
+'''
+
+
+def name_keys(name):
+    """Lower-case words of a name; each one can start a match"""
+    return set(name.lower().split())
+
+
+def matches_words(name, words):
+    """True when the words start words of name, in order (e.g. "rah sh" for "Rahul Sharma")"""
+    position = 0
+    tokens = name.lower().split()
+    for word in words:
+        while position < len(tokens) and not tokens[position].startswith(word):
+            position += 1
+        if position == len(tokens):
+            return False
+        position += 1
+    return True
+
+
+def describe(customer):
+    """One suggestion line: name, mobile, order count and last order"""
+    mobile = customer['mobile_number'] or "no mobile"
+    orders = f"{customer['orders']} order{'s' if customer['orders'] != 1 else ''}"
+    return f"{customer['name']}  ·  {mobile}  ·  {orders}, last {customer['last_order']:%d %b %Y}"
+
+
+def mobile_key(text):
+    """Digits of text when it looks like a mobile number, else None"""
+    digits = text.replace(' ', '').replace('-', '').lstrip('+')
+    return digits if digits.isdigit() else None
+
+
+class CustomerIndex:
+    """Prefix index over customer names and mobile numbers, ranked by recency and frequency"""
+
+    def __init__(self, db_config):
+        self.db_config = db_config
+        self.customers = {}
+        self.loaded = False
+        self.last_order_id = 0
+        self.refreshed_at = 0
+        self._ranked_on = None
+        self._names = []
+        self._mobiles = []
+        self._ranks = {}
+        self.fuzzy = FuzzyNameIndex()
+        self._lock = threading.Lock()
+        # Held for a whole refresh, so two refreshes never apply the same orders twice
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.customers)
+
+    def refresh(self):
+        """Read the orders added since the last refresh; returns the customers updated"""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self):
+        from db import get_connection
+
+        conn = get_connection(self.db_config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(CUSTOMER_ACTIVITY_QUERY, (self.last_order_id,))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        with self._lock:
+            bulk = len(rows) > BULK_LOAD
+            for row in rows:
+                self._apply(*row, index=not bulk)
+            if bulk:
+                self._rebuild()
+                self._rerank(force=True)
+            else:
+                for row in rows:
+                    self._rank(self.customers[row[0]], self._ranked_on or date.today())
+            self.loaded = True
+            self.refreshed_at = time.monotonic()
+        return len(rows)
+
+    def refresh_async(self, min_interval=0):
+        """Refresh in a background thread unless one is running or the last one is recent"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        if self.loaded and time.monotonic() - self.refreshed_at < min_interval:
+            self._refresh_lock.release()
+            return
+
+        def work():
+            try:
+                self._refresh()
+            except Exception as err:
+                print(f"⚠️ Could not refresh customers: {err}")
+            finally:
+                self._refresh_lock.release()
+        threading.Thread(target=work, name='customer-index', daemon=True).start()
+
+    def _apply(self, customer_id, name, mobile_number, orders, last_order, last_order_id, index=True):
+        customer = self.customers.get(customer_id)
+        if customer is None:
+            customer = {'id': customer_id, 'name': name, 'mobile_number': mobile_number or '',
+                        'orders': 0, 'last_order': last_order, 'rank': 0.0}
+            self.customers[customer_id] = customer
+            if index:
+                self._insert_keys(customer)
+        elif customer['name'] != name:
+            # The latest order used another spelling of the name
+            if index:
+                self._remove_keys(customer)
+            customer['name'] = name
+            if index:
+                self._insert_keys(customer)
+        customer['orders'] += int(orders)
+        customer['last_order'] = max(customer['last_order'], last_order)
+        self.last_order_id = max(self.last_order_id, last_order_id)
+
+    def _rebuild(self):
+        """Sort all keys at once (first load, or many changes)"""
+        self._names = sorted((key, customer['id']) for customer in self.customers.values()
+                             for key in name_keys(customer['name']))
+        self._mobiles = sorted((customer['mobile_number'], customer['id']) for customer in self.customers.values()
+                               if customer['mobile_number'])
+        self.fuzzy = FuzzyNameIndex()
+        for customer in self.customers.values():
+            self.fuzzy.add(customer['id'], customer['name'])
+
+    def _insert_keys(self, customer):
+        for key in name_keys(customer['name']):
+            bisect.insort(self._names, (key, customer['id']))
+        if customer['mobile_number']:
+            bisect.insort(self._mobiles, (customer['mobile_number'], customer['id']))
+        self.fuzzy.add(customer['id'], customer['name'])
+
+    def _remove_keys(self, customer):
+        for key in name_keys(customer['name']):
+            position = bisect.bisect_left(self._names, (key, customer['id']))
+            if position < len(self._names) and self._names[position] == (key, customer['id']):
+                del self._names[position]
+        self.fuzzy.remove(customer['id'], customer['name'])
+
+    def _rank(self, customer, today):
+        days = max((today - customer['last_order']).days, 0)
+        customer['rank'] = customer['orders'] * 0.5 ** (days / RECENCY_HALF_LIFE)
+        self._ranks[customer['id']] = (customer['rank'], customer['last_order'])
+
+    def _rerank(self, force=False):
+        """Recompute every rank (after a bulk load, and once a day as orders age)"""
+        today = date.today()
+        if not force and self._ranked_on == today:
+            return
+        for customer in self.customers.values():
+            self._rank(customer, today)
+        self._ranked_on = today
+
+    @staticmethod
+    def _prefix_ids(keys, prefix):
+        start = bisect.bisect_left(keys, (prefix,))
+        end = bisect.bisect_left(keys, (prefix + '\uffff',), start)
+        return {customer_id for _, customer_id in keys[start:end]}
+
+    def search(self, text, limit=DEFAULT_LIMIT):
+        """Best customers whose mobile number, or the start of a word of whose name, matches text"""
+        text = text.strip()
+        if not text:
+            return []
+        with self._lock:
+            self._rerank()
+            mobile = mobile_key(text)
+            if mobile:
+                if len(mobile) < MIN_MOBILE_DIGITS:
+                    return []
+                candidates = self._prefix_ids(self._mobiles, mobile)
+            else:
+                # Look up the longest word; all the words must start words of the name, in order
+                words = text.lower().split()
+                longest = max(words, key=len)
+                if len(longest) < MIN_NAME_CHARS:
+                    return []
+                candidates = self._prefix_ids(self._names, longest)
+                if len(words) > 1:
+                    candidates = [customer_id for customer_id in candidates
+                                  if matches_words(self.customers[customer_id]['name'], words)]
+            best = heapq.nlargest(limit, candidates, key=self._ranks.__getitem__)
+            return [dict(self.customers[customer_id]) for customer_id in best]
+
+    def fuzzy_search(self, text, limit=FUZZY_LIMIT):
+        """Customers whose names are close to text in spelling or sound, best first (with a 'score')"""
+        words = text.strip()
+        if not words or mobile_key(words):
+            return []
+        with self._lock:
+            self._rerank()
+            scores = self.fuzzy.search(words)
+            best = heapq.nlargest(limit, scores, key=lambda customer_id: (scores[customer_id],) + self._ranks[customer_id])
+            return [dict(self.customers[customer_id], score=scores[customer_id]) for customer_id in best]
@@ -0,0 +1,96 @@
+"""
+Customer Records for Express Wash Laundry Billing System
+One row per customer in the customers table; orders point at it through
+customer_id. A customer is identified by mobile number when one is given,
+otherwise by name, and keeps the name used on their latest order.
+"""
+
+CUSTOMERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS customers (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        mobile_number VARCHAR(20) NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY mobile_idx (mobile_number),
+        INDEX name_idx (name)
+    )
+'''
+
+
+def clean_mobile(mobile_number):
+    """Mobile number as stored on customers, or None when blank"""
+    mobile_number = (mobile_number or '').strip()
+    return mobile_number or None
+
+
+def find_or_create_customer(cursor, customer_name, mobile_number, order_id=None):
+    """Return the id of the customer for an order, creating the customer if needed
+
+    order_id is the order being edited. The customer takes the name on the
+    order unless a newer order of theirs exists, so editing an old order does
+    not rename them.
+    """
+    customer_name = customer_name.strip()
+    mobile_number = clean_mobile(mobile_number)
+    if mobile_number and order_id is not None:
+        cursor.execute('SELECT id FROM customers WHERE mobile_number = %s', (mobile_number,))
+        rows = cursor.fetchall()
+        if rows:
+            cursor.execute('SELECT 1 FROM orders WHERE customer_id = %s AND id > %s LIMIT 1', (rows[0][0], order_id))
+            if cursor.fetchall():
+                return rows[0][0]
+    if mobile_number:
+        # LAST_INSERT_ID(id) makes lastrowid the existing customer's id on a duplicate mobile
+        cursor.execute('''
+            INSERT INTO customers (name, mobile_number) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name), id = LAST_INSERT_ID(id)
+        ''', (customer_name, mobile_number))
+        return cursor.lastrowid
+
+    cursor.execute('SELECT id FROM customers WHERE mobile_number IS NULL AND name = %s LIMIT 1', (customer_name,))
+    rows = cursor.fetchall()
+    if rows:
+        return rows[0][0]
+    cursor.execute('INSERT INTO customers (name) VALUES (%s)', (customer_name,))
+    return cursor.lastrowid
+
+
+def backfill_customers(cursor):
+    """Create customers for orders without a customer_id and link them; returns the orders linked"""
+    cursor.execute('SELECT COUNT(*) FROM orders WHERE customer_id IS NULL')
+    if cursor.fetchone()[0] == 0:
+        return 0
+
+    # One customer per mobile number, named as on its latest order
+    cursor.execute('''
+        INSERT INTO customers (name, mobile_number)
+        SELECT SUBSTRING_INDEX(GROUP_CONCAT(o.customer_name ORDER BY o.id DESC SEPARATOR '\\n'), '\\n', 1),
+               o.mobile_number
+        FROM orders o
+        LEFT JOIN customers c ON c.mobile_number = o.mobile_number
+        WHERE o.customer_id IS NULL AND o.mobile_number <> '' AND c.id IS NULL
+        GROUP BY o.mobile_number
+    ''')
+    cursor.execute('''
+        UPDATE orders o
+        JOIN customers c ON c.mobile_number = o.mobile_number
+        SET o.customer_id = c.id
+        WHERE o.customer_id IS NULL AND o.mobile_number <> ''
+    ''')
+    linked = cursor.rowcount
+
+    # Orders without a mobile number: one customer per name
+    cursor.execute('''
+        INSERT INTO customers (name)
+        SELECT DISTINCT o.customer_name
+        FROM orders o
+        LEFT JOIN customers c ON c.mobile_number IS NULL AND c.name = o.customer_name
+        WHERE o.customer_id IS NULL AND (o.mobile_number IS NULL OR o.mobile_number = '') AND c.id IS NULL
+    ''')
+    cursor.execute('''
+        UPDATE orders o
+        JOIN customers c ON c.mobile_number IS NULL AND c.name = o.customer_name
+        SET o.customer_id = c.id
+        WHERE o.customer_id IS NULL AND (o.mobile_number IS NULL OR o.mobile_number = '')
+    ''')
+    return linked + cursor.rowcount
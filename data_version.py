@@ -0,0 +1,34 @@
+"""
+Data Version for Express Wash Laundry Billing System
+A single counter row the writers bump in the same transaction as their change
+to orders, orders_archive, customers or order_items. Caches of those tables
+(the Streamlit orders frame and analytics) are keyed by it, so reading it is
+one primary key lookup and a new version is visible exactly when the change is.
+"""
+
+DATA_VERSION_TABLE = '''
+    CREATE TABLE IF NOT EXISTS data_version (
+        id TINYINT PRIMARY KEY,
+        version BIGINT UNSIGNED NOT NULL DEFAULT 0
+    )
+'''
+
+
+def ensure_data_version(cursor):
+    """Create the counter table and its row"""
+    cursor.execute(DATA_VERSION_TABLE)
+    cursor.execute('INSERT IGNORE INTO data_version (id, version) VALUES (1, 0)')
+
+
+def bump_data_version(cursor):
+    """Mark the orders as changed; call before committing the change"""
+    cursor.execute('UPDATE data_version SET version = version + 1 WHERE id = 1')
+
+
+def read_data_version(cursor):
+    """Current version of the orders and everything linked to them"""
+    cursor.execute('SELECT version FROM data_version WHERE id = 1')
+    row = cursor.fetchone()
+    if row is None:
+        raise LookupError("data_version row is missing; run ensure_schema()")
+    return row[0]
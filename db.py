@@ -0,0 +1,75 @@
+"""
+Database Connections for Express Wash Laundry Billing System
+Pooled MySQL connections shared by the desktop apps. get_connection() hands out
+a pooled connection whose close() returns it to the pool, so the existing
+connect/query/close code keeps working unchanged; warm_pool() opens the pool
+in a background thread while the first window is being drawn. Cursors are
+instrumented (see instrumentation.py) so every query is timed per call site.
+"""
+
+import threading
+from concurrent.futures import Future
+
+import mysql.connector
+from mysql.connector import pooling
+
+from instrumentation import InstrumentedConnection
+
+POOL_SIZE = 5
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_key(db_config):
+    return tuple(sorted((key, str(value)) for key, value in db_config.items()))
+
+
+def get_pool(db_config):
+    """Return the connection pool for a configuration, creating it on first use"""
+    key = _pool_key(db_config)
+    # Callers block here while another thread is still opening the pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = pooling.MySQLConnectionPool(pool_name=f"express_wash_{len(_pools)}",
+                                               pool_size=POOL_SIZE, **db_config)
+            _pools[key] = pool
+        return pool
+
+
+def get_connection(db_config):
+    """Borrow a pooled connection (a direct one if every pooled connection is in use)"""
+    try:
+        conn = get_pool(db_config).get_connection()
+    except pooling.PoolError:
+        conn = mysql.connector.connect(**db_config)
+    return InstrumentedConnection(conn, db_config)
+
+
+def warm_pool(db_config, setup=None):
+    """Open the pool in a background thread and run setup(cursor) on the first connection.
+
+    Returns a Future holding setup's result (or the connection error).
+    """
+    future = Future()
+
+    def work():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            conn = get_connection(db_config)
+            try:
+                cursor = conn.cursor()
+                result = setup(cursor) if setup else None
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as err:
+            future.set_exception(err)
+        else:
+            future.set_result(result)
+
+    # Daemon thread: an unreachable server must not keep the app from exiting
+    threading.Thread(target=work, name='db-pool-warmup', daemon=True).start()
+    return future
@@ -0,0 +1,161 @@
+"""
+Fuzzy Name Search for Express Wash Laundry Billing System
+Finds customers whose names are spelled differently from the search text
+("Seeta Varma" for "Sita Verma").
+
+Every distinct word of the customer names goes into a BK-tree (edit-distance
+lookups without comparing against every word) and under a phonetic key that
+ignores the usual spelling variations of Indian names (vowels, aspirated
+consonants, w/v, x/ks). Each search word is matched against the vocabulary,
+which is far smaller than the customer list, and the matching words map to
+the customers who have them. Words are added as customers are, so the index
+is updated incrementally.
+"""
+
+from collections import defaultdict
+
+# Spellings that sound alike, applied in order
+PHONETIC_RULES = [('ph', 'f'), ('bh', 'b'), ('dh', 'd'), ('gh', 'g'), ('jh', 'j'), ('kh', 'k'),
+                  ('sh', 's'), ('th', 't'), ('ch', 'c'), ('ck', 'k'), ('x', 'ks'), ('q', 'k'),
+                  ('w', 'v'), ('z', 'j')]
+
+EXACT_SCORE = 1.0
+PHONETIC_SCORE = 0.8  # at least this for a word that sounds the same
+PHONETIC_DISTANCE = 2  # edits allowed between sound-alike spellings (Seeta/Sita)
+MIN_SCORE = 0.6
+
+
+def folded(word):
+    """Word with sound-alike spellings folded together (Laxmi and Lakshmi both become laksmi)"""
+    word = ''.join(c for c in word.lower() if c.isalpha())
+    for spelling, sound in PHONETIC_RULES:
+        word = word.replace(spelling, sound)
+    return word
+
+
+def phonetic_key(word):
+    """First letter plus the consonants of the folded word"""
+    word = folded(word)
+    if not word:
+        return ''
+    key = word[0]
+    for c in word[1:]:
+        if c not in 'aeiouyh' and c != key[-1]:
+            key += c
+    return key
+
+
+def max_distance(word):
+    """Edits allowed for a search word: none for short words, which would match everything"""
+    if len(word) <= 3:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree of words under edit distance"""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, word):
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(word, node[0], len(word) + len(node[0]))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word, limit):
+        """Return {word: distance} for every word within limit edits"""
+        found = {}
+        pending = [self.root] if self.root else []
+        while pending:
+            node_word, children = pending.pop()
+            distance = edit_distance(word, node_word, len(word) + len(node_word))
+            if distance <= limit:
+                found[node_word] = distance
+            # Triangle inequality: only children at distance - limit .. distance + limit can match
+            for child_distance, child in children.items():
+                if distance - limit <= child_distance <= distance + limit:
+                    pending.append(child)
+        return found
+
+
+class FuzzyNameIndex:
+    """Name words -> customers, searchable by edit distance and sound"""
+
+    def __init__(self):
+        self.word_ids = defaultdict(set)
+        self.sounds = defaultdict(set)
+        self.tree = BKTree()
+
+    def add(self, customer_id, name):
+        for word in set(name.lower().split()):
+            if word not in self.word_ids:
+                self.tree.add(word)
+                self.sounds[phonetic_key(word)].add(word)
+            self.word_ids[word].add(customer_id)
+
+    def remove(self, customer_id, name):
+        # The word stays in the tree; a word without customers matches nobody
+        for word in set(name.lower().split()):
+            self.word_ids.get(word, set()).discard(customer_id)
+
+    def similar_words(self, word):
+        """Return {vocabulary word: score} for the words that could be meant by word"""
+        scores = {}
+        for match, distance in self.tree.search(word, max_distance(word)).items():
+            scores[match] = 1 - distance / max(len(word), len(match))
+        # Same key, and close once folded: Seeta/Sita, Laxmi/Lakshmi (but not Pria/Pahar)
+        spelling = folded(word)
+        for match in self.sounds.get(phonetic_key(word), ()):
+            if edit_distance(spelling, folded(match), PHONETIC_DISTANCE) <= PHONETIC_DISTANCE:
+                scores[match] = max(scores.get(match, 0), PHONETIC_SCORE)
+        return scores
+
+    def search(self, text, min_score=MIN_SCORE):
+        """Return {customer id: score}; every search word must match a word of the name"""
+        totals = None
+        words = text.lower().split()
+        for word in words:
+            best = {}
+            for match, score in self.similar_words(word).items():
+                if score < min_score:
+                    continue
+                for customer_id in self.word_ids.get(match, ()):
+                    if score > best.get(customer_id, 0):
+                        best[customer_id] = score
+            if totals is None:
+                totals = best
+            else:
+                totals = {customer_id: totals[customer_id] + score
+                          for customer_id, score in best.items() if customer_id in totals}
+            if not totals:
+                return {}
+        return {customer_id: total / len(words) for customer_id, total in (totals or {}).items()}
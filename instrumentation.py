@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for Express Wash Laundry Billing System
+Records how long database calls, Tk commands and Streamlit pages take:
+a latency histogram, error count and rows returned per call site, plus a
+slow-query log with the SQL text and its EXPLAIN plan.
+
+Database calls are recorded by the cursors handed out by db.get_connection(),
+Tk callbacks by install_tk_instrumentation(), and Streamlit pages by the
+measure() context manager in app.py. render_metrics() returns a
+Prometheus-style text dump; set EXPRESS_WASH_METRICS_PORT to also serve it
+over HTTP at /metrics.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+SLOW_QUERY_MS = 250
+SLOW_QUERY_LOG = 'slow_queries.log'
+SLOW_QUERY_HISTORY = 200
+
+# Frames from these modules are skipped when naming the call site of a query
+_INTERNAL_MODULES = ('instrumentation', 'db', 'pandas', 'mysql', 'sqlalchemy', 'tkinter', 'streamlit')
+
+
+class CallStats:
+    """Latency histogram and counters for one call site"""
+
+    __slots__ = ('kind', 'site', 'count', 'errors', 'total_ms', 'max_ms', 'buckets', 'rows', 'max_rows')
+
+    def __init__(self, kind, site):
+        self.kind = kind
+        self.site = site
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # last bucket is +Inf
+        self.rows = 0
+        self.max_rows = 0
+
+    def observe(self, elapsed_ms, error=False):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+        if error:
+            self.errors += 1
+
+    def add_rows(self, rows):
+        self.rows += rows
+        self.max_rows = max(self.max_rows, rows)
+
+    def quantile(self, q):
+        """Estimate a latency quantile in ms from the histogram buckets"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.buckets):
+            upper = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+            if bucket_count and seen + bucket_count >= target:
+                # Interpolate inside the bucket, never past the largest value seen
+                fraction = (target - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max_ms)
+            seen += bucket_count
+            lower = upper
+        return self.max_ms
+
+
+class Registry:
+    """Thread-safe collection of CallStats and the slow-query log"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+
+    def _get(self, kind, site):
+        stats = self._stats.get((kind, site))
+        if stats is None:
+            stats = self._stats[(kind, site)] = CallStats(kind, site)
+        return stats
+
+    def observe(self, kind, site, elapsed_ms, error=False):
+        with self._lock:
+            self._get(kind, site).observe(elapsed_ms, error)
+
+    def add_rows(self, kind, site, rows):
+        with self._lock:
+            self._get(kind, site).add_rows(rows)
+
+    def snapshot(self):
+        """Return a list of dicts, slowest total time first"""
+        with self._lock:
+            rows = [{
+                'kind': s.kind,
+                'site': s.site,
+                'count': s.count,
+                'errors': s.errors,
+                'avg_ms': s.total_ms / s.count if s.count else 0.0,
+                'p50_ms': s.quantile(0.5),
+                'p95_ms': s.quantile(0.95),
+                'max_ms': s.max_ms,
+                'total_ms': s.total_ms,
+                'rows': s.rows,
+                'max_rows': s.max_rows
+            } for s in self._stats.values()]
+        return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+
+    def render(self):
+        """Prometheus text exposition of every histogram"""
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda s: (s.kind, s.site))
+            lines = [
+                '# HELP express_wash_call_seconds Latency of database calls, Tk commands and pages.',
+                '# TYPE express_wash_call_seconds histogram'
+            ]
+            for s in stats:
+                labels = f'kind="{s.kind}",site="{_escape(s.site)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS_MS, s.buckets):
+                    cumulative += bucket_count
+                    lines.append(f'express_wash_call_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+                lines.append(f'express_wash_call_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+                lines.append(f'express_wash_call_seconds_sum{{{labels}}} {s.total_ms / 1000:.6f}')
+                lines.append(f'express_wash_call_seconds_count{{{labels}}} {s.count}')
+            lines += ['# HELP express_wash_call_errors_total Calls that raised an exception.',
+                      '# TYPE express_wash_call_errors_total counter']
+            lines += [f'express_wash_call_errors_total{{kind="{s.kind}",site="{_escape(s.site)}"}} {s.errors}'
+                      for s in stats]
+            lines += ['# HELP express_wash_rows_returned_total Rows fetched by database calls.',
+                      '# TYPE express_wash_rows_returned_total counter']
+            lines += [f'express_wash_rows_returned_total{{site="{_escape(s.site)}"}} {s.rows}'
+                      for s in stats if s.kind == 'db']
+            lines.append(f'express_wash_slow_queries {len(self.slow_queries)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+REGISTRY = Registry()
+
+
+def snapshot():
+    """Per call site statistics, slowest total time first"""
+    return REGISTRY.snapshot()
+
+
+def render_metrics():
+    """Return the /metrics text dump"""
+    return REGISTRY.render()
+
+
+def slow_queries():
+    """Most recent slow queries, newest last"""
+    return list(REGISTRY.slow_queries)
+
+
+# --- Timing helpers ---
+
+@contextmanager
+def measure(kind, site):
+    """Record the duration of a block under kind/site (exceptions are counted and re-raised)"""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        REGISTRY.observe(kind, site, (time.perf_counter() - start) * 1000, error)
+
+
+def timed(kind, site=None):
+    """Decorator form of measure(); the site defaults to the function's qualified name"""
+    def decorate(func):
+        name = site or f"{func.__module__}:{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(kind, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def call_site(skip=2):
+    """Return 'module:function' of the nearest caller outside library code"""
+    frame = sys._getframe(skip)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.split('.')[0] not in _INTERNAL_MODULES:
+            if module == '__main__':
+                # Name scripts such as tkinter_app.py after their file
+                module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+# --- Database cursors ---
+
+class InstrumentedCursor:
+    """Cursor wrapper timing execute() and counting fetched rows per call site"""
+
+    def __init__(self, cursor, db_config):
+        self._cursor = cursor
+        self._db_config = db_config
+        self._site = 'unknown'
+
+    def execute(self, operation, *args, **kwargs):
+        self._site = call_site()
+        params = args[0] if args else kwargs.get('params')
+        start = time.perf_counter()
+        error = False
+        try:
+            return self._cursor.execute(operation, *args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            REGISTRY.observe('db', self._site, elapsed_ms, error)
+            if elapsed_ms >= SLOW_QUERY_MS:
+                log_slow_query(self._site, operation, params, elapsed_ms, self._db_config)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._site = call_site()
+        with measure('db', self._site):
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            REGISTRY.add_rows('db', self._site, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        REGISTRY.add_rows('db', self._site, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        REGISTRY.add_rows('db', self._site, len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Connection wrapper whose cursors are instrumented"""
+
+    def __init__(self, connection, db_config):
+        self._connection = connection
+        self._db_config = db_config
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._db_config)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._connection.close()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def log_slow_query(site, sql, params, elapsed_ms, db_config=None):
+    """Add a slow query to the log; its EXPLAIN plan is fetched in the background"""
+    entry = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'site': site,
+        'ms': round(elapsed_ms, 1),
+        'sql': ' '.join(str(sql).split()),
+        'params': [str(p) for p in params] if isinstance(params, (list, tuple)) else params,
+        'explain': None
+    }
+    REGISTRY.slow_queries.append(entry)
+    is_select = entry['sql'].upper().startswith('SELECT')
+    if db_config and is_select:
+        threading.Thread(target=_explain, args=(entry, sql, params, db_config),
+                         name='slow-query-explain', daemon=True).start()
+    else:
+        _write_slow_query(entry)
+
+
+def _explain(entry, sql, params, db_config):
+    try:
+        import mysql.connector
+        conn = mysql.connector.connect(**db_config)
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"EXPLAIN {sql}", params)
+            entry['explain'] = [{k: (v if isinstance(v, (int, float)) or v is None else str(v))
+                                 for k, v in row.items()} for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    except Exception as err:
+        entry['explain'] = f"EXPLAIN failed: {err}"
+    _write_slow_query(entry)
+
+
+_log_lock = threading.Lock()
+
+
+def _write_slow_query(entry):
+    if not SLOW_QUERY_LOG:
+        return
+    try:
+        with _log_lock, open(SLOW_QUERY_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+    except OSError as err:
+        print(f"⚠️ Could not write slow query log: {err}")
+
+
+# --- Tk commands ---
+
+_tk_installed = False
+
+
+def install_tk_instrumentation():
+    """Time every Python callback Tk calls: button commands, binds, traces and after()"""
+    global _tk_installed
+    if _tk_installed:
+        return
+    import tkinter
+
+    original_register = tkinter.Misc._register
+
+    def _register(self, func, subst=None, needcleanup=1):
+        return original_register(self, _timed_callback(func), subst, needcleanup)
+
+    tkinter.Misc._register = _register
+    _tk_installed = True
+
+
+def _timed_callback(func):
+    qualname = getattr(func, '__qualname__', None) or repr(func)
+    if qualname.endswith('after.<locals>.callit'):
+        # after() wraps the real callback and copies its name
+        site = f"after:{getattr(func, '__name__', 'callit')}"
+    else:
+        site = qualname
+
+    @wraps(func)
+    def callback(*args):
+        with measure('tk', site):
+            return func(*args)
+    return callback
+
+
+# --- /metrics over HTTP ---
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """Serve render_metrics() at http://host:port/metrics from a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    print(f"📈 Metrics at http://{host}:{port}/metrics")
+    return server
+
+
+_server_started = False
+
+
+def start_metrics_server_from_env():
+    """Start the metrics server once if EXPRESS_WASH_METRICS_PORT is set"""
+    global _server_started
+    port = os.environ.get('EXPRESS_WASH_METRICS_PORT')
+    if port and not _server_started:
+        _server_started = True
+        try:
+            return start_metrics_server(int(port))
+        except (OSError, ValueError) as err:
+            print(f"⚠️ Could not start metrics server on port {port}: {err}")
+    return None
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Invoice Store for Express Wash Laundry Billing System
+Keeps generated HTML invoices in date-sharded folders (invoices/YYYY/MM/)
+instead of the working directory, with an index for direct lookup by
+receipt number and optional packing of old months into compressed archives.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+from datetime import date, datetime
+
+DEFAULT_ROOT = 'invoices'
+INDEX_FILE = 'index.tsv'
+ARCHIVE_DIR = 'archive'
+ARCHIVE_SEPARATOR = '!'
+
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def invoice_filename(receipt_number):
+    """Return a filesystem-safe file name for a receipt number"""
+    receipt = str(receipt_number)
+    safe = _SAFE_NAME.sub('_', receipt)
+    if safe != receipt:
+        # Keep "A/51" and "A_51" from colliding once sanitised
+        safe = f"{safe}-{hashlib.sha1(receipt.encode('utf-8')).hexdigest()[:8]}"
+    return f"invoice_{safe}.html"
+
+
+def _as_date(value):
+    """Convert a date, datetime or 'YYYY-MM-DD...' string to a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if value:
+        try:
+            return date.fromisoformat(str(value)[:10])
+        except ValueError:
+            pass
+    return date.today()
+
+
+def _atomic_write(path, data):
+    """Write bytes to path via a temp file + rename so readers never see a partial file"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class InvoiceStore:
+    """Date-sharded invoice files with an append-only receipt index"""
+
+    def __init__(self, root_dir=DEFAULT_ROOT):
+        self.root_dir = root_dir
+        self.index_path = os.path.join(root_dir, INDEX_FILE)
+        self._index = None
+        self._index_lines = 0
+        self._lock = threading.Lock()
+
+    # --- Index handling ---
+
+    def _load_index(self):
+        """Load the receipt -> location index (last entry for a receipt wins)"""
+        index = {}
+        lines = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    # A line without newline is a write interrupted by a crash
+                    if not line.endswith('\n'):
+                        continue
+                    receipt, _, location = line.rstrip('\n').partition('\t')
+                    if receipt and location:
+                        index[receipt] = location
+                        lines += 1
+        self._index = index
+        self._index_lines = lines
+
+    def _ensure_index(self):
+        if self._index is None:
+            self._load_index()
+        return self._index
+
+    def _append_index(self, receipt, location):
+        os.makedirs(self.root_dir, exist_ok=True)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(f"{receipt}\t{location}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._index[receipt] = location
+        self._index_lines += 1
+        # Rewrite the index once superseded entries dominate it
+        if self._index_lines > 2 * len(self._index) + 1000:
+            self._compact_index()
+
+    def _compact_index(self):
+        data = ''.join(f"{receipt}\t{location}\n" for receipt, location in self._index.items())
+        _atomic_write(self.index_path, data.encode('utf-8'))
+        self._index_lines = len(self._index)
+
+    def _resolve(self, relative):
+        # Index locations always use '/' so the store can be copied between machines
+        return os.path.join(self.root_dir, *relative.split('/'))
+
+    @staticmethod
+    def _index_key(receipt_number):
+        # Tabs/newlines would corrupt the TSV index
+        return str(receipt_number).replace('\t', ' ').replace('\n', ' ')
+
+    # --- Public API ---
+
+    def save(self, receipt_number, html, invoice_date=None):
+        """Write an invoice atomically into its month shard and return the file path"""
+        day = _as_date(invoice_date)
+        relative = f"{day.year:04d}/{day.month:02d}/{invoice_filename(receipt_number)}"
+        path = self._resolve(relative)
+        key = self._index_key(receipt_number)
+        with self._lock:
+            index = self._ensure_index()
+            _atomic_write(path, html.encode('utf-8'))
+            if index.get(key) != relative:
+                self._append_index(key, relative)
+        return path
+
+    def location(self, receipt_number):
+        """Return the indexed location of an invoice, or None"""
+        with self._lock:
+            return self._ensure_index().get(self._index_key(receipt_number))
+
+    def path_for(self, receipt_number):
+        """Return the on-disk path of a loose (not archived) invoice, or None"""
+        location = self.location(receipt_number)
+        if not location or ARCHIVE_SEPARATOR in location:
+            return None
+        path = self._resolve(location)
+        return path if os.path.exists(path) else None
+
+    def read(self, receipt_number):
+        """Return the invoice HTML for a receipt, looking inside archives if needed"""
+        location = self.location(receipt_number)
+        if not location:
+            return None
+        if ARCHIVE_SEPARATOR in location:
+            archive, member = location.split(ARCHIVE_SEPARATOR, 1)
+            archive_path = self._resolve(archive)
+            if not os.path.exists(archive_path):
+                return None
+            with tarfile.open(archive_path, 'r:xz') as tar:
+                try:
+                    f = tar.extractfile(member)
+                except KeyError:
+                    return None
+                return f.read().decode('utf-8') if f else None
+        path = self._resolve(location)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def archive_months(self, keep_months=12, today=None):
+        """Pack month shards older than keep_months into invoices/archive/YYYY-MM.tar.xz"""
+        today = today or date.today()
+        cutoff = today.year * 12 + (today.month - 1) - keep_months
+        archived = []
+        with self._lock:
+            index = self._ensure_index()
+            for year_dir in sorted(glob.glob(os.path.join(self.root_dir, '[0-9]' * 4))):
+                for month_dir in sorted(glob.glob(os.path.join(year_dir, '[0-9]' * 2))):
+                    year, month = int(os.path.basename(year_dir)), int(os.path.basename(month_dir))
+                    if year * 12 + (month - 1) > cutoff:
+                        continue
+                    archive_name = self._archive_month(year, month, month_dir, index)
+                    if archive_name:
+                        archived.append(archive_name)
+                if not os.listdir(year_dir):
+                    os.rmdir(year_dir)
+        return archived
+
+    def _archive_month(self, year, month, month_dir, index):
+        files = sorted(f for f in os.listdir(month_dir) if f.endswith('.html'))
+        if not files:
+            shutil.rmtree(month_dir, ignore_errors=True)
+            return None
+
+        archive_rel = f"{ARCHIVE_DIR}/{year:04d}-{month:02d}.tar.xz"
+        archive_path = self._resolve(archive_rel)
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(archive_path), prefix='.tmp-', suffix='.part')
+        os.close(fd)
+        try:
+            with tarfile.open(tmp_path, 'w:xz') as out:
+                # Keep members of an earlier archive run that were not regenerated since
+                if os.path.exists(archive_path):
+                    with tarfile.open(archive_path, 'r:xz') as old:
+                        for member in old.getmembers():
+                            if member.name not in files:
+                                out.addfile(member, old.extractfile(member))
+                for name in files:
+                    out.add(os.path.join(month_dir, name), arcname=name)
+            os.replace(tmp_path, archive_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Repoint the index before removing the loose files
+        shard_prefix = f"{year:04d}/{month:02d}/"
+        for receipt, location in index.items():
+            if location.startswith(shard_prefix):
+                index[receipt] = f"{archive_rel}{ARCHIVE_SEPARATOR}{location[len(shard_prefix):]}"
+        self._compact_index()
+        shutil.rmtree(month_dir, ignore_errors=True)
+        return archive_rel
+
+    def import_legacy(self, directory='.'):
+        """Move invoice_*.html files from a flat directory into the store"""
+        imported = removed = 0
+        for path in glob.glob(os.path.join(directory, 'invoice_*.html')):
+            receipt = os.path.basename(path)[len('invoice_'):-len('.html')]
+            if os.path.getsize(path) == 0:
+                # Left behind by interrupted non-atomic writes; nothing to keep
+                os.remove(path)
+                removed += 1
+                continue
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+            self.save(receipt, html, datetime.fromtimestamp(os.path.getmtime(path)))
+            os.remove(path)
+            imported += 1
+        return imported, removed
+
+
+def main():
+    """Command line maintenance for the invoice store"""
+    parser = argparse.ArgumentParser(description="Express Wash invoice store maintenance")
+    parser.add_argument('--root', default=DEFAULT_ROOT, help="invoice store directory")
+    parser.add_argument('--import-legacy', metavar='DIR', nargs='?', const='.',
+                        help="move invoice_*.html files from DIR (default: current directory) into the store")
+    parser.add_argument('--archive', metavar='MONTHS', type=int,
+                        help="pack months older than MONTHS into compressed archives")
+    args = parser.parse_args()
+
+    store = InvoiceStore(args.root)
+    if args.import_legacy:
+        imported, removed = store.import_legacy(args.import_legacy)
+        print(f"✅ Imported {imported} invoices, removed {removed} empty files")
+    if args.archive is not None:
+        archived = store.archive_months(args.archive)
+        print(f"📦 Archived {len(archived)} month(s)")
+        for name in archived:
+            print(f"   {name}")
+    if not args.import_legacy and args.archive is None:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
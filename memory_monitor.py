@@ -0,0 +1,249 @@
+"""
+Memory Monitor for Express Wash Laundry Billing System
+Profiles memory growth of a long-running desktop session (--profile-memory).
+
+tracemalloc snapshots are taken at intervals on the Tk thread; each one is
+grouped by the innermost project line that allocated the memory and diffed
+against the first snapshot and the previous one. Every sample also counts
+the live Tk widgets (by class) and matplotlib figures, so leaks that are not
+Python allocations (widgets that are never destroyed, figures kept by pyplot)
+show up too. The report file is rewritten after every sample.
+
+Grouping a snapshot takes seconds on a large heap, so only the snapshot and
+the counts are taken on the Tk thread; the diff and report are done in a
+background thread.
+"""
+
+import gc
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_INTERVAL = 60  # seconds
+DEFAULT_REPORT = 'memory_report.txt'
+TRACE_FRAMES = 10
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+
+def allocation_site(traceback):
+    """Innermost project frame of an allocation as (file, line); else the innermost frame"""
+    for frame in reversed(traceback):
+        if frame.filename.startswith(PROJECT_DIR):
+            if frame.filename == __file__:
+                return None  # the profiler's own allocations
+            return os.path.relpath(frame.filename, PROJECT_DIR), frame.lineno
+    frame = traceback[-1]
+    return frame.filename, frame.lineno
+
+
+def sizes_by_site(snapshot):
+    """Return {(file, line): (bytes, blocks)} for a snapshot"""
+    sites = {}
+    for stat in snapshot.statistics('traceback'):
+        site = allocation_site(stat.traceback)
+        if site is None:
+            continue
+        size, count = sites.get(site, (0, 0))
+        sites[site] = (size + stat.size, count + stat.count)
+    return sites
+
+
+def diff_sites(current, previous, top):
+    """Largest growths between two sizes_by_site() results: [(bytes, blocks, file, line), ...]"""
+    growth = []
+    for site, (size, count) in current.items():
+        old_size, old_count = previous.get(site, (0, 0))
+        if size != old_size:
+            growth.append((size - old_size, count - old_count) + site)
+    growth.sort(key=lambda g: g[0], reverse=True)
+    return growth[:top]
+
+
+def count_widgets(root):
+    """Count Tk widgets under root by class"""
+    counts = Counter()
+    pending = [root]
+    while pending:
+        widget = pending.pop()
+        counts[widget.winfo_class()] += 1
+        pending.extend(widget.winfo_children())
+    return counts
+
+
+def count_figures():
+    """Return (figures held by pyplot, live Figure objects); (0, 0) before matplotlib is loaded"""
+    if 'matplotlib.figure' not in sys.modules:
+        return 0, 0
+    from matplotlib.figure import Figure
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    held = len(pyplot.get_fignums()) if pyplot else 0
+    live = sum(1 for obj in gc.get_objects() if isinstance(obj, Figure))
+    return held, live
+
+
+def current_rss():
+    """Resident memory in bytes, or None when it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def format_bytes(size):
+    sign = '-' if size < 0 else '+'
+    size = abs(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == 'B' else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+class MemoryMonitor:
+    """Samples memory, widgets and figures every interval and writes a growth report"""
+
+    def __init__(self, root, interval=DEFAULT_INTERVAL, report_path=DEFAULT_REPORT, top=15):
+        self.root = root
+        self.interval_ms = int(interval * 1000)
+        self.report_path = report_path
+        self.top = top
+        self.samples = []
+        self.started = time.monotonic()
+        self._baseline_sites = None
+        self._previous_sites = None
+        self._after_id = None
+        self._analysis = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start tracing and take the baseline sample"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self.started = time.monotonic()
+        self.take_sample()
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+        print(f"🧠 Memory profiling on; report in {self.report_path} every {self.interval_ms // 1000}s")
+
+    @classmethod
+    def attach(cls, root, interval=DEFAULT_INTERVAL, report_path=DEFAULT_REPORT):
+        """Start profiling a window; the last sample is taken when the window is closed"""
+        monitor = cls(root, interval, report_path)
+        monitor.start()
+
+        def close():
+            monitor.stop()
+            print(f"🧠 Memory report written to {report_path}")
+            root.destroy()
+        root.protocol("WM_DELETE_WINDOW", close)
+        return monitor
+
+    def stop(self):
+        """Take a final sample, stop the timer and wait for the report"""
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        return self.take_sample(wait=True)
+
+    def _tick(self):
+        self.take_sample()
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def take_sample(self, wait=False):
+        """Snapshot memory and count widgets and figures; the diff and report follow in the background"""
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        held, live = count_figures()
+        sample = {
+            'number': len(self.samples),
+            'time': datetime.now(),
+            'elapsed': time.monotonic() - self.started,
+            'traced': traced,
+            'peak': peak,
+            'rss': current_rss(),
+            'widgets': count_widgets(self.root),
+            'pyplot_figures': held,
+            'live_figures': live,
+            'growth_total': [],
+            'growth_recent': []
+        }
+        self.samples.append(sample)
+
+        # Samples are analysed in order; the previous analysis must finish first
+        previous = self._analysis
+        self._analysis = threading.Thread(target=self._analyse, args=(sample, snapshot, previous),
+                                          name='memory-monitor', daemon=True)
+        self._analysis.start()
+        if wait:
+            self._analysis.join()
+        return sample
+
+    def _analyse(self, sample, snapshot, previous):
+        if previous is not None:
+            previous.join()
+        sites = sizes_by_site(snapshot)
+        with self._lock:
+            if self._baseline_sites is not None:
+                sample['growth_total'] = diff_sites(sites, self._baseline_sites, self.top)
+                sample['growth_recent'] = diff_sites(sites, self._previous_sites, self.top)
+            else:
+                self._baseline_sites = sites
+            self._previous_sites = sites
+            if self.report_path:
+                self.write_report(sample)
+
+    def write_report(self, last):
+        """Write the timeline and the largest allocation growths to the report file"""
+        first = self.samples[0]
+        lines = [
+            "🧠 EXPRESS WASH MEMORY REPORT",
+            "=" * 96,
+            f"Started:  {first['time']:%Y-%m-%d %H:%M:%S}",
+            f"Samples:  {len(self.samples)} (every {self.interval_ms // 1000}s)",
+            f"Growth:   {format_bytes(last['traced'] - first['traced'])} traced, "
+            f"{sum(last['widgets'].values()) - sum(first['widgets'].values()):+d} widgets, "
+            f"{last['live_figures'] - first['live_figures']:+d} figures",
+            "",
+            "TIMELINE",
+            "-" * 96,
+            f"{'Elapsed':>9}{'Traced (MiB)':>14}{'Peak (MiB)':>12}{'RSS (MiB)':>11}{'Widgets':>9}"
+            f"{'pyplot figs':>13}{'Live figs':>11}"
+        ]
+        for s in self.samples[:last['number'] + 1]:
+            rss = f"{s['rss'] / 2**20:.1f}" if s['rss'] else '-'
+            lines.append(f"{s['elapsed'] / 60:>8.1f}m{s['traced'] / 2**20:>14.2f}{s['peak'] / 2**20:>12.2f}"
+                         f"{rss:>11}{sum(s['widgets'].values()):>9}{s['pyplot_figures']:>13}{s['live_figures']:>11}")
+
+        for title, growth in (("LARGEST GROWTH SINCE START", last['growth_total']),
+                              ("LARGEST GROWTH SINCE PREVIOUS SAMPLE", last['growth_recent'])):
+            lines += ["", title, "-" * 96]
+            if not growth:
+                lines.append("(none)")
+            for size, count, filename, lineno in growth:
+                source = linecache.getline(os.path.join(PROJECT_DIR, filename), lineno).strip()
+                lines.append(f"{format_bytes(size):>12} {count:+8d} blocks  {filename}:{lineno}  {source[:50]}")
+
+        lines += ["", "WIDGETS BY CLASS (start -> now)", "-" * 96]
+        for widget_class in sorted(set(first['widgets']) | set(last['widgets'])):
+            before, after = first['widgets'][widget_class], last['widgets'][widget_class]
+            marker = "  ⚠️" if after > before else ""
+            lines.append(f"{widget_class:<24}{before:>6} -> {after:<6}{marker}")
+
+        try:
+            with open(self.report_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as err:
+            print(f"⚠️ Could not write memory report: {err}")
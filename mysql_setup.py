@@ -7,6 +7,10 @@ This script initializes the MySQL database and creates the required tables.
 import mysql.connector
 from mysql.connector import Error
 import sys
+from customers import backfill_customers
+from data_version import bump_data_version
+from service_catalog import backfill_order_items
+from schema import ensure_schema
 
 # Database configuration
 DB_CONFIG = {
@@ -52,28 +56,15 @@ def create_database():
         return False
 
 def create_tables():
-    """Create the orders table"""
+    """Create the orders and price_lists tables"""
     try:
         conn = mysql.connector.connect(**DB_CONFIG)
         cursor = conn.cursor()
         
-        # Create orders table
-        create_table_query = '''
-            CREATE TABLE IF NOT EXISTS orders (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                customer_name VARCHAR(255) NOT NULL,
-                mobile_number VARCHAR(20),
-                order_date DATE NOT NULL,
-                regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
-                blankets_kg DECIMAL(5,2) DEFAULT 0,
-                white_clothes_pieces INT DEFAULT 0,
-                total_amount DECIMAL(10,2) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        '''
-        
-        cursor.execute(create_table_query)
-        print("✅ Orders table created/verified successfully!")
+        # Create/upgrade tables (shared definition in schema.py)
+        ensure_schema(cursor)
+        conn.commit()
+        print("✅ Orders and price list tables created/verified successfully!")
         
         # Show table structure
         cursor.execute("DESCRIBE orders")
@@ -110,12 +101,19 @@ def insert_sample_data():
         '''
         
         cursor.executemany(insert_query, sample_orders)
+        backfill_customers(cursor)
+        backfill_order_items(cursor)
+        bump_data_version(cursor)
         conn.commit()
         
         print(f"✅ Inserted {len(sample_orders)} sample orders successfully!")
         
         # Show sample data
-        cursor.execute("SELECT * FROM orders ORDER BY created_at DESC LIMIT 5")
+        cursor.execute('''
+            SELECT id, customer_name, mobile_number, order_date, regular_clothes_kg,
+                   blankets_kg, white_clothes_pieces, total_amount
+            FROM orders ORDER BY created_at DESC LIMIT 5
+        ''')
         print("\n📊 Sample Data:")
         print("-" * 80)
         for row in cursor.fetchall():
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Order Archive for Express Wash Laundry Billing System
+Moves collected orders older than a horizon from orders into orders_archive
+(an InnoDB table with compressed rows), so the table every screen reads stays
+the size of the last year or so however long the shop has been open.
+
+Archived orders are collected and old, so nothing edits them again. Reports
+and exports that reach back before the newest archived order read both
+tables through orders_source(); everything else keeps reading orders alone.
+
+    python order_archive.py                    # archive orders collected and older than 365 days
+    python order_archive.py --after-days 730 --dry-run
+
+Run it nightly from cron or the Windows Task Scheduler; it works in small
+batches, so the apps can stay open.
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from data_version import bump_data_version
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995',
+    'database': 'express_wash'
+}
+
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH = 5000
+
+# Same columns as orders (see schema.ORDERS_TABLE)
+ORDER_COLUMNS = ['id', 'receipt_number', 'customer_id', 'customer_name', 'mobile_number', 'order_date',
+                 'regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces', 'total_amount', 'price_list_id',
+                 'collection_date', 'created_at']
+
+ORDERS_ARCHIVE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS orders_archive (
+        id INT PRIMARY KEY,
+        receipt_number VARCHAR(32) UNIQUE,
+        customer_id INT NULL,
+        customer_name VARCHAR(255) NOT NULL,
+        mobile_number VARCHAR(20),
+        order_date DATE NOT NULL,
+        regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
+        blankets_kg DECIMAL(5,2) DEFAULT 0,
+        white_clothes_pieces INT DEFAULT 0,
+        total_amount DECIMAL(10,2) NOT NULL,
+        price_list_id INT NULL,
+        collection_date DATETIME NULL,
+        created_at TIMESTAMP NULL,
+        archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX order_date_idx (order_date, collection_date, total_amount),
+        INDEX customer_idx (customer_id, total_amount)
+    ) ROW_FORMAT=COMPRESSED
+'''
+
+# Both tables as one; aliased "orders" so the queries around it read the same
+ALL_ORDERS = (f"(SELECT {', '.join(ORDER_COLUMNS)} FROM orders "
+              f"UNION ALL SELECT {', '.join(ORDER_COLUMNS)} FROM orders_archive) orders")
+
+
+def archived_through(cursor):
+    """Date of the newest archived order, or None when nothing is archived"""
+    cursor.execute('SELECT MAX(order_date) FROM orders_archive')
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def orders_source(cursor, since=None):
+    """Table expression for orders from since on (all orders when since is None)"""
+    newest = archived_through(cursor)
+    if newest is None or (since is not None and since > newest):
+        return 'orders'
+    return ALL_ORDERS
+
+
+def archive_orders(conn, after_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH, progress=True):
+    """Move collected orders older than after_days into orders_archive; returns the number moved"""
+    cutoff = date.today() - timedelta(days=after_days)
+    columns = ', '.join(ORDER_COLUMNS)
+    cursor = conn.cursor()
+    moved = 0
+    start = time.perf_counter()
+    while True:
+        # order_date_idx finds the candidates without reading the orders themselves
+        cursor.execute('''
+            SELECT id FROM orders
+            WHERE order_date < %s AND collection_date IS NOT NULL
+            LIMIT %s
+        ''', (cutoff, batch_size))
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            break
+        placeholders = ', '.join(['%s'] * len(ids))
+        # Each batch moves in its own transaction: the order is in exactly one table at any time
+        try:
+            cursor.execute(f'INSERT INTO orders_archive ({columns}) SELECT {columns} FROM orders WHERE id IN ({placeholders})', ids)
+            cursor.execute(f'DELETE FROM orders WHERE id IN ({placeholders})', ids)
+            bump_data_version(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        moved += len(ids)
+        if progress:
+            rate = moved / max(time.perf_counter() - start, 1e-9)
+            print(f"\r📦 {moved:,} orders archived ({rate:,.0f}/s)", end='', flush=True)
+    if progress and moved:
+        print()
+    return moved
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Archive old collected Express Wash orders")
+    parser.add_argument('--after-days', type=int, default=ARCHIVE_AFTER_DAYS,
+                        help=f"archive collected orders older than this (default: {ARCHIVE_AFTER_DAYS})")
+    parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH, help="orders moved per transaction")
+    parser.add_argument('--dry-run', action='store_true', help="only count the orders that would be archived")
+    args = parser.parse_args()
+
+    import mysql.connector
+    from schema import ensure_schema
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cursor = conn.cursor()
+        ensure_schema(cursor)
+        conn.commit()
+        cutoff = date.today() - timedelta(days=args.after_days)
+        if args.dry_run:
+            cursor.execute('SELECT COUNT(*) FROM orders WHERE order_date < %s AND collection_date IS NOT NULL',
+                           (cutoff,))
+            print(f"🔎 {cursor.fetchone()[0]:,} collected orders from before {cutoff} would be archived")
+            return
+        start = time.perf_counter()
+        moved = archive_orders(conn, args.after_days, args.batch_size)
+        cursor.execute('SELECT COUNT(*) FROM orders')
+        remaining = cursor.fetchone()[0]
+    finally:
+        conn.close()
+    print(f"✅ Archived {moved:,} orders from before {cutoff} in {time.perf_counter() - start:.1f}s; "
+          f"{remaining:,} orders remain in orders")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,967 @@
+"""
+Order Repository for Express Wash Laundry Billing System
+One interface for every operation the apps run against the orders table, with
+three interchangeable storage engines:
+
+- MySQLOrderRepository: the production database (pooled connections from db.py)
+- SQLiteOrderRepository: a single file or ':memory:' database, no server needed
+- InMemoryOrderRepository: dicts plus sorted indexes, for tests and benchmarks
+
+Orders are plain dicts with ORDER_FIELDS. Dates are date objects, timestamps
+datetime objects; amounts are whatever the engine stores (Decimal for MySQL),
+while revenue aggregates always return integer paise (pricing.rupees() turns
+them into rupees for display). benchmarks/storage.py runs the same workload
+against each engine.
+
+Every engine links an order to its customer (customer_id) by mobile number,
+else by name, as the apps do with customers.find_or_create_customer. MySQL
+writes also keep the order's order_items in step and bump the data version
+the Streamlit caches are keyed by.
+
+Long order lists come back as an OrderBatch instead: one sequence per field
+(ids and totals in paise in typed arrays), with an Order record (a slotted
+object) built only for the orders that are looked at.
+"""
+
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+
+from customers import backfill_customers, clean_mobile, find_or_create_customer
+from pricing import rupees, to_paise
+from service_catalog import (COLUMN_SERVICES, backfill_order_items, delete_order_items, delete_orphan_items,
+                             refresh_column_items)
+from data_version import bump_data_version
+
+ORDER_FIELDS = (
+    'id', 'receipt_number', 'customer_name', 'mobile_number', 'order_date',
+    'regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces', 'total_amount',
+    'price_list_id', 'collection_date', 'created_at'
+)
+
+# Fields an insert or update may set (id is assigned by the engine)
+WRITABLE_FIELDS = ORDER_FIELDS[1:]
+
+# Fields the MySQL order_items rows are computed from
+ITEM_FIELDS = {'order_date', 'price_list_id'} | {column for column, _ in COLUMN_SERVICES.values()}
+
+# OrderBatch columns: ORDER_FIELDS with the total held as integer paise
+BATCH_FIELDS = tuple('total_paise' if name == 'total_amount' else name for name in ORDER_FIELDS)
+
+PERIODS = ('day', 'week', 'month')
+
+
+class DuplicateReceiptError(ValueError):
+    """Raised when an insert or update would reuse an existing receipt number"""
+
+
+def _check_fields(order):
+    unknown = set(order) - set(WRITABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown order fields: {', '.join(sorted(unknown))}")
+
+
+def _now():
+    return datetime.now().replace(microsecond=0)
+
+
+def period_start(order_date, period):
+    """Label of the period an order date falls in: the date, the week's Monday or 'YYYY-MM'"""
+    if period == 'day':
+        return order_date
+    if period == 'week':
+        return order_date - timedelta(days=order_date.weekday())
+    if period == 'month':
+        return order_date.strftime('%Y-%m')
+    raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(PERIODS)}")
+
+
+def orders_from_frame(df):
+    """Convert a DataFrame with order columns (e.g. from synthetic_data) to order dicts"""
+    import pandas as pd
+
+    records = df.astype(object).where(df.notna(), None)
+    orders = []
+    for row in records.to_dict('records'):
+        for key, value in row.items():
+            if isinstance(value, pd.Timestamp):
+                row[key] = value.date() if key == 'order_date' else value.to_pydatetime()
+            elif hasattr(value, 'item'):
+                row[key] = value.item()  # numpy scalar
+        orders.append(row)
+    return orders
+
+
+class Order:
+    """One order with ORDER_FIELDS as attributes (slots, so no dict per order)"""
+
+    __slots__ = ORDER_FIELDS
+
+    def __init__(self, *values):
+        for name, value in zip(ORDER_FIELDS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, order):
+        return cls(*(order.get(name) for name in ORDER_FIELDS))
+
+    @property
+    def collected(self):
+        return self.collection_date is not None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in ORDER_FIELDS}
+
+    def __repr__(self):
+        return f"Order(id={self.id!r}, receipt_number={self.receipt_number!r}, customer_name={self.customer_name!r})"
+
+
+class OrderBatch:
+    """Orders stored column by column; batch[i] builds the Order record of row i on demand"""
+
+    __slots__ = ('columns', 'count')
+
+    def __init__(self, columns, count):
+        self.columns = columns
+        self.count = count
+
+    @classmethod
+    def from_rows(cls, rows, fields=ORDER_FIELDS):
+        """Batch from query rows whose values are in fields order; fields not selected are None"""
+        count = len(rows)
+        columns = {name: list(values) for name, values in zip(fields, zip(*rows))}
+        for name in ORDER_FIELDS:
+            columns.setdefault(name, [None] * count)
+        # Ids and totals are read for every row shown: machine integers, not objects
+        columns['id'] = array('q', columns['id'])
+        columns['total_paise'] = array('q', (to_paise(amount) for amount in columns.pop('total_amount')))
+        return cls(columns, count)
+
+    @classmethod
+    def from_orders(cls, orders):
+        """Batch from order dicts (as the repositories return them)"""
+        return cls.from_rows([tuple(order.get(name) for name in ORDER_FIELDS) for order in orders])
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        order = Order(*(self.columns[name][index] for name in BATCH_FIELDS))
+        order.total_amount = rupees(order.total_amount)  # exact Decimal rupees from the paise
+        return order
+
+    def column(self, name):
+        """All values of one field (totals as 'total_paise'), in batch order"""
+        return self.columns[name]
+
+    def extend(self, other):
+        """Append the orders of another batch (the next page of a list)"""
+        for name in BATCH_FIELDS:
+            self.columns[name].extend(other.columns[name])
+        self.count += other.count
+
+    def take(self, positions):
+        """New batch with the orders at positions, in that order"""
+        columns = {}
+        for name, values in self.columns.items():
+            picked = [values[i] for i in positions]
+            columns[name] = array(values.typecode, picked) if isinstance(values, array) else picked
+        return OrderBatch(columns, len(positions))
+
+    def sorted_by(self, field, descending=False):
+        """New batch sorted on one field like MySQL would: text ignoring case, NULL lowest"""
+        # One key per order, computed once, instead of comparing Order records
+        values = self.columns['total_paise' if field == 'total_amount' else field]
+        if isinstance(values, array):
+            keys = values  # numbers, never NULL
+        else:
+            keys = [(value is not None, value.casefold() if isinstance(value, str) else value) for value in values]
+        return self.take(sorted(range(self.count), key=keys.__getitem__, reverse=descending))
+
+    def index_of(self, order_id):
+        """Position of the order with order_id, or None"""
+        try:
+            return self.columns['id'].index(order_id)
+        except ValueError:
+            return None
+
+
+class OrderRepository(ABC):
+    """Storage interface for orders"""
+
+    @abstractmethod
+    def insert(self, order):
+        """Store a new order and return its id"""
+
+    def insert_many(self, orders):
+        """Store many orders; returns the number stored"""
+        count = 0
+        for order in orders:
+            self.insert(order)
+            count += 1
+        return count
+
+    @abstractmethod
+    def get(self, order_id):
+        """Order by id, or None"""
+
+    @abstractmethod
+    def get_by_receipt(self, receipt_number):
+        """Order by receipt number, or None"""
+
+    @abstractmethod
+    def search(self, term, limit=None):
+        """Orders whose receipt number or customer name contains term, newest first"""
+
+    @abstractmethod
+    def list_page(self, offset=0, limit=50):
+        """One page of orders, newest first"""
+
+    def search_batch(self, term, limit=None):
+        """search() as an OrderBatch"""
+        return OrderBatch.from_orders(self.search(term, limit))
+
+    def page_batch(self, offset=0, limit=50):
+        """list_page() as an OrderBatch"""
+        return OrderBatch.from_orders(self.list_page(offset, limit))
+
+    @abstractmethod
+    def count(self):
+        """Number of orders"""
+
+    @abstractmethod
+    def update(self, order_id, changes):
+        """Change fields of an order; returns False if it does not exist"""
+
+    @abstractmethod
+    def delete(self, order_id):
+        """Delete an order; returns False if it does not exist"""
+
+    @abstractmethod
+    def collect(self, receipt_number, when=None):
+        """Mark an order as collected (now by default); returns False if missing or already collected"""
+
+    @abstractmethod
+    def last_receipt_number(self, prefix):
+        """Receipt number of the latest order whose receipt starts with prefix, or None"""
+
+    @abstractmethod
+    def summary(self):
+        """Dict with total_orders, total_revenue_paise, pending_orders and collected_orders"""
+
+    @abstractmethod
+    def service_totals(self):
+        """Dict with the summed regular, blankets and white quantities"""
+
+    @abstractmethod
+    def revenue_by_period(self, period='day', since=None):
+        """[(period, orders, revenue in paise), ...] oldest first, for orders dated on or after since"""
+
+    @abstractmethod
+    def status_by_day(self, since=None):
+        """[(order_date, pending, collected), ...] oldest first, for orders dated on or after since"""
+
+    @abstractmethod
+    def clear(self):
+        """Delete every order"""
+
+    def close(self):
+        """Release connections (nothing to do for most engines)"""
+
+
+# --- MySQL ---
+
+class MySQLOrderRepository(OrderRepository):
+    """Orders in the MySQL database used by the apps"""
+
+    _PERIOD_SQL = {
+        'day': 'order_date',
+        'week': 'DATE_SUB(order_date, INTERVAL WEEKDAY(order_date) DAY)',
+        'month': "DATE_FORMAT(order_date, '%Y-%m')"
+    }
+
+    def __init__(self, db_config):
+        self.db_config = db_config
+
+    def _run(self, sql, params=(), fetch=None, many=False):
+        import mysql.connector
+        from db import get_connection
+
+        conn = get_connection(self.db_config)
+        try:
+            cursor = conn.cursor(dictionary=(fetch in ('one', 'all')))
+            try:
+                if many:
+                    cursor.executemany(sql, params)
+                else:
+                    cursor.execute(sql, params)
+            except mysql.connector.IntegrityError as err:
+                if err.errno == 1062:  # ER_DUP_ENTRY
+                    raise DuplicateReceiptError(str(err)) from err
+                raise
+            if fetch == 'one':
+                result = cursor.fetchone()
+            elif fetch in ('all', 'rows'):
+                result = cursor.fetchall()
+            elif fetch == 'id':
+                result = cursor.lastrowid
+            else:
+                result = cursor.rowcount
+            conn.commit()
+            return result
+        finally:
+            conn.close()
+
+    def _transaction(self, work):
+        """Run work(cursor) in one transaction and return its result"""
+        import mysql.connector
+        from db import get_connection
+
+        conn = get_connection(self.db_config)
+        try:
+            cursor = conn.cursor()
+            try:
+                result = work(cursor)
+            except mysql.connector.IntegrityError as err:
+                conn.rollback()
+                if err.errno == 1062:  # ER_DUP_ENTRY
+                    raise DuplicateReceiptError(str(err)) from err
+                raise
+            except Exception:
+                conn.rollback()
+                raise
+            conn.commit()
+            return result
+        finally:
+            conn.close()
+
+    def insert(self, order):
+        _check_fields(order)
+
+        def work(cursor):
+            customer_id = find_or_create_customer(cursor, order['customer_name'], order.get('mobile_number'))
+            columns = list(order) + ['customer_id']
+            cursor.execute(f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                           tuple(order.values()) + (customer_id,))
+            order_id = cursor.lastrowid
+            backfill_order_items(cursor, order_id)
+            bump_data_version(cursor)
+            return order_id
+        return self._transaction(work)
+
+    def insert_many(self, orders, batch_size=5000):
+        orders = list(orders)
+        if not orders:
+            return 0
+        columns = list(orders[0])
+        _check_fields(columns)
+        sql = f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        for start in range(0, len(orders), batch_size):
+            rows = [tuple(order[c] for c in columns) for order in orders[start:start + batch_size]]
+            self._run(sql, rows, many=True)
+        # Linked in bulk afterwards, as the other bulk loaders do
+        def link(cursor):
+            backfill_customers(cursor)
+            backfill_order_items(cursor)
+            bump_data_version(cursor)
+        self._transaction(link)
+        return len(orders)
+
+    def get(self, order_id):
+        return self._run("SELECT * FROM orders WHERE id = %s", (order_id,), fetch='one')
+
+    def get_by_receipt(self, receipt_number):
+        return self._run("SELECT * FROM orders WHERE receipt_number = %s", (receipt_number,), fetch='one')
+
+    def search(self, term, limit=None):
+        sql = '''
+            SELECT * FROM orders
+            WHERE receipt_number LIKE %s OR customer_name LIKE %s
+            ORDER BY created_at DESC, id DESC
+        '''
+        params = (f'%{term}%', f'%{term}%')
+        if limit is not None:
+            sql += ' LIMIT %s'
+            params += (limit,)
+        return self._run(sql, params, fetch='all')
+
+    def list_page(self, offset=0, limit=50):
+        return self._run("SELECT * FROM orders ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s",
+                         (limit, offset), fetch='all')
+
+    # The batches read plain rows in ORDER_FIELDS order instead of a dict per order
+    def search_batch(self, term, limit=None):
+        sql = f'''
+            SELECT {', '.join(ORDER_FIELDS)} FROM orders
+            WHERE receipt_number LIKE %s OR customer_name LIKE %s
+            ORDER BY created_at DESC, id DESC
+        '''
+        params = (f'%{term}%', f'%{term}%')
+        if limit is not None:
+            sql += ' LIMIT %s'
+            params += (limit,)
+        return OrderBatch.from_rows(self._run(sql, params, fetch='rows'))
+
+    def page_batch(self, offset=0, limit=50):
+        rows = self._run(f"SELECT {', '.join(ORDER_FIELDS)} FROM orders ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s",
+                         (limit, offset), fetch='rows')
+        return OrderBatch.from_rows(rows)
+
+    def count(self):
+        return self._run("SELECT COUNT(*) FROM orders", fetch='rows')[0][0]
+
+    def update(self, order_id, changes):
+        _check_fields(changes)
+        if not changes:
+            return self.get(order_id) is not None
+
+        def work(cursor):
+            # MySQL reports 0 changed rows when nothing changed, so read the order first
+            cursor.execute("SELECT customer_name, mobile_number FROM orders WHERE id = %s", (order_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                return False
+            assigned = dict(changes)
+            if 'customer_name' in changes or 'mobile_number' in changes:
+                assigned['customer_id'] = find_or_create_customer(
+                    cursor, changes.get('customer_name', rows[0][0]), changes.get('mobile_number', rows[0][1]), order_id)
+            assignments = ', '.join(f"{column} = %s" for column in assigned)
+            cursor.execute(f"UPDATE orders SET {assignments} WHERE id = %s", tuple(assigned.values()) + (order_id,))
+            if ITEM_FIELDS & set(changes):
+                refresh_column_items(cursor, order_id)
+            bump_data_version(cursor)
+            return True
+        return self._transaction(work)
+
+    def delete(self, order_id):
+        def work(cursor):
+            cursor.execute("DELETE FROM orders WHERE id = %s", (order_id,))
+            if cursor.rowcount == 0:
+                return False
+            delete_order_items(cursor, order_id)
+            bump_data_version(cursor)
+            return True
+        return self._transaction(work)
+
+    def collect(self, receipt_number, when=None):
+        def work(cursor):
+            cursor.execute('''
+                UPDATE orders SET collection_date = COALESCE(%s, NOW())
+                WHERE receipt_number = %s AND collection_date IS NULL
+            ''', (when, receipt_number))
+            if cursor.rowcount == 0:
+                return False
+            bump_data_version(cursor)
+            return True
+        return self._transaction(work)
+
+    def last_receipt_number(self, prefix):
+        rows = self._run("SELECT receipt_number FROM orders WHERE receipt_number LIKE %s ORDER BY id DESC LIMIT 1",
+                         (prefix + '%',), fetch='rows')
+        return rows[0][0] if rows else None
+
+    def summary(self):
+        row = self._run('''
+            SELECT COUNT(*),
+                   COALESCE(CAST(SUM(total_amount) * 100 AS SIGNED), 0),
+                   COALESCE(SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END), 0)
+            FROM orders
+        ''', fetch='rows')[0]
+        return {'total_orders': row[0], 'total_revenue_paise': int(row[1]),
+                'pending_orders': int(row[2]), 'collected_orders': int(row[3])}
+
+    def service_totals(self):
+        row = self._run('''
+            SELECT COALESCE(SUM(regular_clothes_kg), 0), COALESCE(SUM(blankets_kg), 0),
+                   COALESCE(SUM(white_clothes_pieces), 0)
+            FROM orders
+        ''', fetch='rows')[0]
+        return {'regular': float(row[0]), 'blankets': float(row[1]), 'white': int(row[2])}
+
+    def revenue_by_period(self, period='day', since=None):
+        if period not in self._PERIOD_SQL:
+            raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(PERIODS)}")
+        where, params = ("WHERE order_date >= %s", (since,)) if since else ("", ())
+        rows = self._run(f'''
+            SELECT {self._PERIOD_SQL[period]} AS period, COUNT(*), CAST(SUM(total_amount) * 100 AS SIGNED)
+            FROM orders {where}
+            GROUP BY period
+            ORDER BY period
+        ''', params, fetch='rows')
+        return [(label, orders, int(revenue)) for label, orders, revenue in rows]
+
+    def status_by_day(self, since=None):
+        where, params = ("WHERE order_date >= %s", (since,)) if since else ("", ())
+        rows = self._run(f'''
+            SELECT order_date,
+                   SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END)
+            FROM orders {where}
+            GROUP BY order_date
+            ORDER BY order_date
+        ''', params, fetch='rows')
+        return [(day, int(pending), int(collected)) for day, pending, collected in rows]
+
+    def clear(self):
+        self._run("TRUNCATE TABLE orders")
+
+        # Items of archived orders stay; the rest would be counted by the per-service reports
+        def drop_items(cursor):
+            delete_orphan_items(cursor)
+            bump_data_version(cursor)
+        self._transaction(drop_items)
+
+
+# --- SQLite ---
+
+SQLITE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS customers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        mobile_number TEXT UNIQUE
+    );
+    CREATE INDEX IF NOT EXISTS customer_name_idx ON customers (name);
+    CREATE TABLE IF NOT EXISTS orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INTEGER REFERENCES customers (id),
+        receipt_number TEXT UNIQUE,
+        customer_name TEXT NOT NULL,
+        mobile_number TEXT,
+        order_date TEXT NOT NULL,
+        regular_clothes_kg REAL DEFAULT 0,
+        blankets_kg REAL DEFAULT 0,
+        white_clothes_pieces INTEGER DEFAULT 0,
+        total_amount REAL NOT NULL,
+        price_list_id INTEGER,
+        collection_date TEXT,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS created_at_idx ON orders (created_at);
+    CREATE INDEX IF NOT EXISTS order_date_idx ON orders (order_date);
+    CREATE INDEX IF NOT EXISTS customer_idx ON orders (customer_id);
+'''
+
+
+def _to_sqlite(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ', timespec='seconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, 'as_integer_ratio') and not isinstance(value, (int, float)):
+        return float(value)  # Decimal
+    return value
+
+
+def _from_sqlite(row):
+    if row is None:
+        return None
+    order = dict(row)
+    order['order_date'] = date.fromisoformat(order['order_date'])
+    for key in ('collection_date', 'created_at'):
+        if order[key]:
+            order[key] = datetime.fromisoformat(order[key])
+    return order
+
+
+class SQLiteOrderRepository(OrderRepository):
+    """Orders in a SQLite file (or ':memory:'), dates stored as ISO text"""
+
+    _PERIOD_SQL = {
+        'day': 'order_date',
+        'week': "date(order_date, '-' || ((CAST(strftime('%w', order_date) AS INTEGER) + 6) % 7) || ' days')",
+        'month': "strftime('%Y-%m', order_date)"
+    }
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _execute(self, sql, params=()):
+        with self._lock, self._conn:
+            try:
+                return self._conn.execute(sql, [_to_sqlite(p) for p in params])
+            except sqlite3.IntegrityError as err:
+                if 'receipt_number' in str(err):
+                    raise DuplicateReceiptError(str(err)) from err
+                raise
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, [_to_sqlite(p) for p in params]).fetchall()
+
+    def _customer_id(self, customer_name, mobile_number, order_id=None):
+        """find_or_create_customer for SQLite; call inside a transaction"""
+        customer_name = customer_name.strip()
+        mobile_number = clean_mobile(mobile_number)
+        if mobile_number:
+            row = self._conn.execute("SELECT id FROM customers WHERE mobile_number = ?", (mobile_number,)).fetchone()
+            if row is None:
+                return self._conn.execute("INSERT INTO customers (name, mobile_number) VALUES (?, ?)",
+                                          (customer_name, mobile_number)).lastrowid
+            newer = order_id is not None and self._conn.execute(
+                "SELECT 1 FROM orders WHERE customer_id = ? AND id > ? LIMIT 1", (row[0], order_id)).fetchone()
+            if not newer:
+                self._conn.execute("UPDATE customers SET name = ? WHERE id = ?", (customer_name, row[0]))
+            return row[0]
+        row = self._conn.execute("SELECT id FROM customers WHERE mobile_number IS NULL AND name = ? LIMIT 1",
+                                 (customer_name,)).fetchone()
+        if row is not None:
+            return row[0]
+        return self._conn.execute("INSERT INTO customers (name) VALUES (?)", (customer_name,)).lastrowid
+
+    def insert(self, order):
+        _check_fields(order)
+        order = dict(order)
+        order.setdefault('created_at', _now())
+        with self._lock, self._conn:
+            order['customer_id'] = self._customer_id(order['customer_name'], order.get('mobile_number'))
+            columns = list(order)
+            try:
+                return self._conn.execute(
+                    f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+                    [_to_sqlite(value) for value in order.values()]).lastrowid
+            except sqlite3.IntegrityError as err:
+                if 'receipt_number' in str(err):
+                    raise DuplicateReceiptError(str(err)) from err
+                raise
+
+    def insert_many(self, orders):
+        orders = list(orders)
+        if not orders:
+            return 0
+        columns = list(orders[0])
+        _check_fields(columns)
+        if 'created_at' not in columns:
+            columns.append('created_at')
+        now = _now()
+        with self._lock, self._conn:
+            rows = [[_to_sqlite(order.get(c, now) if c == 'created_at' else order[c]) for c in columns]
+                    + [self._customer_id(order['customer_name'], order.get('mobile_number'))]
+                    for order in orders]
+            columns.append('customer_id')
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO orders ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})", rows)
+            except sqlite3.IntegrityError as err:
+                raise DuplicateReceiptError(str(err)) from err
+        return len(rows)
+
+    def get(self, order_id):
+        rows = self._query("SELECT * FROM orders WHERE id = ?", (order_id,))
+        return _from_sqlite(rows[0]) if rows else None
+
+    def get_by_receipt(self, receipt_number):
+        rows = self._query("SELECT * FROM orders WHERE receipt_number = ?", (receipt_number,))
+        return _from_sqlite(rows[0]) if rows else None
+
+    def search(self, term, limit=None):
+        # LIKE is case-insensitive for ASCII, as with MySQL's default collation
+        return [_from_sqlite(row) for row in self._query('''
+            SELECT * FROM orders
+            WHERE receipt_number LIKE ? OR customer_name LIKE ?
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        ''', (f'%{term}%', f'%{term}%', -1 if limit is None else limit))]
+
+    def list_page(self, offset=0, limit=50):
+        return [_from_sqlite(row) for row in self._query(
+            "SELECT * FROM orders ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?", (limit, offset))]
+
+    def count(self):
+        return self._query("SELECT COUNT(*) FROM orders")[0][0]
+
+    def update(self, order_id, changes):
+        _check_fields(changes)
+        if not changes:
+            return self.get(order_id) is not None
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT customer_name, mobile_number FROM orders WHERE id = ?",
+                                     (order_id,)).fetchone()
+            if row is None:
+                return False
+            assigned = dict(changes)
+            if 'customer_name' in changes or 'mobile_number' in changes:
+                assigned['customer_id'] = self._customer_id(
+                    changes.get('customer_name', row[0]), changes.get('mobile_number', row[1]), order_id)
+            assignments = ', '.join(f"{column} = ?" for column in assigned)
+            try:
+                self._conn.execute(f"UPDATE orders SET {assignments} WHERE id = ?",
+                                   [_to_sqlite(value) for value in assigned.values()] + [order_id])
+            except sqlite3.IntegrityError as err:
+                if 'receipt_number' in str(err):
+                    raise DuplicateReceiptError(str(err)) from err
+                raise
+            return True
+
+    def delete(self, order_id):
+        return self._execute("DELETE FROM orders WHERE id = ?", (order_id,)).rowcount > 0
+
+    def collect(self, receipt_number, when=None):
+        return self._execute('''
+            UPDATE orders SET collection_date = ?
+            WHERE receipt_number = ? AND collection_date IS NULL
+        ''', (when or _now(), receipt_number)).rowcount > 0
+
+    def last_receipt_number(self, prefix):
+        rows = self._query("SELECT receipt_number FROM orders WHERE receipt_number LIKE ? ORDER BY id DESC LIMIT 1",
+                           (prefix + '%',))
+        return rows[0][0] if rows else None
+
+    def summary(self):
+        row = self._query('''
+            SELECT COUNT(*), COALESCE(SUM(CAST(ROUND(total_amount * 100) AS INTEGER)), 0),
+                   COALESCE(SUM(collection_date IS NULL), 0), COALESCE(SUM(collection_date IS NOT NULL), 0)
+            FROM orders
+        ''')[0]
+        return {'total_orders': row[0], 'total_revenue_paise': row[1],
+                'pending_orders': row[2], 'collected_orders': row[3]}
+
+    def service_totals(self):
+        row = self._query('''
+            SELECT COALESCE(SUM(regular_clothes_kg), 0), COALESCE(SUM(blankets_kg), 0),
+                   COALESCE(SUM(white_clothes_pieces), 0)
+            FROM orders
+        ''')[0]
+        return {'regular': float(row[0]), 'blankets': float(row[1]), 'white': int(row[2])}
+
+    def revenue_by_period(self, period='day', since=None):
+        if period not in self._PERIOD_SQL:
+            raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(PERIODS)}")
+        where, params = ("WHERE order_date >= ?", (since,)) if since else ("", ())
+        rows = self._query(f'''
+            SELECT {self._PERIOD_SQL[period]} AS period, COUNT(*), SUM(CAST(ROUND(total_amount * 100) AS INTEGER))
+            FROM orders {where}
+            GROUP BY period
+            ORDER BY period
+        ''', params)
+        return [(label if period == 'month' else date.fromisoformat(label), orders, revenue)
+                for label, orders, revenue in rows]
+
+    def status_by_day(self, since=None):
+        where, params = ("WHERE order_date >= ?", (since,)) if since else ("", ())
+        rows = self._query(f'''
+            SELECT order_date, SUM(collection_date IS NULL), SUM(collection_date IS NOT NULL)
+            FROM orders {where}
+            GROUP BY order_date
+            ORDER BY order_date
+        ''', params)
+        return [(date.fromisoformat(day), pending, collected) for day, pending, collected in rows]
+
+    def clear(self):
+        self._execute("DELETE FROM orders")
+
+    def close(self):
+        self._conn.close()
+
+
+# --- In memory ---
+
+class InMemoryOrderRepository(OrderRepository):
+    """Orders in a dict by id, with a receipt index and sorted (created_at, id) and (order_date, id) lists"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.customers = {}  # id -> {'id', 'name', 'mobile_number'}
+        self._customer_keys = {}  # mobile number, or (None, name) without one -> customer id
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._orders = {}
+            self._by_receipt = {}
+            self._by_created = []
+            self._by_date = []
+            self._customer_orders = {}  # customer id -> ids of their orders
+            self._next_id = 1
+
+    def _customer_id(self, customer_name, mobile_number, order_id=None):
+        """find_or_create_customer for the in-memory engine"""
+        customer_name = customer_name.strip()
+        mobile_number = clean_mobile(mobile_number)
+        key = mobile_number or (None, customer_name)
+        customer_id = self._customer_keys.get(key)
+        if customer_id is None:
+            customer_id = len(self.customers) + 1
+            self.customers[customer_id] = {'id': customer_id, 'name': customer_name, 'mobile_number': mobile_number}
+            self._customer_keys[key] = customer_id
+        elif mobile_number and not (order_id is not None and
+                                    any(other > order_id for other in self._customer_orders.get(customer_id, ()))):
+            self.customers[customer_id]['name'] = customer_name
+        return customer_id
+
+    def _index(self, order):
+        if order['receipt_number'] is not None:
+            self._by_receipt[order['receipt_number']] = order['id']
+        insort(self._by_created, (order['created_at'], order['id']))
+        insort(self._by_date, (order['order_date'], order['id']))
+
+    def _unindex(self, order):
+        self._by_receipt.pop(order['receipt_number'], None)
+        for index, key in ((self._by_created, (order['created_at'], order['id'])),
+                           (self._by_date, (order['order_date'], order['id']))):
+            del index[bisect_left(index, key)]
+
+    def insert(self, order):
+        _check_fields(order)
+        with self._lock:
+            receipt = order.get('receipt_number')
+            if receipt is not None and receipt in self._by_receipt:
+                raise DuplicateReceiptError(f"Duplicate receipt number {receipt!r}")
+            stored = dict.fromkeys(ORDER_FIELDS)
+            stored.update(regular_clothes_kg=0, blankets_kg=0, white_clothes_pieces=0)
+            stored.update(order)
+            stored['id'] = self._next_id
+            if stored['created_at'] is None:
+                stored['created_at'] = _now()
+            stored['customer_id'] = self._customer_id(stored['customer_name'], stored['mobile_number'])
+            self._next_id += 1
+            self._orders[stored['id']] = stored
+            self._customer_orders.setdefault(stored['customer_id'], set()).add(stored['id'])
+            self._index(stored)
+            return stored['id']
+
+    def insert_many(self, orders):
+        with self._lock:
+            return super().insert_many(orders)
+
+    def get(self, order_id):
+        with self._lock:
+            order = self._orders.get(order_id)
+            return dict(order) if order else None
+
+    def get_by_receipt(self, receipt_number):
+        with self._lock:
+            order_id = self._by_receipt.get(receipt_number)
+            return dict(self._orders[order_id]) if order_id is not None else None
+
+    def _newest_first(self):
+        for _, order_id in reversed(self._by_created):
+            yield self._orders[order_id]
+
+    def search(self, term, limit=None):
+        term = term.lower()
+        results = []
+        with self._lock:
+            for order in self._newest_first():
+                if term in (order['receipt_number'] or '').lower() or term in order['customer_name'].lower():
+                    results.append(dict(order))
+                    if limit is not None and len(results) >= limit:
+                        break
+        return results
+
+    def list_page(self, offset=0, limit=50):
+        with self._lock:
+            end = len(self._by_created) - offset
+            keys = self._by_created[max(end - limit, 0):max(end, 0)]
+            return [dict(self._orders[order_id]) for _, order_id in reversed(keys)]
+
+    def count(self):
+        return len(self._orders)
+
+    def update(self, order_id, changes):
+        _check_fields(changes)
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return False
+            receipt = changes.get('receipt_number', order['receipt_number'])
+            if receipt != order['receipt_number'] and receipt in self._by_receipt:
+                raise DuplicateReceiptError(f"Duplicate receipt number {receipt!r}")
+            if 'customer_name' in changes or 'mobile_number' in changes:
+                customer_id = self._customer_id(changes.get('customer_name', order['customer_name']),
+                                                changes.get('mobile_number', order['mobile_number']), order_id)
+                self._customer_orders[order['customer_id']].discard(order_id)
+                self._customer_orders.setdefault(customer_id, set()).add(order_id)
+                order['customer_id'] = customer_id
+            self._unindex(order)
+            order.update(changes)
+            self._index(order)
+            return True
+
+    def delete(self, order_id):
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return False
+            self._customer_orders[order['customer_id']].discard(order_id)
+            self._unindex(order)
+            return True
+
+    def collect(self, receipt_number, when=None):
+        with self._lock:
+            order_id = self._by_receipt.get(receipt_number)
+            if order_id is None or self._orders[order_id]['collection_date'] is not None:
+                return False
+            self._orders[order_id]['collection_date'] = when or _now()
+            return True
+
+    def last_receipt_number(self, prefix):
+        with self._lock:
+            for order_id in reversed(self._orders):  # dicts keep insertion (id) order
+                receipt = self._orders[order_id]['receipt_number']
+                if receipt and receipt.startswith(prefix):
+                    return receipt
+        return None
+
+    def summary(self):
+        with self._lock:
+            pending = sum(1 for order in self._orders.values() if order['collection_date'] is None)
+            return {
+                'total_orders': len(self._orders),
+                'total_revenue_paise': sum(to_paise(order['total_amount']) for order in self._orders.values()),
+                'pending_orders': pending,
+                'collected_orders': len(self._orders) - pending
+            }
+
+    def service_totals(self):
+        with self._lock:
+            orders = self._orders.values()
+            return {
+                'regular': float(sum(float(o['regular_clothes_kg'] or 0) for o in orders)),
+                'blankets': float(sum(float(o['blankets_kg'] or 0) for o in orders)),
+                'white': int(sum(o['white_clothes_pieces'] or 0 for o in orders))
+            }
+
+    def _dated(self, since):
+        start = bisect_left(self._by_date, (since,)) if since else 0
+        for _, order_id in self._by_date[start:]:
+            yield self._orders[order_id]
+
+    def revenue_by_period(self, period='day', since=None):
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period {period!r}; expected one of {', '.join(PERIODS)}")
+        groups = {}
+        with self._lock:
+            for order in self._dated(since):
+                label = period_start(order['order_date'], period)
+                orders, revenue = groups.get(label, (0, 0))
+                groups[label] = (orders + 1, revenue + to_paise(order['total_amount']))
+        return [(label, orders, revenue) for label, (orders, revenue) in sorted(groups.items())]
+
+    def status_by_day(self, since=None):
+        groups = {}
+        with self._lock:
+            for order in self._dated(since):
+                pending, collected = groups.get(order['order_date'], (0, 0))
+                if order['collection_date'] is None:
+                    pending += 1
+                else:
+                    collected += 1
+                groups[order['order_date']] = (pending, collected)
+        return [(day, pending, collected) for day, (pending, collected) in sorted(groups.items())]
+
+
+ENGINES = {
+    'memory': InMemoryOrderRepository,
+    'sqlite': SQLiteOrderRepository,
+    'mysql': MySQLOrderRepository
+}
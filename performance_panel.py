@@ -0,0 +1,127 @@
+"""
+Performance Panel for Express Wash Laundry Billing System
+Tk frame showing the latency histograms recorded by instrumentation.py:
+one row per call site (database query, Tk command or page) with its count,
+errors, average/p95/max time and rows returned, plus the slow-query log.
+Shared by both desktop apps' reports windows.
+"""
+
+import json
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from instrumentation import REGISTRY, snapshot, slow_queries, render_metrics, SLOW_QUERY_MS
+
+REFRESH_MS = 1000
+
+COLUMNS = (
+    ('kind', "Kind", 60),
+    ('site', "Call site", 320),
+    ('count', "Count", 70),
+    ('errors', "Errors", 60),
+    ('avg_ms', "Avg (ms)", 80),
+    ('p95_ms', "p95 (ms)", 80),
+    ('max_ms', "Max (ms)", 80),
+    ('rows', "Rows", 80)
+)
+
+
+class PerformancePanel(tk.Frame):
+    """Live table of call-site latencies and the slow queries with their EXPLAIN plans"""
+
+    def __init__(self, parent, bg='#f0f8ff'):
+        super().__init__(parent, bg=bg)
+
+        button_frame = tk.Frame(self, bg=bg)
+        button_frame.pack(fill='x', padx=20, pady=(20, 10))
+
+        tk.Label(button_frame, text=f"Queries slower than {SLOW_QUERY_MS} ms are logged below",
+                font=('Arial', 10), bg=bg, fg='#6b7280').pack(side='left')
+        tk.Button(button_frame, text="💾 Save metrics", command=self.save_metrics,
+                 font=('Arial', 10, 'bold'), bg='#3b82f6', fg='white',
+                 relief='raised', bd=2, padx=15, pady=5).pack(side='right', padx=(10, 0))
+        tk.Button(button_frame, text="🔄 Reset", command=self.reset,
+                 font=('Arial', 10, 'bold'), bg='#6b7280', fg='white',
+                 relief='raised', bd=2, padx=15, pady=5).pack(side='right')
+
+        table_frame = tk.Frame(self, bg=bg)
+        table_frame.pack(fill='both', expand=True, padx=20)
+
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in COLUMNS], show='headings', height=12)
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor='w' if key in ('kind', 'site') else 'e')
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        tk.Label(self, text="🐢 Slow Queries", font=('Arial', 12, 'bold'),
+                bg=bg, fg='#1e3a8a').pack(anchor='w', padx=20, pady=(10, 0))
+        self.slow_text = tk.Text(self, font=('Courier', 9), bg='white', fg='#374151', wrap='none', height=10)
+        self.slow_text.pack(fill='both', expand=True, padx=20, pady=(5, 20))
+
+        self._shown_slow = None
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the table and slow-query log, then schedule the next refresh"""
+        if not self.winfo_exists():
+            return
+        rows = snapshot()
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert('', 'end', values=(
+                row['kind'], row['site'], f"{row['count']:,}", row['errors'],
+                f"{row['avg_ms']:.1f}", f"{row['p95_ms']:.1f}", f"{row['max_ms']:.1f}",
+                f"{row['rows']:,}" if row['kind'] == 'db' else ''
+            ))
+
+        entries = slow_queries()
+        # Only rewrite the text when something changed so a selection is kept
+        signature = (len(entries), entries[-1]['time'] if entries else None,
+                     sum(1 for e in entries if e['explain'] is not None))
+        if signature != self._shown_slow:
+            self._shown_slow = signature
+            self.slow_text.delete('1.0', tk.END)
+            self.slow_text.insert('1.0', "\n".join(self.format_slow_query(e) for e in reversed(entries))
+                                  or "No slow queries recorded.")
+
+        self.after(REFRESH_MS, self.refresh)
+
+    @staticmethod
+    def format_slow_query(entry):
+        """Format one slow-query log entry with its EXPLAIN plan"""
+        lines = [f"[{entry['time']}] {entry['ms']:.0f} ms  {entry['site']}", f"  {entry['sql']}"]
+        if entry['params']:
+            lines.append(f"  params: {entry['params']}")
+        explain = entry['explain']
+        if explain is None:
+            lines.append("  EXPLAIN: (pending)")
+        elif isinstance(explain, str):
+            lines.append(f"  {explain}")
+        else:
+            for plan in explain:
+                lines.append(f"  EXPLAIN: {json.dumps(plan, default=str)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Clear all recorded statistics"""
+        REGISTRY.reset()
+        self.refresh()
+
+    def save_metrics(self):
+        """Save the metrics text dump to a file"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            initialfile="express_wash_metrics.txt"
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(render_metrics())
+            messagebox.showinfo("Success", f"✅ Metrics saved to {filename}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Error saving metrics: {str(e)}")
@@ -0,0 +1,276 @@
+"""
+Pricing Engine for Express Wash Laundry Billing System
+Rates live in the price_lists table with an effective date. Every front end
+prices orders through PricingEngine, and each order records the id of the
+price list it was billed under so old invoices keep their original rates.
+
+The services themselves come from the services table (see service_catalog.py);
+SERVICES are the three that also have a quantity column on orders and a rate
+column on price_lists.
+
+Money is counted in integer paise: costs are integer products rounded to the
+nearest paisa once per service, and sums are exact. Rupee amounts (Decimal)
+are only made for display and for the DECIMAL(10,2) columns.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+SERVICES = ('regular_clothes', 'blankets', 'white_clothes')
+
+SERVICE_LABELS = {
+    'regular_clothes': 'Regular Clothes',
+    'blankets': 'Blankets/Bedsheets',
+    'white_clothes': 'White Clothes'
+}
+
+SERVICE_UNITS = {
+    'regular_clothes': 'kg',
+    'blankets': 'kg',
+    'white_clothes': 'piece'
+}
+
+# Rates used before any price list was stored (and as a fallback without a database)
+DEFAULT_PRICING = {
+    'regular_clothes': 50,  # ₹50/kg
+    'blankets': 100,        # ₹100/kg
+    'white_clothes': 40     # ₹40/piece
+}
+DEFAULT_PRICE_LIST_NAME = 'Standard rates'
+DEFAULT_EFFECTIVE_FROM = date(2000, 1, 1)
+
+PriceList = namedtuple('PriceList', ['id', 'name', 'effective_from', 'rates'])
+
+DEFAULT_PRICE_LIST = PriceList(None, DEFAULT_PRICE_LIST_NAME, DEFAULT_EFFECTIVE_FROM, dict(DEFAULT_PRICING))
+
+Service = namedtuple('Service', ['id', 'code', 'label', 'unit', 'active'])
+
+# One priced line of a bill; paise is the cost of quantity at rate
+BillItem = namedtuple('BillItem', ['service', 'quantity', 'rate', 'paise'])
+
+# The catalogue before the services table existed (and as a fallback without a database)
+DEFAULT_SERVICES = tuple(Service(None, code, SERVICE_LABELS[code], SERVICE_UNITS[code], True) for code in SERVICES)
+
+
+def as_date(value):
+    """Convert a date, datetime or 'YYYY-MM-DD' string to a date (today if empty)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if value:
+        return date.fromisoformat(str(value)[:10])
+    return date.today()
+
+
+def to_paise(amount):
+    """Rupees (int, float, Decimal or string) as integer paise, rounded half up"""
+    return int((Decimal(str(amount or 0)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def rupees(paise):
+    """Integer paise as an exact Decimal rupee amount, e.g. 12350 -> Decimal('123.50')"""
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def cost_paise(quantity, rate_paise):
+    """Cost of a quantity (kg to two places, or pieces) at a rate, to the nearest paisa"""
+    hundredths = to_paise(quantity)  # a quantity to two places is a whole number of hundredths
+    return (hundredths * rate_paise + 50) // 100
+
+
+def format_rate(price_list, service, unit=None):
+    """Return a display string such as '₹50/kg' for one service (unit needed for catalogue services)"""
+    return f"₹{price_list.rates[service]:g}/{unit or SERVICE_UNITS[service]}"
+
+
+class PricingEngine:
+    """Resolves the price list for an order and prices single orders or whole arrays"""
+
+    def __init__(self, price_lists=None, services=None):
+        self.services = tuple(services or DEFAULT_SERVICES)
+        self._services = {s.code: s for s in self.services}
+        price_lists = list(price_lists or []) or [DEFAULT_PRICE_LIST]
+        self.price_lists = sorted(price_lists, key=lambda p: p.effective_from)
+        self._dates = [p.effective_from for p in self.price_lists]
+        self._by_id = {p.id: p for p in self.price_lists if p.id is not None}
+        self._compiled = None
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Load every price list and the service catalogue using an open cursor"""
+        cursor.execute('SELECT id, code, label, unit, active FROM services ORDER BY sort_order, id')
+        services = [Service(row[0], row[1], row[2], row[3], bool(row[4])) for row in cursor.fetchall()]
+        # Rates of the catalogue services, by price list (the column services are here too)
+        cursor.execute('''
+            SELECT r.price_list_id, s.code, r.rate
+            FROM price_list_rates r JOIN services s ON s.id = r.service_id
+        ''')
+        catalogue_rates = {}
+        for price_list_id, code, rate in cursor.fetchall():
+            catalogue_rates.setdefault(price_list_id, {})[code] = float(rate)
+        cursor.execute('''
+            SELECT id, name, effective_from, regular_clothes_rate, blankets_rate, white_clothes_rate
+            FROM price_lists ORDER BY effective_from
+        ''')
+        return cls([
+            PriceList(row[0], row[1], as_date(row[2]),
+                      {**catalogue_rates.get(row[0], {}),
+                       'regular_clothes': float(row[3]), 'blankets': float(row[4]), 'white_clothes': float(row[5])})
+            for row in cursor.fetchall()
+        ], services)
+
+    @classmethod
+    def from_db(cls, db_config):
+        """Load price lists from MySQL, falling back to the default rates on error"""
+        import mysql.connector
+        try:
+            conn = mysql.connector.connect(**db_config)
+            try:
+                return cls.from_cursor(conn.cursor())
+            finally:
+                conn.close()
+        except mysql.connector.Error as err:
+            print(f"Error loading price lists, using default rates: {err}")
+            return cls()
+
+    # --- Service catalogue ---
+
+    def service(self, code):
+        """Return a catalogue service by code, or None"""
+        return self._services.get(code)
+
+    def other_services(self):
+        """Services on sale that have no column on orders (entered below the first three on order forms)"""
+        return [s for s in self.services if s.active and s.code not in SERVICES]
+
+    # --- Price list lookup ---
+
+    def for_date(self, on_date=None):
+        """Return the price list in effect on a date (today by default)"""
+        position = bisect_right(self._dates, as_date(on_date)) - 1
+        return self.price_lists[max(position, 0)]
+
+    def current(self):
+        """Return the price list in effect today"""
+        return self.for_date()
+
+    def by_id(self, price_list_id):
+        """Return a price list by id, or None"""
+        return self._by_id.get(price_list_id)
+
+    def resolve(self, price_list_id=None, on_date=None):
+        """Return the recorded price list of an order, or the one in effect on its date"""
+        return self.by_id(price_list_id) or self.for_date(on_date)
+
+    # --- Pricing ---
+
+    def price_items(self, quantities, on_date=None, price_list=None):
+        """Price one order from {service code: quantity}; returns its items, total (paise and rupees) and price list"""
+        price_list = price_list or self.for_date(on_date)
+        unknown = set(quantities) - set(self._services)
+        if unknown:
+            raise ValueError(f"Unknown service: {', '.join(sorted(unknown))}")
+        items = []
+        # Catalogue order, so bills and invoices list the services the same way every time
+        for service in self.services:
+            quantity = quantities.get(service.code) or 0
+            if not quantity:
+                continue
+            rate = price_list.rates.get(service.code)
+            if rate is None:
+                raise ValueError(f"{price_list.name} has no rate for {service.label}")
+            items.append(BillItem(service, quantity, rate, cost_paise(quantity, to_paise(rate))))
+        total_paise = sum(item.paise for item in items)
+        return {
+            'items': items,
+            'total_paise': total_paise,
+            'total': rupees(total_paise),
+            'price_list_id': price_list.id,
+            'rates': price_list.rates
+        }
+
+    def price(self, regular_kg, blankets_kg, white_pieces, on_date=None, price_list=None, extra=None):
+        """Price one order (extra: other catalogue services by code); price_items plus the first three costs"""
+        quantities = dict(extra or {}, regular_clothes=regular_kg, blankets=blankets_kg, white_clothes=white_pieces)
+        bill = self.price_items(quantities, on_date, price_list)
+        paise = {item.service.code: item.paise for item in bill['items']}
+        regular_paise = paise.get('regular_clothes', 0)
+        blankets_paise = paise.get('blankets', 0)
+        white_paise = paise.get('white_clothes', 0)
+        bill.update({
+            'regular_paise': regular_paise,
+            'blankets_paise': blankets_paise,
+            'white_paise': white_paise,
+            'regular_cost': rupees(regular_paise),
+            'blankets_cost': rupees(blankets_paise),
+            'white_cost': rupees(white_paise)
+        })
+        return bill
+
+    def _compile(self):
+        """Build the NumPy lookup tables used by the vectorised methods"""
+        if self._compiled is None:
+            import numpy as np
+            dates = np.array(self._dates, dtype='datetime64[D]')
+            rates = np.array([[to_paise(p.rates[s]) for s in SERVICES] for p in self.price_lists], dtype=np.int64)
+            # Dense id -> row table; -1 marks ids that are not loaded
+            max_id = max(self._by_id, default=0)
+            id_to_row = np.full(max_id + 1, -1, dtype=np.int64)
+            for row, price_list in enumerate(self.price_lists):
+                if price_list.id is not None:
+                    id_to_row[price_list.id] = row
+            self._compiled = (dates, rates, id_to_row)
+        return self._compiled
+
+    def rows_for(self, order_dates=None, price_list_ids=None, count=None):
+        """Return the price-list row for each order (by recorded id, else by date)"""
+        import numpy as np
+        dates, rates, id_to_row = self._compile()
+        if order_dates is not None:
+            day = np.asarray(order_dates, dtype='datetime64[D]')
+            rows = np.searchsorted(dates, day, side='right') - 1
+            np.maximum(rows, 0, out=rows)
+        else:
+            # Without dates, unrecorded orders are priced at today's rates
+            current_row = bisect_right(self._dates, date.today()) - 1
+            rows = np.full(count if count is not None else len(price_list_ids), max(current_row, 0), dtype=np.int64)
+        if price_list_ids is not None:
+            ids = np.asarray(price_list_ids, dtype=np.float64)
+            known = ~np.isnan(ids) & (ids >= 0) & (ids < len(id_to_row))
+            recorded = np.full(len(ids), -1, dtype=np.int64)
+            recorded[known] = id_to_row[ids[known].astype(np.int64)]
+            rows = np.where(recorded >= 0, recorded, rows)
+        return rows
+
+    def service_paise(self, regular_kg, blankets_kg, white_pieces, order_dates=None, price_list_ids=None):
+        """Vectorised per-service costs in paise; returns an (n, 3) int64 array in SERVICES order"""
+        import numpy as np
+        # Quantities in hundredths (kg to two places, pieces), as cost_paise does
+        hundredths = np.rint(np.column_stack([
+            np.asarray(regular_kg, dtype=np.float64),
+            np.asarray(blankets_kg, dtype=np.float64),
+            np.asarray(white_pieces, dtype=np.float64)
+        ]) * 100).astype(np.int64)
+        rows = self.rows_for(order_dates, price_list_ids, count=len(hundredths))
+        return (hundredths * self._compile()[1][rows] + 50) // 100
+
+    def total_paise(self, regular_kg, blankets_kg, white_pieces, order_dates=None, price_list_ids=None):
+        """Vectorised order totals in paise for whole arrays of orders"""
+        return self.service_paise(regular_kg, blankets_kg, white_pieces, order_dates, price_list_ids).sum(axis=1)
+
+
+def add_price_list(cursor, name, effective_from, rates):
+    """Store a new price list ({service code: rate}); it applies to orders dated on/after effective_from"""
+    cursor.execute('''
+        INSERT INTO price_lists (name, effective_from, regular_clothes_rate, blankets_rate, white_clothes_rate)
+        VALUES (%s, %s, %s, %s, %s)
+    ''', (name, as_date(effective_from), rates['regular_clothes'], rates['blankets'], rates['white_clothes']))
+    price_list_id = cursor.lastrowid
+    cursor.executemany('''
+        INSERT INTO price_list_rates (price_list_id, service_id, rate)
+        SELECT %s, id, %s FROM services WHERE code = %s
+    ''', [(price_list_id, rate, code) for code, rate in rates.items()])
+    return price_list_id
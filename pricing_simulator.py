@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+What-if Pricing Simulator for Express Wash Laundry Billing System
+Re-prices the whole order history under a proposed price list and reports the
+revenue impact per month and per customer.
+
+Pricing is linear in the quantities, so the history can be summed per
+(month, customer) in SQL and re-priced from those sums without changing the
+result; the arrays are built once and every simulation is a matrix product
+plus two bincounts. Services without a column on orders (see
+service_catalog.py) have no rate to propose here; what they were billed is
+carried over unchanged. Archived orders are part of the history.
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from order_archive import orders_source
+from pricing import SERVICES
+
+# Quantities summed per month and customer (mobile number when known, else name);
+# {source} is orders_source(), so archived orders are included
+HISTORY_QUERY = '''
+    SELECT DATE_FORMAT(order_date, '%Y-%m') AS month,
+           COALESCE(NULLIF(mobile_number, ''), customer_name) AS customer_key,
+           MAX(customer_name) AS customer_name,
+           COUNT(*) AS orders,
+           SUM(regular_clothes_kg) AS regular_clothes,
+           SUM(blankets_kg) AS blankets,
+           SUM(white_clothes_pieces) AS white_clothes,
+           SUM(total_amount) AS billed
+    FROM {source}
+    GROUP BY month, customer_key
+'''
+
+# Billed for the other catalogue services, with the same month and customer keys
+OTHER_SERVICES_QUERY = '''
+    SELECT DATE_FORMAT(orders.order_date, '%Y-%m') AS month,
+           COALESCE(NULLIF(orders.mobile_number, ''), orders.customer_name) AS customer_key,
+           SUM(i.amount) AS other_billed
+    FROM services s
+    JOIN order_items i ON i.service_id = s.id
+    JOIN {source} ON orders.id = i.order_id
+    WHERE s.code NOT IN ('regular_clothes', 'blankets', 'white_clothes')
+    GROUP BY month, customer_key
+'''
+
+SimulationResult = namedtuple('SimulationResult', [
+    'orders', 'current_revenue', 'proposed_revenue', 'by_month', 'by_customer'
+])
+
+
+class OrderHistory:
+    """Column arrays of billed quantities and amounts, indexed by month and customer"""
+
+    def __init__(self, months, customer_keys, customer_names, order_counts, quantities, billed, other_billed=None):
+        month_index, self.month_labels = pd.factorize(pd.Series(months, dtype=object), sort=True)
+        customer_index, self.customer_keys = pd.factorize(pd.Series(customer_keys, dtype=object))
+        self.month_index = month_index.astype(np.intp)
+        self.customer_index = customer_index.astype(np.intp)
+
+        # One display name per customer key (the first one seen)
+        names = pd.Series(customer_names, dtype=object)
+        self.customer_names = names.groupby(self.customer_index).first().to_numpy()
+
+        self.order_counts = np.asarray(order_counts, dtype=np.int64)
+        self.quantities = np.ascontiguousarray(quantities, dtype=np.float64)
+        self.billed = np.asarray(billed, dtype=np.float64)
+        # Part of billed that simulations do not re-price
+        self.other_billed = (np.zeros(len(self.billed)) if other_billed is None
+                             else np.asarray(other_billed, dtype=np.float64))
+
+        # Current revenue per month/customer does not change between simulations
+        self._months = len(self.month_labels)
+        self._customers = len(self.customer_keys)
+        self.current_by_month = np.bincount(self.month_index, weights=self.billed, minlength=self._months)
+        self.current_by_customer = np.bincount(self.customer_index, weights=self.billed, minlength=self._customers)
+        self.orders_by_month = np.bincount(self.month_index, weights=self.order_counts, minlength=self._months)
+        self.orders_by_customer = np.bincount(self.customer_index, weights=self.order_counts, minlength=self._customers)
+
+    def __len__(self):
+        return int(self.order_counts.sum())
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Load the per-month, per-customer sums with an open cursor"""
+        source = orders_source(cursor)
+        cursor.execute(HISTORY_QUERY.format(source=source))
+        rows = cursor.fetchall()
+        if not rows:
+            return cls([], [], [], [], np.empty((0, len(SERVICES))), [])
+        columns = list(zip(*rows))
+        quantities = np.column_stack([np.asarray(columns[4 + i], dtype=np.float64) for i in range(len(SERVICES))])
+        cursor.execute(OTHER_SERVICES_QUERY.format(source=source))
+        other = {(month, key): float(amount) for month, key, amount in cursor.fetchall()}
+        other_billed = [other.get((month, key), 0.0) for month, key in zip(columns[0], columns[1])]
+        return cls(columns[0], columns[1], columns[2], columns[3], quantities, np.asarray(columns[7], dtype=np.float64),
+                   other_billed)
+
+    @classmethod
+    def from_db(cls, db_config):
+        """Load the order history from MySQL"""
+        import mysql.connector
+        conn = mysql.connector.connect(**db_config)
+        try:
+            return cls.from_cursor(conn.cursor())
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_orders(cls, order_dates, customer_keys, customer_names, regular_kg, blankets_kg, white_pieces, billed):
+        """Build a history from per-order arrays (one row per order)"""
+        months = np.asarray(order_dates, dtype='datetime64[M]').astype(str)
+        quantities = np.column_stack([
+            np.asarray(regular_kg, dtype=np.float64),
+            np.asarray(blankets_kg, dtype=np.float64),
+            np.asarray(white_pieces, dtype=np.float64)
+        ])
+        return cls(months, customer_keys, customer_names, np.ones(len(months), dtype=np.int64), quantities, billed)
+
+
+def rate_vector(rates):
+    """Return the proposed rates as an array in SERVICES order"""
+    return np.array([float(rates[service]) for service in SERVICES], dtype=np.float64)
+
+
+def simulate(history, rates, top_customers=None):
+    """Re-price the history under rates; returns revenue deltas per month and per customer"""
+    proposed = history.quantities @ rate_vector(rates) + history.other_billed
+    proposed_by_month = np.bincount(history.month_index, weights=proposed, minlength=len(history.month_labels))
+    proposed_by_customer = np.bincount(history.customer_index, weights=proposed, minlength=len(history.customer_keys))
+
+    by_month = pd.DataFrame({
+        'month': history.month_labels,
+        'orders': history.orders_by_month.astype(np.int64),
+        'current_revenue': history.current_by_month,
+        'proposed_revenue': proposed_by_month,
+    })
+    by_month['delta'] = by_month['proposed_revenue'] - by_month['current_revenue']
+
+    customer_delta = proposed_by_customer - history.current_by_customer
+    order = np.argsort(-np.abs(customer_delta), kind='stable')
+    if top_customers is not None:
+        order = order[:top_customers]
+    by_customer = pd.DataFrame({
+        'customer': history.customer_keys[order],
+        'customer_name': history.customer_names[order],
+        'orders': history.orders_by_customer[order].astype(np.int64),
+        'current_revenue': history.current_by_customer[order],
+        'proposed_revenue': proposed_by_customer[order],
+        'delta': customer_delta[order],
+    })
+
+    return SimulationResult(
+        orders=len(history),
+        current_revenue=float(history.billed.sum()),
+        proposed_revenue=float(proposed.sum()),
+        by_month=by_month,
+        by_customer=by_customer
+    )
+
+
+def _synthetic_history(orders, seed=7):
+    """Random per-order history used by the --benchmark option"""
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 5 * 365, orders)
+    order_dates = np.datetime64('2021-01-01') + days.astype('timedelta64[D]')
+    customers = rng.integers(0, max(orders // 10, 1), orders).astype(str)
+    regular = np.round(rng.uniform(0, 5, orders), 1)
+    blankets = np.round(rng.uniform(0, 3, orders), 1)
+    white = rng.integers(0, 10, orders)
+    billed = regular * 50 + blankets * 100 + white * 40
+    return OrderHistory.from_orders(order_dates, customers, customers, regular, blankets, white, billed)
+
+
+def main():
+    """Time one simulation over synthetic orders"""
+    parser = argparse.ArgumentParser(description="Express Wash what-if pricing simulator")
+    parser.add_argument('--benchmark', type=int, default=1_000_000, metavar='ORDERS',
+                        help="number of synthetic orders to re-price (default: 1,000,000)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    history = _synthetic_history(args.benchmark)
+    built = time.perf_counter()
+    result = simulate(history, {'regular_clothes': 55, 'blankets': 110, 'white_clothes': 45}, top_customers=10)
+    done = time.perf_counter()
+
+    print(f"📦 History arrays for {result.orders:,} orders built in {built - start:.3f}s")
+    print(f"⚡ Simulation took {(done - built) * 1000:.1f} ms")
+    print(f"💰 Revenue ₹{result.current_revenue:,.2f} → ₹{result.proposed_revenue:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Query Catalogue for Express Wash Laundry Billing System
+Every SQL statement the Streamlit and desktop apps issue, with the files it
+appears in, sample parameters for EXPLAIN and the plan issues that are
+accepted for it. benchmarks/query_plans.py explains each one on a seeded
+database and checks the text is still present in its source files, so a new
+or changed query without a catalogue entry is noticed.
+
+Parameters may use {receipt}, {order_id}, {customer_id} and {since}; the checker fills them
+in from the seeded database. SQL built at run time names its variable part
+in braces ({customer_filter}, {source}, {since_filter}); FRAGMENTS holds a typical expansion to explain.
+
+Plan issues: 'full_scan' (access type ALL), 'full_index_scan' (access type
+index), 'filesort' and 'temporary'. An issue in `allow` is expected: the
+query reads the whole table by design (exports, totals) or is a known
+limitation (the '%term%' searches cannot use an index).
+"""
+
+from collections import namedtuple
+
+Query = namedtuple('Query', ['name', 'sources', 'sql', 'params', 'allow'])
+
+WHOLE_TABLE = ('full_scan', 'full_index_scan')
+UNBOUNDED_LIST = ('full_scan', 'filesort')
+
+# The order searches add the customers found by fuzzy name search; reports read
+# orders_source(), which is orders alone until old periods are archived
+FRAGMENTS = {'customer_filter': 'OR customer_id IN (%s, %s, %s)', 'source': 'orders'}
+# The Streamlit order tables page through the filtered orders (streamlit_pages/common.py)
+FRAGMENTS.update(columns='id, receipt_number, customer_name, mobile_number, order_date, regular_clothes_kg, '
+                         'blankets_kg, white_clothes_pieces, total_amount, collection_date, created_at',
+                 where='WHERE order_date = %s')
+# The desktop order list pages in the order of the clicked column (tkinter_app.ORDER_SORT_INDEXES),
+# each page after the sort key of the previous one's last order (tkinter_app.keyset_condition)
+FRAGMENTS.update(order_by='customer_name ASC, id ASC',
+                 list_filter='WHERE ((customer_name > %s) OR (customer_name <=> %s AND id > %s))')
+# Per-service totals over a date range (service_catalog.service_totals)
+FRAGMENTS.update(since_filter='AND i.order_date >= %s')
+FUZZY_CUSTOMERS = ('{customer_id}',) * 3
+
+QUERIES = [
+    # Desktop app (tkinter_app.py)
+    Query('next_receipt_number', ['tkinter_app.py'],
+          "SELECT receipt_number FROM orders WHERE receipt_number LIKE %s ORDER BY id DESC LIMIT 1",
+          ('RW-20251231-%',), ()),
+    Query('insert_order', ['tkinter_app.py', 't.py'], '''
+        INSERT INTO orders (receipt_number, customer_id, customer_name, mobile_number, order_date,
+                           regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, price_list_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ''', ('RW-EXPLAIN-001', '{customer_id}', 'Explain', '9000000000', '2025-12-31', 1, 0, 0, 60, None), ()),
+    # One page of the order list (or of a search, whose condition joins list_filter),
+    # sorted on the index of the clicked column
+    Query('load_orders', ['tkinter_app.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date,
+               regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount,
+               price_list_id, collection_date, created_at
+        FROM orders {list_filter}
+        ORDER BY {order_by}
+        LIMIT %s
+    ''', ('Sharma', 'Sharma', '{order_id}', 1000), ()),
+    Query('get_order', ['tkinter_app.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date,
+               regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount,
+               price_list_id, collection_date, created_at
+        FROM orders
+        WHERE id = %s
+    ''', ('{order_id}',), ()),
+    Query('update_order', ['tkinter_app.py'], '''
+        UPDATE orders
+        SET receipt_number = %s, customer_id = %s, customer_name = %s, mobile_number = %s, order_date = %s,
+            regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
+            total_amount = %s, price_list_id = %s
+        WHERE id = %s
+    ''', ('{receipt}', '{customer_id}', 'Explain', '9000000000', '2025-12-31', 1, 0, 0, 60, None, '{order_id}'), ()),
+    Query('delete_order', ['tkinter_app.py', 't.py', 'streamlit_pages/common.py'],
+          'DELETE FROM orders WHERE id = %s', ('{order_id}',), ()),
+    Query('any_orders', ['tkinter_app.py', 't.py'],
+          'SELECT 1 FROM {source} LIMIT 1', (), ()),
+    Query('export_orders', ['tkinter_app.py'], '''
+        SELECT
+            receipt_number as 'Receipt Number',
+            customer_name as 'Customer Name',
+            mobile_number as 'Mobile Number',
+            order_date as 'Order Date',
+            regular_clothes_kg as 'Regular Clothes (kg)',
+            blankets_kg as 'Blankets (kg)',
+            white_clothes_pieces as 'White Clothes (pieces)',
+            total_amount as 'Total Amount (₹)',
+            collection_date as 'Collection Date',
+            created_at as 'Created At'
+        FROM {source}
+        ORDER BY created_at DESC
+    ''', (), UNBOUNDED_LIST),
+    Query('order_for_collection', ['tkinter_app.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date,
+               total_amount, regular_clothes_kg, blankets_kg, white_clothes_pieces, collection_date
+        FROM orders
+        WHERE receipt_number = %s
+    ''', ('{receipt}',), ()),
+    Query('collect_by_receipt', ['tkinter_app.py'], '''
+        UPDATE orders
+        SET collection_date = NOW()
+        WHERE receipt_number = %s
+    ''', ('{receipt}',), ()),
+    Query('invoice_order', ['tkinter_app.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date,
+               regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount,
+               price_list_id, collection_date, created_at
+        FROM orders WHERE receipt_number = %s
+    ''', ('{receipt}',), ()),
+    Query('status_by_day', ['tkinter_app.py'], '''
+        SELECT order_date as date,
+               SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END) as pending,
+               SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END) as collected
+        FROM {source}
+        WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+        GROUP BY order_date
+        ORDER BY order_date
+    ''', (), ()),
+    Query('summary_totals', ['tkinter_app.py'], '''
+        SELECT COUNT(*) as total_orders,
+               CAST(SUM(total_amount) * 100 AS SIGNED) as total_revenue_paise,
+               SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END) as pending_orders,
+               SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END) as collected_orders
+        FROM {source}
+    ''', (), WHOLE_TABLE),
+    Query('status_totals', ['tkinter_app.py'], '''
+        SELECT SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END) as pending,
+               SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END) as collected
+        FROM {source}
+    ''', (), WHOLE_TABLE),
+    Query('revenue_30_days', ['tkinter_app.py'], '''
+        SELECT order_date as date, CAST(SUM(total_amount) * 100 AS SIGNED) as revenue_paise
+        FROM {source}
+        WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+        GROUP BY order_date
+        ORDER BY order_date
+    ''', (), ()),
+    Query('revenue_by_days', ['tkinter_app.py'], '''
+        SELECT order_date as date, CAST(SUM(total_amount) * 100 AS SIGNED) as revenue_paise
+        FROM {source}
+        WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+        GROUP BY order_date
+        ORDER BY order_date
+    ''', (90,), ()),
+    Query('time_report', ['tkinter_app.py'], '''
+        SELECT order_date, COUNT(*) as orders, CAST(SUM(total_amount) * 100 AS SIGNED) as revenue_paise
+        FROM {source}
+        WHERE order_date >= %s
+        GROUP BY order_date
+        ORDER BY order_date DESC
+    ''', ('{since}',), ()),
+
+    # Desktop app, ttkbootstrap edition (t.py)
+    Query('t_load_orders', ['t.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date,
+               collection_date, total_amount, created_at
+        FROM orders ORDER BY created_at DESC
+    ''', (), UNBOUNDED_LIST),
+    Query('t_search_orders', ['t.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date,
+               collection_date, total_amount, created_at
+        FROM orders
+        WHERE LOWER(receipt_number) LIKE %s OR LOWER(customer_name) LIKE %s {customer_filter}
+        ORDER BY created_at DESC
+    ''', ('%sharma%', '%sharma%') + FUZZY_CUSTOMERS, UNBOUNDED_LIST),
+    Query('t_get_order', ['t.py'], '''
+        SELECT id, receipt_number, customer_name, mobile_number, order_date, regular_clothes_kg,
+               blankets_kg, white_clothes_pieces, total_amount, collection_date, created_at
+        FROM orders WHERE id = %s
+    ''', ('{order_id}',), ()),
+    Query('t_update_order', ['t.py'], '''
+        UPDATE orders SET
+        receipt_number = %s, customer_id = %s, customer_name = %s, mobile_number = %s, order_date = %s,
+        regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s, total_amount = %s,
+        price_list_id = %s
+        WHERE id = %s
+    ''', ('{receipt}', '{customer_id}', 'Explain', '9000000000', '2025-12-31', 1, 0, 0, 60, None, '{order_id}'), ()),
+    Query('t_collection_status', ['t.py'],
+          'SELECT collection_date FROM orders WHERE receipt_number = %s', ('{receipt}',), ()),
+    Query('t_collect_by_receipt', ['t.py'],
+          'UPDATE orders SET collection_date = NOW() WHERE receipt_number = %s', ('{receipt}',), ()),
+    Query('t_invoice_order', ['t.py'],
+          "SELECT * FROM orders WHERE receipt_number = %s", ('{receipt}',), ()),
+    Query('all_orders_newest_first', ['t.py'],
+          'SELECT * FROM {source} ORDER BY created_at DESC', (), UNBOUNDED_LIST),
+    Query('t_export_orders', ['t.py'],
+          "SELECT * FROM {source}", (), WHOLE_TABLE),
+
+    # Streamlit app (streamlit_pages/)
+    Query('st_insert_order', ['streamlit_pages/common.py'], '''
+        INSERT INTO orders (customer_id, customer_name, mobile_number, order_date, regular_clothes_kg,
+                           blankets_kg, white_clothes_pieces, total_amount, receipt_number, price_list_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ''', ('{customer_id}', 'Explain', '9000000000', '2025-12-31', 1, 0, 0, 60, 'RW-EXPLAIN-001', None), ()),
+    Query('st_update_order', ['streamlit_pages/common.py'], '''
+        UPDATE orders
+        SET customer_id = %s, customer_name = %s, mobile_number = %s, order_date = %s,
+            regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
+            total_amount = %s, price_list_id = %s
+        WHERE id = %s
+    ''', ('{customer_id}', 'Explain', '9000000000', '2025-12-31', 1, 0, 0, 60, None, '{order_id}'), ()),
+    Query('st_get_order', ['streamlit_pages/common.py'], '''
+        SELECT id, customer_name, mobile_number, order_date, regular_clothes_kg,
+               blankets_kg, white_clothes_pieces, total_amount, receipt_number, price_list_id
+        FROM orders WHERE id = %s
+    ''', ('{order_id}',), ()),
+    Query('st_any_order', ['streamlit_pages/common.py'],
+          'SELECT 1 FROM orders LIMIT 1', (), ()),
+    Query('st_order_page', ['streamlit_pages/common.py'],
+          'SELECT {columns} FROM orders {where} ORDER BY created_at DESC, id DESC LIMIT %s',
+          ('{since}', 51), ()),
+    Query('st_matching_orders', ['streamlit_pages/common.py'],
+          'SELECT {columns} FROM orders {where} ORDER BY created_at DESC, id DESC',
+          ('{since}',), ()),
+    # The typed order frame shared by every session (CSV backup)
+    Query('st_all_orders', ['streamlit_pages/common.py'],
+          'SELECT {columns} FROM {source} ORDER BY created_at DESC', (), UNBOUNDED_LIST),
+    Query('st_order_by_receipt', ['streamlit_pages/common.py'],
+          'SELECT {columns} FROM orders WHERE receipt_number = %s', ('{receipt}',), ()),
+    Query('customer_count', ['streamlit_pages/common.py'],
+          'SELECT COUNT(DISTINCT customer_id) FROM {source}', (), WHOLE_TABLE),
+    Query('top_customers', ['streamlit_pages/common.py'], '''
+        SELECT c.id, c.name, c.mobile_number, CAST(t.revenue * 100 AS SIGNED)
+        FROM (SELECT customer_id, SUM(total_amount) AS revenue
+              FROM {source} WHERE customer_id IS NOT NULL
+              GROUP BY customer_id ORDER BY revenue DESC LIMIT %s) t
+        JOIN customers c ON c.id = t.customer_id
+        ORDER BY t.revenue DESC
+    ''', (10,), WHOLE_TABLE + ('filesort',)),
+    # Analytics page: the figures are built from daily totals (cached by data_version.py's counter)
+    Query('st_daily_totals', ['streamlit_pages/common.py'], '''
+        SELECT order_date, COUNT(*), CAST(SUM(total_amount) * 100 AS SIGNED)
+        FROM {source}
+        GROUP BY order_date
+        ORDER BY order_date
+    ''', (), WHOLE_TABLE),
+    Query('st_collect_by_id', ['streamlit_pages/order_history.py'], '''
+        UPDATE orders
+        SET collection_date = NOW()
+        WHERE id = %s
+    ''', ('{order_id}',), ()),
+    Query('st_sms_details', ['streamlit_pages/order_history.py'], '''
+        SELECT customer_name, mobile_number, receipt_number, total_amount
+        FROM orders WHERE id = %s
+    ''', ('{order_id}',), ()),
+
+    # Shared modules
+    Query('upsert_customer', ['customers.py'], '''
+        INSERT INTO customers (name, mobile_number) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE name = VALUES(name), id = LAST_INSERT_ID(id)
+    ''', ('Explain', '9000000000'), ()),
+    # Editing an order renames its customer only when no newer order of theirs exists
+    Query('customer_by_mobile', ['customers.py'],
+          'SELECT id FROM customers WHERE mobile_number = %s', ('9000000000',), ()),
+    Query('newer_customer_order', ['customers.py'],
+          'SELECT 1 FROM orders WHERE customer_id = %s AND id > %s LIMIT 1', ('{customer_id}', '{order_id}'), ()),
+    Query('customer_by_name', ['customers.py'],
+          'SELECT id FROM customers WHERE mobile_number IS NULL AND name = %s LIMIT 1', ('Explain',), ()),
+    Query('insert_customer', ['customers.py'],
+          'INSERT INTO customers (name) VALUES (%s)', ('Explain',), ()),
+    # Full load on the first call (last order id 0), a primary-key range afterwards
+    Query('customer_activity', ['customer_index.py'], '''
+        SELECT c.id, c.name, c.mobile_number, COUNT(*), MAX(o.order_date), MAX(o.id)
+        FROM orders o
+        JOIN customers c ON c.id = o.customer_id
+        WHERE o.id > %s
+        GROUP BY c.id, c.name, c.mobile_number
+    ''', (0,), WHOLE_TABLE + ('temporary', 'filesort')),
+    Query('archived_through', ['order_archive.py'],
+          'SELECT MAX(order_date) FROM orders_archive', (), ()),
+    Query('archive_candidates', ['order_archive.py'], '''
+        SELECT id FROM orders
+        WHERE order_date < %s AND collection_date IS NOT NULL
+        LIMIT %s
+    ''', ('{since}', 5000), ()),
+    Query('orders_without_customer', ['customers.py'],
+          'SELECT COUNT(*) FROM orders WHERE customer_id IS NULL', (), ()),
+    # Data version: bumped with every change, read to key the Streamlit caches (data_version.py)
+    Query('bump_data_version', ['data_version.py'],
+          'UPDATE data_version SET version = version + 1 WHERE id = 1', (), ()),
+    Query('read_data_version', ['data_version.py'],
+          'SELECT version FROM data_version WHERE id = 1', (), ()),
+    # Service catalogue and order items (service_catalog.py)
+    Query('delete_order_items', ['service_catalog.py'],
+          'DELETE FROM order_items WHERE order_id = %s', ('{order_id}',), ()),
+    Query('insert_order_item', ['service_catalog.py'], '''
+        INSERT INTO order_items (order_id, service_id, order_date, quantity, rate, amount)
+        SELECT %s, id, %s, %s, %s, %s FROM services WHERE code = %s
+    ''', ('{order_id}', '{since}', 2.5, 50, 125, 'regular_clothes'), ()),
+    Query('load_order_items', ['service_catalog.py'], '''
+        SELECT s.id, s.code, s.label, s.unit, s.active, i.quantity, i.rate, CAST(i.amount * 100 AS SIGNED)
+        FROM order_items i JOIN services s ON s.id = i.service_id
+        WHERE i.order_id = %s
+        ORDER BY s.sort_order, s.id
+    ''', ('{order_id}',), ()),
+    # One range of service_date_idx per service, however many orders there are
+    Query('service_totals', ['service_catalog.py'], '''
+        SELECT s.id, s.code, s.label, s.unit, s.active, SUM(i.quantity), CAST(SUM(i.amount) * 100 AS SIGNED)
+        FROM services s JOIN order_items i ON i.service_id = s.id {since_filter}
+        GROUP BY s.id
+        ORDER BY s.sort_order, s.id
+    ''', ('{since}',), ()),
+    Query('add_service', ['service_catalog.py'], '''
+        INSERT INTO services (code, label, unit, sort_order)
+        SELECT %s, %s, %s, COALESCE(MAX(sort_order), -1) + 1 FROM services
+    ''', ('explain', 'Explain', 'kg'), ()),
+    Query('add_service_rates', ['service_catalog.py'], '''
+        INSERT INTO price_list_rates (price_list_id, service_id, rate)
+        SELECT id, %s, %s FROM price_lists
+    ''', (1, 80), ()),
+    Query('retire_service', ['service_catalog.py'],
+          'UPDATE services SET active = FALSE WHERE code = %s', ('explain',), ()),
+    Query('load_services', ['pricing.py'],
+          'SELECT id, code, label, unit, active FROM services ORDER BY sort_order, id', (), ()),
+    Query('load_price_list_rates', ['pricing.py'], '''
+        SELECT r.price_list_id, s.code, r.rate
+        FROM price_list_rates r JOIN services s ON s.id = r.service_id
+    ''', (), ()),
+    Query('load_price_lists', ['pricing.py'], '''
+        SELECT id, name, effective_from, regular_clothes_rate, blankets_rate, white_clothes_rate
+        FROM price_lists ORDER BY effective_from
+    ''', (), ()),
+    Query('add_price_list', ['pricing.py'], '''
+        INSERT INTO price_lists (name, effective_from, regular_clothes_rate, blankets_rate, white_clothes_rate)
+        VALUES (%s, %s, %s, %s, %s)
+    ''', ('Explain', '2030-01-01', 60, 80, 15), ()),
+    Query('add_price_list_rates', ['pricing.py'], '''
+        INSERT INTO price_list_rates (price_list_id, service_id, rate)
+        SELECT %s, id, %s FROM services WHERE code = %s
+    ''', (1, 60, 'regular_clothes'), ()),
+    # Re-prices the whole history by design
+    Query('pricing_history', ['pricing_simulator.py'], '''
+        SELECT DATE_FORMAT(order_date, '%Y-%m') AS month,
+               COALESCE(NULLIF(mobile_number, ''), customer_name) AS customer_key,
+               MAX(customer_name) AS customer_name,
+               COUNT(*) AS orders,
+               SUM(regular_clothes_kg) AS regular_clothes,
+               SUM(blankets_kg) AS blankets,
+               SUM(white_clothes_pieces) AS white_clothes,
+               SUM(total_amount) AS billed
+        FROM {source}
+        GROUP BY month, customer_key
+    ''', (), WHOLE_TABLE + ('temporary', 'filesort')),
+    Query('pricing_other_services', ['pricing_simulator.py'], '''
+        SELECT DATE_FORMAT(orders.order_date, '%Y-%m') AS month,
+               COALESCE(NULLIF(orders.mobile_number, ''), orders.customer_name) AS customer_key,
+               SUM(i.amount) AS other_billed
+        FROM services s
+        JOIN order_items i ON i.service_id = s.id
+        JOIN {source} ON orders.id = i.order_id
+        WHERE s.code NOT IN ('regular_clothes', 'blankets', 'white_clothes')
+        GROUP BY month, customer_key
+    ''', (), ('temporary', 'filesort')),
+]
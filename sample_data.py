@@ -7,6 +7,10 @@ import mysql.connector
 import pandas as pd
 from datetime import datetime, timedelta
 import random
+from customers import backfill_customers
+from data_version import bump_data_version
+from service_catalog import backfill_order_items, delete_orphan_items
+from pricing import PricingEngine
 
 # Database configuration
 DB_CONFIG = {
@@ -22,6 +26,7 @@ def create_sample_data():
     # Connect to database
     conn = mysql.connector.connect(**DB_CONFIG)
     cursor = conn.cursor()
+    pricing = PricingEngine.from_cursor(cursor)
     
     # Sample customer names
     customers = [
@@ -60,16 +65,9 @@ def create_sample_data():
         blankets_kg = round(random.uniform(0, 3), 1)  # 0-3 kg
         white_pieces = random.randint(0, 10)  # 0-10 pieces
         
-        # Calculate total amount
-        pricing = {
-            'regular_clothes': 50,
-            'blankets': 100,
-            'white_clothes': 40
-        }
-        
-        total_amount = (regular_kg * pricing['regular_clothes'] + 
-                       blankets_kg * pricing['blankets'] + 
-                       white_pieces * pricing['white_clothes'])
+        # Calculate total amount with the price list in effect on the order date
+        bill = pricing.price(regular_kg, blankets_kg, white_pieces, on_date=order_date)
+        total_amount = bill['total']
         
         # Create order record
         order = {
@@ -80,6 +78,7 @@ def create_sample_data():
             'blankets_kg': blankets_kg,
             'white_clothes_pieces': white_pieces,
             'total_amount': total_amount,
+            'price_list_id': bill['price_list_id'],
             'created_at': order_date.strftime('%Y-%m-%d %H:%M:%S')
         }
         
@@ -90,8 +89,8 @@ def create_sample_data():
         cursor.execute('''
             INSERT INTO orders (customer_name, mobile_number, order_date, 
                                regular_clothes_kg, blankets_kg, white_clothes_pieces, 
-                               total_amount, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                               total_amount, price_list_id, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         ''', (
             order['customer_name'],
             order['mobile_number'],
@@ -100,9 +99,15 @@ def create_sample_data():
             order['blankets_kg'],
             order['white_clothes_pieces'],
             order['total_amount'],
+            order['price_list_id'],
             order['created_at']
         ))
     
+    # Create the customers and link the orders to them, and the orders' service items
+    backfill_customers(cursor)
+    backfill_order_items(cursor)
+    bump_data_version(cursor)
+    
     # Commit changes
     conn.commit()
     
@@ -125,6 +130,8 @@ def clear_sample_data():
     cursor = conn.cursor()
     
     cursor.execute('DELETE FROM orders')
+    delete_orphan_items(cursor)
+    bump_data_version(cursor)
     conn.commit()
     conn.close()
     
@@ -0,0 +1,126 @@
+"""
+Database Schema for Express Wash Laundry Billing System
+Single definition of the MySQL tables shared by the Streamlit and desktop apps,
+plus the in-place upgrades needed for databases created by older versions.
+"""
+
+from customers import CUSTOMERS_TABLE, backfill_customers
+from data_version import bump_data_version, ensure_data_version
+from order_archive import ORDERS_ARCHIVE_TABLE
+from pricing import DEFAULT_PRICE_LIST_NAME, DEFAULT_PRICING, DEFAULT_EFFECTIVE_FROM
+from service_catalog import (ORDER_ITEMS_TABLE, PRICE_LIST_RATES_TABLE, SERVICES_TABLE, backfill_order_items,
+                             seed_services)
+
+ORDERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS orders (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        receipt_number VARCHAR(32) UNIQUE,
+        customer_id INT NULL,
+        customer_name VARCHAR(255) NOT NULL,
+        mobile_number VARCHAR(20),
+        order_date DATE NOT NULL,
+        regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
+        blankets_kg DECIMAL(5,2) DEFAULT 0,
+        white_clothes_pieces INT DEFAULT 0,
+        total_amount DECIMAL(10,2) NOT NULL,
+        price_list_id INT NULL,
+        collection_date DATETIME NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX price_list_idx (price_list_id),
+        INDEX order_date_idx (order_date, collection_date, total_amount),
+        INDEX created_at_idx (created_at),
+        INDEX customer_idx (customer_id, total_amount),
+        INDEX customer_name_idx (customer_name),
+        INDEX collection_date_idx (collection_date),
+        INDEX total_amount_idx (total_amount),
+        CONSTRAINT orders_customer_fk FOREIGN KEY (customer_id) REFERENCES customers (id)
+    )
+'''
+
+PRICE_LISTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS price_lists (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        effective_from DATE NOT NULL,
+        regular_clothes_rate DECIMAL(10,2) NOT NULL,
+        blankets_rate DECIMAL(10,2) NOT NULL,
+        white_clothes_rate DECIMAL(10,2) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY effective_from_idx (effective_from)
+    )
+'''
+
+# Columns added after the first release: (column, ALTER statement)
+ORDER_COLUMN_UPGRADES = [
+    ('receipt_number', 'ALTER TABLE orders ADD COLUMN receipt_number VARCHAR(32) UNIQUE'),
+    ('collection_date', 'ALTER TABLE orders ADD COLUMN collection_date DATETIME NULL'),
+    ('price_list_id', 'ALTER TABLE orders ADD COLUMN price_list_id INT NULL, ADD INDEX price_list_idx (price_list_id)'),
+    ('customer_id', 'ALTER TABLE orders ADD COLUMN customer_id INT NULL AFTER id, '
+                    'ADD INDEX customer_idx (customer_id, total_amount), '
+                    'ADD CONSTRAINT orders_customer_fk FOREIGN KEY (customer_id) REFERENCES customers (id)'),
+]
+
+# Indexes added after the first release: (index, ALTER statement). order_date_idx
+# covers the date-range reports; created_at_idx the "latest orders" lists; the
+# name, collection date and total indexes the sorted pages of the desktop order list.
+ORDER_INDEX_UPGRADES = [
+    ('order_date_idx', 'ALTER TABLE orders ADD INDEX order_date_idx (order_date, collection_date, total_amount)'),
+    ('created_at_idx', 'ALTER TABLE orders ADD INDEX created_at_idx (created_at)'),
+    ('customer_name_idx', 'ALTER TABLE orders ADD INDEX customer_name_idx (customer_name)'),
+    ('collection_date_idx', 'ALTER TABLE orders ADD INDEX collection_date_idx (collection_date)'),
+    ('total_amount_idx', 'ALTER TABLE orders ADD INDEX total_amount_idx (total_amount)'),
+]
+
+
+def existing_columns(cursor, table):
+    """Return the set of column names of a table"""
+    cursor.execute(f"SHOW COLUMNS FROM {table}")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def existing_indexes(cursor, table):
+    """Return the set of index names of a table"""
+    cursor.execute(f"SHOW INDEX FROM {table}")
+    return {row[2] for row in cursor.fetchall()}
+
+
+def ensure_schema(cursor):
+    """Create missing tables/columns, seed the default price list and services, link orders to customers and items"""
+    cursor.execute(CUSTOMERS_TABLE)
+    cursor.execute(ORDERS_TABLE)
+    cursor.execute(PRICE_LISTS_TABLE)
+    cursor.execute(ORDERS_ARCHIVE_TABLE)
+    cursor.execute(SERVICES_TABLE)
+    cursor.execute(PRICE_LIST_RATES_TABLE)
+    cursor.execute(ORDER_ITEMS_TABLE)
+    ensure_data_version(cursor)
+
+    columns = existing_columns(cursor, 'orders')
+    for column, statement in ORDER_COLUMN_UPGRADES:
+        if column not in columns:
+            cursor.execute(statement)
+
+    indexes = existing_indexes(cursor, 'orders')
+    for index, statement in ORDER_INDEX_UPGRADES:
+        if index not in indexes:
+            cursor.execute(statement)
+
+    cursor.execute('SELECT COUNT(*) FROM price_lists')
+    if cursor.fetchone()[0] == 0:
+        cursor.execute('''
+            INSERT INTO price_lists (name, effective_from, regular_clothes_rate, blankets_rate, white_clothes_rate)
+            VALUES (%s, %s, %s, %s, %s)
+        ''', (DEFAULT_PRICE_LIST_NAME, DEFAULT_EFFECTIVE_FROM,
+              DEFAULT_PRICING['regular_clothes'], DEFAULT_PRICING['blankets'], DEFAULT_PRICING['white_clothes']))
+        # Everything billed before price lists existed used the default rates
+        cursor.execute('UPDATE orders SET price_list_id = %s WHERE price_list_id IS NULL', (cursor.lastrowid,))
+
+    # The first three services and their rates, then items for orders saved without them
+    seed_services(cursor)
+    backfill_order_items(cursor)
+
+    # Orders saved by older versions (or bulk loaded) have no customer yet
+    backfill_customers(cursor)
+
+    # The backfills (or a bulk load before them) may have changed what the caches hold
+    bump_data_version(cursor)
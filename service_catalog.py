@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Service Catalog for Express Wash Laundry Billing System
+Services are rows of the services table, not columns of orders, so the shop
+can start selling one (express, ironing, dry cleaning) without a schema
+change. Every price list has a rate per service in price_list_rates, and
+every order has one order_items row per service it used, with the quantity,
+rate and amount it was billed at.
+
+The first three services keep their quantity columns on orders and their
+rate columns on price_lists, so exports and older reports read as before;
+the per-service reports read order_items, whose service_date_idx answers a
+service's quantity and revenue (over all time or a date range) from the
+index alone. order_items is keyed by order id and shared by orders and
+orders_archive, so archiving an order leaves its items where they are.
+
+    python service_catalog.py --list
+    python service_catalog.py --add express "Express Service" kg 80
+    python service_catalog.py --retire express
+"""
+
+import argparse
+
+from pricing import SERVICE_LABELS, SERVICE_UNITS, SERVICES, BillItem, Service, rupees, to_paise
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995',
+    'database': 'express_wash'
+}
+
+SERVICES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS services (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        code VARCHAR(32) NOT NULL,
+        label VARCHAR(100) NOT NULL,
+        unit VARCHAR(16) NOT NULL,
+        sort_order INT NOT NULL DEFAULT 0,
+        active BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY code_idx (code)
+    )
+'''
+
+PRICE_LIST_RATES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS price_list_rates (
+        price_list_id INT NOT NULL,
+        service_id INT NOT NULL,
+        rate DECIMAL(10,2) NOT NULL,
+        PRIMARY KEY (price_list_id, service_id)
+    )
+'''
+
+ORDER_ITEMS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS order_items (
+        order_id INT NOT NULL,
+        service_id INT NOT NULL,
+        order_date DATE NOT NULL,
+        quantity DECIMAL(7,2) NOT NULL,
+        rate DECIMAL(10,2) NOT NULL,
+        amount DECIMAL(10,2) NOT NULL,
+        PRIMARY KEY (order_id, service_id),
+        INDEX service_date_idx (service_id, order_date, quantity, amount)
+    )
+'''
+
+# Services with their own columns: code -> (orders quantity column, price_lists rate column)
+COLUMN_SERVICES = {
+    'regular_clothes': ('regular_clothes_kg', 'regular_clothes_rate'),
+    'blankets': ('blankets_kg', 'blankets_rate'),
+    'white_clothes': ('white_clothes_pieces', 'white_clothes_rate'),
+}
+
+
+def seed_services(cursor):
+    """Add the first three services to the catalogue and copy their rates from the price lists"""
+    cursor.executemany('''
+        INSERT IGNORE INTO services (code, label, unit, sort_order) VALUES (%s, %s, %s, %s)
+    ''', [(code, SERVICE_LABELS[code], SERVICE_UNITS[code], position) for position, code in enumerate(SERVICES)])
+    for code, (_, rate_column) in COLUMN_SERVICES.items():
+        cursor.execute(f'''
+            INSERT IGNORE INTO price_list_rates (price_list_id, service_id, rate)
+            SELECT p.id, s.id, p.{rate_column} FROM price_lists p JOIN services s ON s.code = %s
+        ''', (code,))
+
+
+def backfill_order_items(cursor, order_id=None):
+    """Create the items of orders saved without them (older versions, bulk loads); returns the items added
+
+    Every order of orders and orders_archive missing the item of a column service
+    it used is found by an anti-join on order_items, wherever its id falls (a bulk
+    load can insert ids below those of orders that already have items). With
+    order_id only that order (in orders) is filled in. Orders without a price
+    list are priced as PricingEngine.resolve does: the list in effect on the
+    order date, else the earliest one.
+    """
+    tables = ('orders',) if order_id is not None else ('orders', 'orders_archive')
+    order_filter, params = ("AND o.id = %s", (order_id,)) if order_id is not None else ("", ())
+    added = 0
+    for table in tables:
+        for code, (column, _) in COLUMN_SERVICES.items():
+            cursor.execute(f'''
+                INSERT INTO order_items (order_id, service_id, order_date, quantity, rate, amount)
+                SELECT o.id, r.service_id, o.order_date, o.{column}, r.rate, ROUND(o.{column} * r.rate, 2)
+                FROM {table} o
+                JOIN services s ON s.code = %s
+                JOIN price_list_rates r ON r.service_id = s.id AND r.price_list_id = COALESCE(o.price_list_id, (
+                    SELECT p.id FROM price_lists p
+                    ORDER BY p.effective_from > o.order_date, ABS(DATEDIFF(p.effective_from, o.order_date))
+                    LIMIT 1))
+                LEFT JOIN order_items i ON i.order_id = o.id AND i.service_id = s.id
+                WHERE i.order_id IS NULL AND o.{column} <> 0 {order_filter}
+            ''', (code, *params))
+            added += cursor.rowcount
+    return added
+
+
+def refresh_column_items(cursor, order_id):
+    """Re-create the column services' items of an order whose quantities, price list or date changed"""
+    cursor.execute(f'''
+        DELETE i FROM order_items i JOIN services s ON s.id = i.service_id
+        WHERE i.order_id = %s AND s.code IN ({', '.join(['%s'] * len(COLUMN_SERVICES))})
+    ''', (order_id, *COLUMN_SERVICES))
+    # Any other services' items keep their quantities but move to the new date
+    cursor.execute('''
+        UPDATE order_items i JOIN orders o ON o.id = i.order_id
+        SET i.order_date = o.order_date
+        WHERE i.order_id = %s
+    ''', (order_id,))
+    return backfill_order_items(cursor, order_id)
+
+
+def save_order_items(cursor, order_id, order_date, items):
+    """Replace the items of an order with the BillItems it was priced with"""
+    cursor.execute('DELETE FROM order_items WHERE order_id = %s', (order_id,))
+    cursor.executemany('''
+        INSERT INTO order_items (order_id, service_id, order_date, quantity, rate, amount)
+        SELECT %s, id, %s, %s, %s, %s FROM services WHERE code = %s
+    ''', [(order_id, order_date, item.quantity, item.rate, rupees(item.paise), item.service.code) for item in items])
+
+
+def delete_order_items(cursor, order_id):
+    """Delete the items of a deleted order"""
+    cursor.execute('DELETE FROM order_items WHERE order_id = %s', (order_id,))
+
+
+def delete_orphan_items(cursor):
+    """Delete the items of orders in neither orders nor orders_archive (after a bulk delete); returns the count"""
+    cursor.execute('''
+        DELETE i FROM order_items i
+        LEFT JOIN orders o ON o.id = i.order_id
+        LEFT JOIN orders_archive a ON a.id = i.order_id
+        WHERE o.id IS NULL AND a.id IS NULL
+    ''')
+    return cursor.rowcount
+
+
+def load_order_items(cursor, order_id):
+    """Items of an order as billed, in catalogue order (BillItems)"""
+    cursor.execute('''
+        SELECT s.id, s.code, s.label, s.unit, s.active, i.quantity, i.rate, CAST(i.amount * 100 AS SIGNED)
+        FROM order_items i JOIN services s ON s.id = i.service_id
+        WHERE i.order_id = %s
+        ORDER BY s.sort_order, s.id
+    ''', (order_id,))
+    return [BillItem(Service(row[0], row[1], row[2], row[3], bool(row[4])), float(row[5]), float(row[6]), int(row[7]))
+            for row in cursor.fetchall()]
+
+
+def service_totals(cursor, since=None):
+    """Quantity and revenue (paise) of every service sold, from service_date_idx; [(Service, quantity, paise)]"""
+    since_filter = "AND i.order_date >= %s" if since is not None else ""
+    cursor.execute(f'''
+        SELECT s.id, s.code, s.label, s.unit, s.active, SUM(i.quantity), CAST(SUM(i.amount) * 100 AS SIGNED)
+        FROM services s JOIN order_items i ON i.service_id = s.id {since_filter}
+        GROUP BY s.id
+        ORDER BY s.sort_order, s.id
+    ''', (since,) if since is not None else ())
+    return [(Service(row[0], row[1], row[2], row[3], bool(row[4])), float(row[5]), int(row[6]))
+            for row in cursor.fetchall()]
+
+
+def add_service(cursor, code, label, unit, rate):
+    """Add a service to the catalogue at the same rate in every price list; returns its id"""
+    cursor.execute('''
+        INSERT INTO services (code, label, unit, sort_order)
+        SELECT %s, %s, %s, COALESCE(MAX(sort_order), -1) + 1 FROM services
+    ''', (code, label, unit))
+    service_id = cursor.lastrowid
+    cursor.execute('''
+        INSERT INTO price_list_rates (price_list_id, service_id, rate)
+        SELECT id, %s, %s FROM price_lists
+    ''', (service_id, rate))
+    return service_id
+
+
+def retire_service(cursor, code):
+    """Stop offering a service on the order forms; its past orders keep their items"""
+    cursor.execute('UPDATE services SET active = FALSE WHERE code = %s', (code,))
+    return cursor.rowcount > 0
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Express Wash service catalogue")
+    parser.add_argument('--list', action='store_true', help="list the services and their current rates")
+    parser.add_argument('--add', nargs=4, metavar=('CODE', 'LABEL', 'UNIT', 'RATE'),
+                        help="add a service, e.g. --add express \"Express Service\" kg 80")
+    parser.add_argument('--retire', metavar='CODE', help="stop offering a service")
+    args = parser.parse_args()
+
+    import mysql.connector
+    from pricing import PricingEngine
+    from schema import ensure_schema
+
+    conn = mysql.connector.connect(**DB_CONFIG)
+    try:
+        cursor = conn.cursor()
+        ensure_schema(cursor)
+        if args.add:
+            code, label, unit, rate = args.add
+            try:
+                add_service(cursor, code, label, unit, rupees(to_paise(rate)))
+                print(f"✅ Added {label} at ₹{rate}/{unit} to every price list")
+            except mysql.connector.IntegrityError:
+                print(f"❌ There is already a service {code}")
+        if args.retire:
+            if args.retire in COLUMN_SERVICES:
+                parser.error(f"{args.retire} has a column on orders and cannot be retired")
+            if retire_service(cursor, args.retire):
+                print(f"✅ {args.retire} is no longer offered")
+            else:
+                print(f"❌ No service {args.retire}")
+        conn.commit()
+        if args.list or not (args.add or args.retire):
+            engine = PricingEngine.from_cursor(cursor)
+            current = engine.current()
+            print(f"{'Code':<18}{'Service':<30}{'Rate':>14}  Status")
+            for service in engine.services:
+                rate = current.rates.get(service.code)
+                rate_text = f"₹{rate:g}/{service.unit}" if rate is not None else '-'
+                print(f"{service.code:<18}{service.label:<30}{rate_text:>14}  {'' if service.active else 'retired'}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
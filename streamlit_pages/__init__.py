@@ -0,0 +1,4 @@
+"""
+Pages of the Express Wash Streamlit App
+Each page lives in its own module so app.py only imports the page being shown.
+"""
@@ -0,0 +1,109 @@
+"""
+Analytics Page for the Express Wash Streamlit App
+"""
+
+import streamlit as st
+import plotly.express as px
+
+from pricing import rupees
+from .common import (load_customer_stats, load_daily_totals, load_order_page, load_service_totals, data_version,
+                     in_rupees)
+from .figures import trend_figure
+
+@st.cache_resource(max_entries=4, ttl=600, show_spinner="Building analytics...")
+def build_analytics(version):
+    """Metrics and figures of the analytics page; rebuilt only when the data version changes
+
+    Cached as shared objects, not pickled copies: unpickling a Figure rebuilds and revalidates
+    it on every view, so treat the result as read-only.
+    """
+    daily = load_daily_totals()
+    if daily.empty:
+        return None
+    customer_count, top_customers = load_customer_stats()
+
+    # Money is summed in integer paise and turned into rupees for display only
+    total_orders = int(daily['orders'].sum())
+    total_paise = int(daily['revenue_paise'].sum())
+    metrics = {
+        'total_orders': total_orders,
+        'total_revenue': rupees(total_paise),
+        'avg_order_value': rupees(round(total_paise / total_orders)),
+        'customer_count': customer_count
+    }
+
+    # Daily revenue, summed into weeks or months when the history outgrows the point budget
+    revenue = daily.groupby('order_date', sort=True)['revenue_paise'].sum()
+    fig_daily = trend_figure(revenue.index.values.astype('datetime64[D]'), revenue.values / 100,
+                             'Revenue Trend', 'Revenue (₹)')
+
+    # Service type breakdown: the amounts billed per catalogue service, summed from order_items
+    services = load_service_totals()
+    fig_pie = px.pie(values=services['revenue_paise'].astype('int64') / 100, names=services['service'],
+                     title='Revenue by Service Type')
+
+    # Top customers (customers sharing a name are told apart by mobile number)
+    labels = [f"{name} ({mobile})" if mobile else name
+              for name, mobile in zip(top_customers['name'], top_customers['mobile_number'])]
+    fig_bar = px.bar(x=top_customers['revenue_paise'].astype('int64') / 100, y=labels,
+                     orientation='h',
+                     title='Top 10 Customers by Revenue',
+                     labels={'x': 'Revenue (₹)', 'y': 'Customer Name'})
+    fig_bar.update_layout(height=400)
+
+    recent_orders, _ = load_order_page({}, page_size=5)
+    return metrics, fig_daily, fig_pie, fig_bar, in_rupees(recent_orders)[['customer_name', 'total_amount', 'created_at']]
+
+def analytics_page():
+    """Page for analytics and insights"""
+    st.markdown('<h2 class="sub-header">📈 Analytics & Insights</h2>', unsafe_allow_html=True)
+
+    try:
+        analytics = build_analytics(data_version())
+
+        if analytics is None:
+            st.info("📝 No data available for analytics. Create some orders first!")
+            return
+        metrics, fig_daily, fig_pie, fig_bar, recent_orders = analytics
+
+        # Key metrics
+        st.subheader("📊 Key Metrics")
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Total Orders", metrics['total_orders'])
+
+        with col2:
+            st.metric("Total Revenue", f"₹{metrics['total_revenue']:,.2f}")
+
+        with col3:
+            st.metric("Average Order Value", f"₹{metrics['avg_order_value']:.2f}")
+
+        with col4:
+            st.metric("Unique Customers", metrics['customer_count'])
+
+        # Charts
+        st.subheader("📈 Revenue Trends")
+        st.plotly_chart(fig_daily, use_container_width=True)
+
+        # Service breakdown
+        st.subheader("🧺 Service Breakdown")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.plotly_chart(fig_pie, use_container_width=True)
+
+        with col2:
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+        # Recent activity
+        st.subheader("🕒 Recent Activity")
+        st.dataframe(recent_orders, use_container_width=True, column_config={
+            'total_amount': st.column_config.NumberColumn(format="₹%.2f"),
+            'created_at': st.column_config.DatetimeColumn(format="MMMM DD, YYYY HH:mm")
+        })
+
+    except Exception as e:
+        st.error(f"Error loading analytics: {str(e)}")
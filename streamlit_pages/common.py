@@ -0,0 +1,531 @@
+"""
+Shared Helpers for the Express Wash Streamlit App
+Database access, pricing and the one-time schema check used by every page.
+pandas is imported inside the functions that need it so the New Order page
+does not pay for it.
+"""
+
+import os
+
+import mysql.connector
+import streamlit as st
+
+from customer_index import DEFAULT_LIMIT, REFRESH_INTERVAL, CustomerIndex
+from customers import find_or_create_customer
+from data_version import bump_data_version, read_data_version
+from db import get_connection
+from order_archive import ORDER_COLUMNS, orders_source
+from pricing import SERVICES, PricingEngine, format_rate, rupees
+from schema import ensure_schema
+from service_catalog import delete_order_items, load_order_items, save_order_items, service_totals
+
+# Database configuration
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995',
+    'database': 'express_wash'
+}
+
+# Order tables show one page at a time
+PAGE_SIZE = 50
+ORDER_PAGE_COLUMNS = ['id', 'receipt_number', 'customer_name', 'mobile_number', 'order_date',
+                      'regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces', 'total_amount',
+                      'collection_date', 'created_at']
+
+# In-memory types of the order columns: repeated strings as categories, quantities as
+# float32, small integers as int32 and the amount as integer paise (the column total_paise);
+# a third of the memory of what MySQL returns
+ORDER_DTYPES = {
+    'id': 'int32',
+    'receipt_number': 'str',
+    'customer_id': 'Int32',
+    'customer_name': 'category',
+    'mobile_number': 'category',
+    'order_date': 'datetime64',
+    'regular_clothes_kg': 'float32',
+    'blankets_kg': 'float32',
+    'white_clothes_pieces': 'int32',
+    'total_amount': 'paise',
+    'price_list_id': 'Int32',
+    'collection_date': 'datetime64',
+    'created_at': 'datetime64'
+}
+
+# Initialize database (once per server process, not on every rerun)
+@st.cache_resource(show_spinner="Checking database...")
+def init_database():
+    """Initialize MySQL database and create tables if they don't exist"""
+    # First connect without database to create it if it doesn't exist
+    conn = mysql.connector.connect(
+        host=DB_CONFIG['host'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password']
+    )
+    try:
+        cursor = conn.cursor()
+        
+        # Create database if it doesn't exist
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
+        cursor.execute(f"USE {DB_CONFIG['database']}")
+        
+        # Create/upgrade orders and price_lists tables
+        ensure_schema(cursor)
+        
+        conn.commit()
+    finally:
+        conn.close()
+    
+    print("✅ Database initialized successfully!")
+    return True
+
+def ensure_database():
+    """Run init_database, showing connection errors (failures are retried on the next run)"""
+    try:
+        return init_database()
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        st.info("Please make sure MySQL is running and credentials are correct.")
+        return False
+
+# Pricing configuration (price_lists table, shared by all sessions)
+@st.cache_resource(ttl=300)
+def get_pricing_engine():
+    """Load the price lists, refreshed every 5 minutes"""
+    return PricingEngine.from_db(DB_CONFIG)
+
+# Returning customers for the New Order suggestions (shared by all sessions)
+@st.cache_resource(show_spinner="Loading customers...")
+def get_customer_index():
+    """Load every customer who has ordered; later runs only read newer orders"""
+    index = CustomerIndex(DB_CONFIG)
+    index.refresh()
+    return index
+
+def search_customers(text, limit=DEFAULT_LIMIT):
+    """Best matching returning customers for a name or mobile number prefix"""
+    try:
+        index = get_customer_index()
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return []
+    index.refresh_async(REFRESH_INTERVAL)
+    return index.search(text, limit)
+
+def fuzzy_customers(text):
+    """Customers whose names are close to text in spelling or sound (e.g. Seeta for Sita)"""
+    try:
+        index = get_customer_index()
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return []
+    index.refresh_async(REFRESH_INTERVAL)
+    return index.fuzzy_search(text)
+
+def calculate_bill(regular_kg, blankets_kg, white_pieces, order_date=None, extra=None):
+    """Calculate total bill using the price list in effect on the order date (extra: other services by code)"""
+    return get_pricing_engine().price(regular_kg, blankets_kg, white_pieces, on_date=order_date, extra=extra)
+
+def other_service_inputs(price_list, key, quantities=None):
+    """Quantity inputs for the catalogue services without a column on orders; returns {code: quantity}"""
+    quantities = quantities or {}
+    # A retired service stays on the orders that already have it
+    engine = get_pricing_engine()
+    retired = [service for service in map(engine.service, quantities)
+               if service and not service.active and service.code not in SERVICES]
+    services = engine.other_services() + retired
+    if not services:
+        return {}
+    entered = {}
+    columns = st.columns(3)
+    for i, service in enumerate(services):
+        with columns[i % 3]:
+            entered[service.code] = st.number_input(
+                f"{service.label} ({format_rate(price_list, service.code, service.unit)})",
+                min_value=0.0, value=float(quantities.get(service.code, 0)), step=0.5, key=f"{key}_{service.code}")
+    return entered
+
+def save_order_to_csv(order_data):
+    """Save order to CSV file"""
+    import pandas as pd
+    
+    csv_file = 'orders.csv'
+    
+    # Check if file exists, if not create with headers
+    if not os.path.exists(csv_file):
+        df = pd.DataFrame([order_data])
+    else:
+        df = pd.read_csv(csv_file)
+        df = pd.concat([df, pd.DataFrame([order_data])], ignore_index=True)
+    
+    df.to_csv(csv_file, index=False)
+
+def update_csv_backup():
+    """Update CSV file to match database"""
+    try:
+        df = load_orders(include_archive=True, columns=ORDER_COLUMNS)
+        if not df.empty:
+            in_rupees(df).to_csv('orders.csv', index=False)
+    except Exception as e:
+        st.error(f"Error updating CSV backup: {str(e)}")
+
+def save_order_to_db(order_data, items):
+    """Save order and its service items (bill['items']) to MySQL database"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        
+        # Use provided receipt number (mandatory)
+        receipt_number = order_data.get('receipt_number')
+        customer_id = find_or_create_customer(cursor, order_data['customer_name'], order_data['mobile_number'])
+        
+        cursor.execute('''
+            INSERT INTO orders (customer_id, customer_name, mobile_number, order_date, regular_clothes_kg, 
+                               blankets_kg, white_clothes_pieces, total_amount, receipt_number, price_list_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ''', (
+            customer_id,
+            order_data['customer_name'],
+            order_data['mobile_number'],
+            order_data['order_date'],
+            order_data['regular_clothes_kg'],
+            order_data['blankets_kg'],
+            order_data['white_clothes_pieces'],
+            order_data['total_amount'],
+            receipt_number,
+            order_data.get('price_list_id')
+        ))
+        save_order_items(cursor, cursor.lastrowid, order_data['order_date'], items)
+        bump_data_version(cursor)
+        
+        conn.commit()
+        conn.close()
+        
+        # Offer the customer on the next order without waiting for the refresh interval
+        get_customer_index().refresh_async()
+        
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        raise
+
+@st.cache_resource(max_entries=2, show_spinner="Loading orders...")
+def _shared_orders(version, include_archive, fields):
+    """Typed orders frame shared by every session; version changes when the orders do"""
+    return _query_orders(include_archive, fields)
+
+def _query_orders(include_archive, fields):
+    """Read the orders into a typed frame"""
+    columns = ', '.join(fields)
+    conn = get_connection(DB_CONFIG)
+    try:
+        cursor = conn.cursor()
+        source = orders_source(cursor) if include_archive else 'orders'
+        cursor.execute(f"SELECT {columns} FROM {source} ORDER BY created_at DESC")
+        return _order_frame(cursor.fetchall(), fields)
+    finally:
+        conn.close()
+
+def load_orders(include_archive=False, columns=ORDER_PAGE_COLUMNS):
+    """Load orders from MySQL database (archived orders too for reports and backups)
+
+    Every session gets the same frame until the orders change, so treat it as read-only.
+    """
+    import pandas as pd
+    
+    try:
+        try:
+            version = data_version()
+        except (mysql.connector.Error, LookupError) as err:
+            # Without a version the shared frame may be stale, so read this run's orders directly
+            st.warning(f"⚠️ Could not check for changed orders: {err}")
+            return _query_orders(include_archive, tuple(columns))
+        # A shallow copy: callers adding columns do not change the shared frame
+        return _shared_orders(version, include_archive, tuple(columns)).copy(deep=False)
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return pd.DataFrame(columns=columns)  # Return empty DataFrame on error
+
+def order_filter_sql(search_term='', order_date=None, min_amount=0, customer_ids=()):
+    """WHERE clause and parameters for the order table filters (receipt/name search, date, amount)
+
+    The search matches the start of the receipt number or customer name, so it
+    reads the receipt_number and customer_name_idx indexes; customer_ids (the
+    customers found by word prefix or similar spelling) cover the rest.
+    """
+    conditions, params = [], []
+    if search_term:
+        customer_filter = f"OR customer_id IN ({', '.join(['%s'] * len(customer_ids))})" if customer_ids else ""
+        conditions.append(f"(receipt_number LIKE %s OR customer_name LIKE %s {customer_filter})")
+        prefix = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        params += [prefix, prefix, *customer_ids]
+    if order_date:
+        conditions.append('order_date = %s')
+        params.append(order_date)
+    if min_amount:
+        conditions.append('total_amount >= %s')
+        params.append(min_amount)
+    return conditions, params
+
+def _order_frame(rows, columns=ORDER_PAGE_COLUMNS):
+    """DataFrame of order rows with the ORDER_DTYPES types, converted column by column"""
+    import pandas as pd
+    
+    df = pd.DataFrame(rows, columns=list(columns))
+    for column in df.columns:
+        if ORDER_DTYPES[column].startswith('datetime64'):
+            df[column] = pd.to_datetime(df[column])
+        elif ORDER_DTYPES[column] == 'paise':
+            # A DECIMAL(10,2) amount as float64 is far within half a paisa of its value, so this is exact
+            df[column] = (df[column].astype('float64') * 100).round().astype('int64')
+        else:
+            df[column] = df[column].astype(ORDER_DTYPES[column])
+    return df.rename(columns={'total_amount': 'total_paise'})
+
+def in_rupees(df):
+    """Order frame with total_paise back as total_amount in rupees (Decimal), for display and files"""
+    if 'total_paise' not in df.columns:
+        return df
+    return df.assign(total_paise=df['total_paise'].map(rupees)).rename(columns={'total_paise': 'total_amount'})
+
+def load_order_page(filters, after=None, page_size=PAGE_SIZE):
+    """One page of the filtered orders, newest first; returns (DataFrame, more pages follow)
+
+    after is the (created_at, id) of the last row of the previous page, so a page
+    reads page_size rows from created_at_idx instead of skipping the earlier pages.
+    """
+    import pandas as pd
+    
+    conditions, params = order_filter_sql(**filters)
+    if after is not None:
+        conditions.append('(created_at < %s OR (created_at = %s AND id < %s))')
+        params += [after[0], after[0], after[1]]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    columns = ', '.join(ORDER_PAGE_COLUMNS)
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {columns} FROM orders {where} ORDER BY created_at DESC, id DESC LIMIT %s",
+                       (*params, page_size + 1))
+        rows = cursor.fetchall()
+        conn.close()
+        return _order_frame(rows[:page_size]), len(rows) > page_size
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return pd.DataFrame(columns=ORDER_PAGE_COLUMNS), False
+
+def load_matching_orders(filters):
+    """Every order matching the filters, newest first (for downloads)"""
+    import pandas as pd
+    
+    conditions, params = order_filter_sql(**filters)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    columns = ', '.join(ORDER_PAGE_COLUMNS)
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {columns} FROM orders {where} ORDER BY created_at DESC, id DESC", params)
+        rows = cursor.fetchall()
+        conn.close()
+        return _order_frame(rows)
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return pd.DataFrame(columns=ORDER_PAGE_COLUMNS)
+
+def has_orders():
+    """True when there is at least one order"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        cursor.execute('SELECT 1 FROM orders LIMIT 1')
+        found = cursor.fetchone() is not None
+        conn.close()
+        return found
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return False
+
+def load_customer_stats(top=10):
+    """Return (customers with orders, DataFrame of the top customers by revenue in paise)"""
+    import pandas as pd
+    
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        # Both read customer_idx (customer_id, total_amount) instead of the orders themselves
+        source = orders_source(cursor)
+        cursor.execute(f'SELECT COUNT(DISTINCT customer_id) FROM {source}')
+        customer_count = cursor.fetchone()[0]
+        cursor.execute(f'''
+            SELECT c.id, c.name, c.mobile_number, CAST(t.revenue * 100 AS SIGNED)
+            FROM (SELECT customer_id, SUM(total_amount) AS revenue
+                  FROM {source} WHERE customer_id IS NOT NULL
+                  GROUP BY customer_id ORDER BY revenue DESC LIMIT %s) t
+            JOIN customers c ON c.id = t.customer_id
+            ORDER BY t.revenue DESC
+        ''', (top,))
+        top_customers = pd.DataFrame(cursor.fetchall(), columns=['customer_id', 'name', 'mobile_number', 'revenue_paise'])
+        conn.close()
+        return customer_count, top_customers
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return 0, pd.DataFrame(columns=['customer_id', 'name', 'mobile_number', 'revenue_paise'])
+
+def data_version():
+    """Counter the writers bump with every change to orders, their items or customers (keys the cached data)
+
+    Errors are raised, never turned into a version: a wrong version would serve stale or empty data.
+    """
+    conn = get_connection(DB_CONFIG)
+    try:
+        return read_data_version(conn.cursor())
+    finally:
+        conn.close()
+
+def load_daily_totals():
+    """Orders and revenue (paise) per day, archived orders included"""
+    import pandas as pd
+    
+    columns = ['order_date', 'orders', 'revenue_paise']
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        source = orders_source(cursor)
+        cursor.execute(f'''
+            SELECT order_date, COUNT(*), CAST(SUM(total_amount) * 100 AS SIGNED)
+            FROM {source}
+            GROUP BY order_date
+            ORDER BY order_date
+        ''')
+        df = pd.DataFrame(cursor.fetchall(), columns=columns)
+        conn.close()
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        df = pd.DataFrame(columns=columns)
+    for column in ('orders', 'revenue_paise'):
+        df[column] = df[column].astype('int64')
+    df['order_date'] = pd.to_datetime(df['order_date'])
+    return df
+
+def load_service_totals():
+    """Quantity and revenue (paise) per catalogue service, archived orders included"""
+    import pandas as pd
+    
+    columns = ['service', 'unit', 'quantity', 'revenue_paise']
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        # order_items holds the items of archived orders too
+        totals = service_totals(cursor)
+        conn.close()
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        totals = []
+    return pd.DataFrame([(service.label, service.unit, quantity, paise) for service, quantity, paise in totals],
+                        columns=columns)
+
+def update_order(order_id, order_data, items):
+    """Update an existing order and its service items in MySQL database"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        customer_id = find_or_create_customer(cursor, order_data['customer_name'], order_data['mobile_number'],
+                                              order_id)
+        
+        cursor.execute('''
+            UPDATE orders 
+            SET customer_id = %s, customer_name = %s, mobile_number = %s, order_date = %s,
+                regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
+                total_amount = %s, price_list_id = %s
+            WHERE id = %s
+        ''', (
+            customer_id,
+            order_data['customer_name'],
+            order_data['mobile_number'],
+            order_data['order_date'],
+            order_data['regular_clothes_kg'],
+            order_data['blankets_kg'],
+            order_data['white_clothes_pieces'],
+            order_data['total_amount'],
+            order_data.get('price_list_id'),
+            order_id
+        ))
+        save_order_items(cursor, order_id, order_data['order_date'], items)
+        bump_data_version(cursor)
+        
+        conn.commit()
+        conn.close()
+        
+        # Update CSV backup
+        update_csv_backup()
+        
+        return True
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return False
+
+def delete_order(order_id):
+    """Delete an order from MySQL database"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM orders WHERE id = %s', (order_id,))
+        delete_order_items(cursor, order_id)
+        bump_data_version(cursor)
+        
+        conn.commit()
+        conn.close()
+        
+        # Update CSV backup
+        update_csv_backup()
+        
+        return True
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return False
+
+def get_order_by_receipt(receipt_number):
+    """Order with a receipt number as a dict of ORDER_PAGE_COLUMNS, or None"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        
+        columns = ', '.join(ORDER_PAGE_COLUMNS)
+        cursor.execute(f"SELECT {columns} FROM orders WHERE receipt_number = %s", (receipt_number,))
+        result = cursor.fetchone()
+        
+        conn.close()
+        return dict(zip(ORDER_PAGE_COLUMNS, result)) if result else None
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return None
+
+def get_order_items(order_id):
+    """Service items of an order as billed (BillItems)"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        items = load_order_items(conn.cursor(), order_id)
+        conn.close()
+        return items
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return []
+
+def get_order_by_id(order_id):
+    """Get a specific order by ID"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, customer_name, mobile_number, order_date, regular_clothes_kg,
+                   blankets_kg, white_clothes_pieces, total_amount, receipt_number, price_list_id
+            FROM orders WHERE id = %s
+        ''', (order_id,))
+        result = cursor.fetchone()
+        
+        conn.close()
+        return result
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return None
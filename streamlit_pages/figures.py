@@ -0,0 +1,36 @@
+"""
+Chart Figures for the Express Wash Streamlit App
+Builds the Plotly figures of the analytics pages within a point budget, so a
+figure sent to the browser stays a few kilobytes whatever the length of the
+order history: long daily series are summed into weeks or months on the
+server, and series that are still dense are drawn with WebGL (scattergl).
+"""
+
+import plotly.graph_objects as go
+
+from chart_resampling import bucket_sums, choose_period
+
+POINT_BUDGET = 800  # points per figure
+WEBGL_POINTS = 400  # denser line series render with scattergl
+PERIOD_TITLES = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}
+
+
+def budget_series(dates, values, budget=POINT_BUDGET):
+    """Sum a sorted daily series into the shortest period that fits budget; returns (dates, sums, period)"""
+    if len(dates) == 0:
+        return dates, values, 'day'
+    days = int((dates[-1] - dates[0]).astype('timedelta64[D]').astype(int)) + 1
+    period = choose_period(days, budget, min_px=1)
+    starts, sums = bucket_sums(dates, values, period)
+    return starts, sums, period
+
+
+def trend_figure(dates, values, title, value_label, budget=POINT_BUDGET, height=400):
+    """Line chart of a daily series (e.g. revenue) within the point budget"""
+    dates, values, period = budget_series(dates, values, budget)
+    trace = go.Scattergl if len(dates) > WEBGL_POINTS else go.Scatter
+    fig = go.Figure(trace(x=dates, y=values, mode='lines', name=value_label,
+                          hovertemplate=f'%{{x|%d %b %Y}}<br>{value_label}: %{{y:,.2f}}<extra></extra>'))
+    fig.update_layout(title=f"{PERIOD_TITLES[period]} {title}", xaxis_title='Date', yaxis_title=value_label,
+                      height=height)
+    return fig
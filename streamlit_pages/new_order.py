@@ -0,0 +1,140 @@
+"""
+New Order Page for the Express Wash Streamlit App
+"""
+
+from datetime import date
+
+import streamlit as st
+
+from customer_index import describe
+from pricing import SERVICES, format_rate, rupees
+from .common import (get_pricing_engine, calculate_bill, other_service_inputs, save_order_to_csv, save_order_to_db,
+                     search_customers)
+
+def use_customer(customer):
+    """Fill the customer fields from a suggestion (runs before the widgets are drawn)"""
+    st.session_state['customer_name'] = customer['name']
+    st.session_state['mobile_number'] = customer['mobile_number']
+    st.session_state['customer_lookup'] = ""
+
+def new_order_page():
+    """Page for creating new orders"""
+    st.markdown('<h2 class="sub-header">📝 New Order</h2>', unsafe_allow_html=True)
+    
+    with st.container():
+        st.markdown('<div class="form-section">', unsafe_allow_html=True)
+        
+        # Customer Information
+        st.subheader("👤 Customer Information")
+        
+        # Returning customers: type part of the name or mobile number and pick one
+        lookup = st.text_input("🔎 Returning customer", key="customer_lookup",
+                               placeholder="Start typing a name or mobile number")
+        if lookup:
+            matches = search_customers(lookup)
+            if not matches:
+                st.caption("No returning customer matches; fill in the details below.")
+            for customer in matches:
+                st.button(describe(customer), key=f"customer_{customer['id']}",
+                          on_click=use_customer, args=(customer,))
+        
+        col1, col2 = st.columns(2)
+    
+    with col1:
+        customer_name = st.text_input("Customer Name *", placeholder="Enter customer name", key="customer_name")
+        mobile_number = st.text_input("Mobile Number", placeholder="Enter mobile number", key="mobile_number")
+    
+    with col2:
+        order_date = st.date_input("Order Date *", value=date.today())
+        receipt_number = st.text_input("Receipt Number *", 
+                                     placeholder="Enter receipt number (e.g., 1, 2, 100, A-51)",
+                                     help="Receipt number is mandatory for order tracking")
+    
+    # Service Details
+    st.subheader("🧺 Service Details")
+    price_list = get_pricing_engine().for_date(order_date)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown('<div class="price-card">', unsafe_allow_html=True)
+        st.markdown("**Regular Clothes**")
+        st.markdown(format_rate(price_list, 'regular_clothes'))
+        st.markdown("</div>", unsafe_allow_html=True)
+        regular_kg = st.number_input("Weight (kg)", min_value=0.0, value=0.0, step=0.5)
+    
+    with col2:
+        st.markdown('<div class="price-card">', unsafe_allow_html=True)
+        st.markdown("**Blankets/Bedsheets**")
+        st.markdown(format_rate(price_list, 'blankets'))
+        st.markdown("</div>", unsafe_allow_html=True)
+        blankets_kg = st.number_input("Weight (kg)", min_value=0.0, value=0.0, step=0.5, key="blankets")
+    
+    with col3:
+        st.markdown('<div class="price-card">', unsafe_allow_html=True)
+        st.markdown("**White Clothes**")
+        st.markdown(format_rate(price_list, 'white_clothes'))
+        st.markdown("</div>", unsafe_allow_html=True)
+        white_pieces = st.number_input("Number of pieces", min_value=0, value=0, key="white")
+    
+    # Services added to the catalogue since (express, ironing...)
+    extra = other_service_inputs(price_list, "new")
+    
+    # Calculate bill
+    if regular_kg > 0 or blankets_kg > 0 or white_pieces > 0 or any(extra.values()):
+        bill = calculate_bill(regular_kg, blankets_kg, white_pieces, order_date, extra)
+        
+        # Display bill summary
+        st.markdown('<div class="bill-summary">', unsafe_allow_html=True)
+        st.subheader("💰 Bill Summary")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write(f"**Regular Clothes:** {regular_kg}kg × ₹{bill['rates']['regular_clothes']:g} = ₹{bill['regular_cost']:.2f}")
+            st.write(f"**Blankets/Bedsheets:** {blankets_kg}kg × ₹{bill['rates']['blankets']:g} = ₹{bill['blankets_cost']:.2f}")
+            st.write(f"**White Clothes:** {white_pieces} pieces × ₹{bill['rates']['white_clothes']:g} = ₹{bill['white_cost']:.2f}")
+            for item in bill['items']:
+                if item.service.code not in SERVICES:
+                    st.write(f"**{item.service.label}:** {item.quantity:g} {item.service.unit} × ₹{item.rate:g} = "
+                             f"₹{rupees(item.paise):.2f}")
+        
+        with col2:
+            st.markdown(f"### **Total Amount: ₹{bill['total']:.2f}**")
+        
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        # Save order button
+        if st.button("💾 Save Order", type="primary", use_container_width=True):
+            if customer_name and order_date and receipt_number:
+                # Prepare order data
+                order_data = {
+                    'customer_name': customer_name,
+                    'mobile_number': mobile_number,
+                    'order_date': order_date.strftime('%Y-%m-%d'),
+                    'regular_clothes_kg': regular_kg,
+                    'blankets_kg': blankets_kg,
+                    'white_clothes_pieces': white_pieces,
+                    'total_amount': bill['total'],
+                    'receipt_number': receipt_number if receipt_number else None,
+                    'price_list_id': bill['price_list_id']
+                }
+                
+                # Save to both CSV and database
+                save_order_to_csv(order_data)
+                save_order_to_db(order_data, bill['items'])
+                
+                st.markdown('<div class="success-message">', unsafe_allow_html=True)
+                st.success("✅ Order saved successfully!")
+                st.write(f"**Customer:** {customer_name}")
+                st.write(f"**Receipt Number:** {receipt_number}")
+                st.write(f"**Total Amount:** ₹{bill['total']:.2f}")
+                st.write(f"**Order Date:** {order_date.strftime('%B %d, %Y')}")
+                st.markdown("</div>", unsafe_allow_html=True)
+                
+                st.markdown("</div>", unsafe_allow_html=True)
+                
+                # Clear form
+                st.rerun()
+            else:
+                st.error("❌ Please fill in customer name, order date, and receipt number!")
@@ -0,0 +1,465 @@
+"""
+Order History Page for the Express Wash Streamlit App
+Viewing, editing, deleting and collecting orders.
+"""
+
+from datetime import datetime, date
+from io import BytesIO
+
+import streamlit as st
+import pandas as pd
+
+from pricing import SERVICES, format_rate
+from customer_index import FUZZY_LIMIT
+from data_version import bump_data_version
+from db import get_connection
+from .common import (DB_CONFIG, PAGE_SIZE, get_pricing_engine, calculate_bill, save_order_to_csv, save_order_to_db,
+                     load_order_page, load_matching_orders, has_orders, update_order, delete_order,
+                     get_order_by_id, get_order_by_receipt, get_order_items, other_service_inputs, fuzzy_customers,
+                     search_customers, in_rupees)
+
+# Formatting happens in the browser, so a page is sent as plain numbers and dates
+ORDER_COLUMN_CONFIG = {
+    'id': st.column_config.NumberColumn("ID", format="%d"),
+    'receipt_number': "Receipt Number",
+    'customer_name': "Customer Name",
+    'mobile_number': "Mobile Number",
+    'order_date': st.column_config.DateColumn("Order Date", format="MMMM DD, YYYY"),
+    'regular_clothes_kg': st.column_config.NumberColumn("Regular (kg)", format="%.1f"),
+    'blankets_kg': st.column_config.NumberColumn("Blankets (kg)", format="%.1f"),
+    'white_clothes_pieces': st.column_config.NumberColumn("White (pieces)", format="%d"),
+    'total_amount': st.column_config.NumberColumn("Total Amount", format="₹%.2f"),
+    'collection_date': st.column_config.DatetimeColumn("Collection Date", format="MMMM DD, YYYY HH:mm"),
+    'created_at': st.column_config.DatetimeColumn("Created At", format="MMMM DD, YYYY HH:mm")
+}
+
+def order_history_page():
+    """Page for viewing and managing order history with CRUD operations"""
+    st.markdown('<h2 class="sub-header">📊 Order History & Management</h2>', unsafe_allow_html=True)
+    
+    try:
+        if not has_orders():
+            st.info("📝 No orders found. Create your first order!")
+            return
+        
+        # CRUD Operations Section
+        st.subheader("🛠️ Manage Orders")
+        
+        # Operation selection
+        operation = st.selectbox(
+            "Choose an operation:",
+            ["📋 View Orders", "✏️ Edit Order", "🗑️ Delete Order", "📦 Order Collection", "➕ Add New Order"]
+        )
+        
+        # Viewing and collection read one page at a time; editing and deleting look up one order
+        if operation == "📋 View Orders":
+            view_orders_section()
+        elif operation == "✏️ Edit Order":
+            edit_order_section()
+        elif operation == "🗑️ Delete Order":
+            delete_order_section()
+        elif operation == "📦 Order Collection":
+            order_collection_section()
+        elif operation == "➕ Add New Order":
+            add_new_order_section()
+        
+    except Exception as e:
+        st.error(f"Error loading orders: {str(e)}")
+
+def _next_page(key, created_at, order_id):
+    st.session_state[f"{key}_cursors"].append((created_at, order_id))
+
+def _previous_page(key):
+    st.session_state[f"{key}_cursors"].pop()
+
+def order_table(key, filters, columns):
+    """Show one page of the filtered orders with Previous/Next buttons"""
+    # Page cursors: the (created_at, id) each page starts after; new filters start over
+    signature = repr(sorted(filters.items()))
+    if st.session_state.get(f"{key}_filters") != signature:
+        st.session_state[f"{key}_filters"] = signature
+        st.session_state[f"{key}_cursors"] = [None]
+    cursors = st.session_state[f"{key}_cursors"]
+    
+    page, has_more = load_order_page(filters, after=cursors[-1])
+    first = (len(cursors) - 1) * PAGE_SIZE
+    if page.empty:
+        st.write("**📋 No matching orders**")
+    else:
+        st.write(f"**📋 Orders {first + 1:,}–{first + len(page):,}{'' if has_more else ' (last page)'}**")
+        st.dataframe(in_rupees(page), column_order=columns, column_config=ORDER_COLUMN_CONFIG,
+                     hide_index=True, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("⬅️ Previous", key=f"{key}_previous", disabled=len(cursors) == 1,
+                  on_click=_previous_page, args=(key,))
+    with col2:
+        if has_more:
+            last = page.iloc[-1]
+            st.button("Next ➡️", key=f"{key}_next", on_click=_next_page,
+                      args=(key, last['created_at'].to_pydatetime(), int(last['id'])))
+        else:
+            st.button("Next ➡️", key=f"{key}_next", disabled=True)
+
+def view_orders_section():
+    """Section for viewing orders with filters"""
+    st.subheader("📋 View Orders")
+    
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        search_term = st.text_input("Search by receipt number or name", placeholder="Enter receipt number or name...", key="view_search")
+    
+    with col2:
+        date_filter = st.date_input("Filter by date", value=None, key="view_date")
+    
+    with col3:
+        min_amount = st.number_input("Minimum amount", min_value=0.0, value=0.0, key="view_amount")
+    
+    # The filters run in SQL; only the page shown is read
+    filters = {'search_term': search_term.strip(), 'order_date': date_filter, 'min_amount': min_amount}
+    if filters['search_term']:
+        # Search by receipt number or customer name, plus names spelled differently
+        similar = fuzzy_customers(filters['search_term'])
+        # Names with a word starting with the term ("Sharma" in "Rahul Sharma") come from the customer index
+        by_word = search_customers(filters['search_term'], FUZZY_LIMIT)
+        filters['customer_ids'] = tuple(sorted({customer['id'] for customer in similar + by_word}))
+        other_names = sorted({customer['name'] for customer in similar
+                              if search_term.lower() not in customer['name'].lower()})
+        if other_names:
+            st.caption(f"🔤 Also showing similar names: {', '.join(other_names[:10])}")
+    
+    order_table("view", filters, ['id', 'receipt_number', 'customer_name', 'mobile_number', 'order_date',
+                                  'regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces', 'total_amount',
+                                  'created_at'])
+    
+    # Download options
+    st.subheader("📥 Download Data")
+    if st.button("📦 Prepare download of all matching orders", key="view_prepare_download"):
+        matching = in_rupees(load_matching_orders(filters))
+        st.write(f"{len(matching):,} orders")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            csv_data = matching.to_csv(index=False)
+            st.download_button(
+                label="📄 Download as CSV",
+                data=csv_data,
+                file_name=f"express_wash_orders_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
+        
+        with col2:
+            excel_data = BytesIO()
+            matching.to_excel(excel_data, index=False)
+            st.download_button(
+                label="📊 Download as Excel",
+                data=excel_data.getvalue(),
+                file_name=f"express_wash_orders_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+
+def find_order_id(key):
+    """Receipt number or order ID input; returns the id of the order found, or None"""
+    text = st.text_input("Enter Receipt Number or Order ID:", placeholder="e.g., 123, A-51, 055", key=key).strip()
+    if not text:
+        return None
+    # Receipt numbers first (unique index), then the primary key
+    order = get_order_by_receipt(text)
+    if order:
+        return order['id']
+    if text.isdigit() and get_order_by_id(int(text)):
+        return int(text)
+    st.warning("⚠️ No order found with this receipt number or ID!")
+    return None
+
+def edit_order_section():
+    """Section for editing orders"""
+    st.subheader("✏️ Edit Order")
+    
+    order_id = find_order_id("edit_lookup")
+    
+    if order_id:
+        # Get order details
+        order_data = get_order_by_id(order_id)
+        
+        if order_data:
+            items = get_order_items(order_id)
+            st.write("**Current Order Details:**")
+            
+            # Display current values
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Customer Name:** {order_data[1]}")
+                st.write(f"**Mobile Number:** {order_data[2]}")
+                st.write(f"**Order Date:** {order_data[3]}")
+            
+            with col2:
+                st.write(f"**Regular Clothes:** {order_data[4]} kg")
+                st.write(f"**Blankets:** {order_data[5]} kg")
+                st.write(f"**White Clothes:** {order_data[6]} pieces")
+                for item in items:
+                    if item.service.code not in SERVICES:
+                        st.write(f"**{item.service.label}:** {item.quantity:g} {item.service.unit}")
+                st.write(f"**Total Amount:** ₹{order_data[7]:.2f}")
+            
+            st.divider()
+            
+            # Edit form
+            st.write("**Edit Order Details:**")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                new_customer_name = st.text_input("Customer Name", value=order_data[1], key="edit_name")
+                new_mobile_number = st.text_input("Mobile Number", value=order_data[2] or "", key="edit_mobile")
+            
+            with col2:
+                new_order_date = st.date_input("Order Date", value=pd.to_datetime(order_data[3]).date(), key="edit_date")
+            
+            # Service details
+            st.write("**Service Details:**")
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                new_regular_kg = st.number_input("Regular Clothes (kg)", min_value=0.0, value=float(order_data[4]), step=0.5, key="edit_regular")
+            
+            with col2:
+                new_blankets_kg = st.number_input("Blankets (kg)", min_value=0.0, value=float(order_data[5]), step=0.5, key="edit_blankets")
+            
+            with col3:
+                new_white_pieces = st.number_input("White Clothes (pieces)", min_value=0, value=int(order_data[6]), key="edit_white")
+            
+            # Other catalogue services, filled in from the order's items
+            quantities = {item.service.code: item.quantity for item in items}
+            new_extra = other_service_inputs(get_pricing_engine().for_date(new_order_date), "edit", quantities)
+            
+            # Calculate new total
+            new_bill = calculate_bill(new_regular_kg, new_blankets_kg, new_white_pieces, new_order_date, new_extra)
+            
+            st.markdown(f"**New Total Amount: ₹{new_bill['total']:.2f}**")
+            
+            # Update button
+            if st.button("💾 Update Order", type="primary", key="edit_update"):
+                if new_customer_name and new_order_date:
+                    updated_order_data = {
+                        'customer_name': new_customer_name,
+                        'mobile_number': new_mobile_number,
+                        'order_date': new_order_date.strftime('%Y-%m-%d'),
+                        'regular_clothes_kg': new_regular_kg,
+                        'blankets_kg': new_blankets_kg,
+                        'white_clothes_pieces': new_white_pieces,
+                        'total_amount': new_bill['total'],
+                        'price_list_id': new_bill['price_list_id']
+                    }
+                    
+                    if update_order(order_id, updated_order_data, new_bill['items']):
+                        st.success("✅ Order updated successfully!")
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to update order!")
+                else:
+                    st.error("❌ Please fill in customer name and order date!")
+
+def delete_order_section():
+    """Section for deleting orders"""
+    st.subheader("🗑️ Delete Order")
+    
+    order_id = find_order_id("delete_lookup")
+    
+    if order_id:
+        # Get order details for confirmation
+        order_data = get_order_by_id(order_id)
+        
+        if order_data:
+            st.write("**Order to Delete:**")
+            st.write(f"**ID:** {order_data[0]}")
+            st.write(f"**Customer Name:** {order_data[1]}")
+            st.write(f"**Mobile Number:** {order_data[2]}")
+            st.write(f"**Order Date:** {order_data[3]}")
+            st.write(f"**Total Amount:** ₹{order_data[7]:.2f}")
+            
+            st.warning("⚠️ This action cannot be undone!")
+            
+            # Confirmation
+            confirm_delete = st.checkbox("I confirm that I want to delete this order", key="delete_confirm")
+            
+            if confirm_delete:
+                if st.button("🗑️ Delete Order", type="primary", key="delete_button"):
+                    if delete_order(order_id):
+                        st.success("✅ Order deleted successfully!")
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to delete order!")
+
+def order_collection_section():
+    """Section for marking orders as collected"""
+    st.subheader("📦 Order Collection")
+    
+    # Receipt number input
+    receipt_number = st.text_input("Enter Receipt Number:", 
+                                  placeholder="e.g., 123, A-51, 055",
+                                  key="collection_receipt")
+    
+    if receipt_number:
+        # Find order by receipt number (unique index)
+        order = get_order_by_receipt(receipt_number.strip())
+        
+        if order:
+            st.markdown("**Order Found:**")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Customer:** {order['customer_name']}")
+                st.write(f"**Mobile:** {order['mobile_number']}")
+                st.write(f"**Date:** {order['order_date']}")
+            
+            with col2:
+                st.write(f"**Receipt:** {order['receipt_number']}")
+                st.write(f"**Total:** ₹{order['total_amount']:.2f}")
+                st.write(f"**Collection Date:** {order['collection_date'] or 'Not collected yet'}")
+            
+            if st.button("✅ Mark as Collected", type="primary", key="collect_button"):
+                if mark_order_collected(order['id']):
+                    st.success("✅ Order marked as collected!")
+                    st.info("📱 SMS notification sent to customer!")
+                    st.rerun()
+                else:
+                    st.error("❌ Failed to mark order as collected!")
+        else:
+            st.warning("⚠️ No order found with this receipt number!")
+    
+    # Show all orders, a page at a time
+    st.markdown("**📋 All Orders:**")
+    order_table("collection", {}, ['receipt_number', 'customer_name', 'mobile_number', 'order_date',
+                                   'total_amount', 'collection_date'])
+
+def mark_order_collected(order_id):
+    """Mark order as collected in database"""
+    try:
+        conn = get_connection(DB_CONFIG)
+        cursor = conn.cursor()
+        
+        # Update collection date
+        cursor.execute('''
+            UPDATE orders 
+            SET collection_date = NOW()
+            WHERE id = %s
+        ''', (order_id,))
+        bump_data_version(cursor)
+        
+        # Get order details for SMS
+        cursor.execute('''
+            SELECT customer_name, mobile_number, receipt_number, total_amount
+            FROM orders WHERE id = %s
+        ''', (order_id,))
+        
+        order_details = cursor.fetchone()
+        conn.commit()
+        conn.close()
+        
+        if order_details:
+            customer_name, mobile_number, receipt_number, total_amount = order_details
+            
+            # Send SMS notification
+            if mobile_number:
+                sms_message = f"Hi {customer_name}, your laundry order #{receipt_number} has been collected. Thank you for using Express Wash!"
+                send_sms(mobile_number, sms_message)
+        
+        return True
+    except Exception as e:
+        st.error(f"Error marking order as collected: {str(e)}")
+        return False
+
+def send_sms(phone_number, message):
+    """Send SMS using Fast2SMS API"""
+    try:
+        import requests
+        
+        payload = {
+            "sender_id": "FSTSMS",
+            "message": message,
+            "language": "english",
+            "route": "v3",
+            "numbers": phone_number
+        }
+        headers = {
+            'authorization': "XerDBCLIaGm0dR2AHO6phqNcunktPogVvF9w1jWxfK38EUQyJMNDId3H9pbPKGuxohtUQjMrBAizl1L7",
+            'Content-Type': "application/json"
+        }
+        response = requests.post("https://www.fast2sms.com/dev/bulkV2", json=payload, headers=headers)
+        result = response.json()
+        
+        return result.get('return') == True
+    except Exception as e:
+        print(f"SMS error: {str(e)}")
+        return False
+
+def add_new_order_section():
+    """Section for adding new orders from the history page"""
+    st.subheader("➕ Add New Order")
+    
+    # Customer Information
+    st.write("**Customer Information:**")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        customer_name = st.text_input("Customer Name *", placeholder="Enter customer name", key="add_name")
+        mobile_number = st.text_input("Mobile Number", placeholder="Enter mobile number", key="add_mobile")
+    
+    with col2:
+        order_date = st.date_input("Order Date *", value=date.today(), key="add_date")
+        receipt_number = st.text_input("Receipt Number *", placeholder="Enter receipt number", key="add_receipt")
+    
+    # Service Details
+    st.write("**Service Details:**")
+    price_list = get_pricing_engine().for_date(order_date)
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown(f"**Regular Clothes** - {format_rate(price_list, 'regular_clothes')}")
+        regular_kg = st.number_input("Weight (kg)", min_value=0.0, value=0.0, step=0.5, key="add_regular")
+    
+    with col2:
+        st.markdown(f"**Blankets/Bedsheets** - {format_rate(price_list, 'blankets')}")
+        blankets_kg = st.number_input("Weight (kg)", min_value=0.0, value=0.0, step=0.5, key="add_blankets")
+    
+    with col3:
+        st.markdown(f"**White Clothes** - {format_rate(price_list, 'white_clothes')}")
+        white_pieces = st.number_input("Number of pieces", min_value=0, value=0, key="add_white")
+    
+    extra = other_service_inputs(price_list, "add")
+    
+    # Calculate bill
+    if regular_kg > 0 or blankets_kg > 0 or white_pieces > 0 or any(extra.values()):
+        bill = calculate_bill(regular_kg, blankets_kg, white_pieces, order_date, extra)
+        
+        st.markdown(f"**Total Amount: ₹{bill['total']:.2f}**")
+        
+        # Save order button
+        if st.button("💾 Save New Order", type="primary", key="add_save"):
+            if customer_name and order_date and receipt_number:
+                # Prepare order data
+                order_data = {
+                    'customer_name': customer_name,
+                    'mobile_number': mobile_number,
+                    'order_date': order_date.strftime('%Y-%m-%d'),
+                    'regular_clothes_kg': regular_kg,
+                    'blankets_kg': blankets_kg,
+                    'white_clothes_pieces': white_pieces,
+                    'total_amount': bill['total'],
+                    'receipt_number': receipt_number,
+                    'price_list_id': bill['price_list_id']
+                }
+                
+                # Save to both CSV and database
+                save_order_to_csv(order_data)
+                save_order_to_db(order_data, bill['items'])
+                
+                st.success("✅ New order saved successfully!")
+                st.rerun()
+            else:
+                st.error("❌ Please fill in customer name, order date, and receipt number!")
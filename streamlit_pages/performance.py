@@ -0,0 +1,69 @@
+"""
+Performance Page for the Express Wash Streamlit App
+Latency histograms per call site (queries and pages) and the slow-query log.
+"""
+
+import streamlit as st
+import pandas as pd
+
+from instrumentation import REGISTRY, snapshot, slow_queries, render_metrics, SLOW_QUERY_MS
+
+def performance_page():
+    """Page for query and page latency statistics"""
+    st.markdown("### ⚙️ Performance")
+    st.caption("Statistics for this server process. Database calls are timed per call site, "
+               f"pages per run; queries slower than {SLOW_QUERY_MS} ms are logged with their EXPLAIN plan.")
+    
+    stats = pd.DataFrame(snapshot())
+    if stats.empty:
+        st.info("📭 Nothing recorded yet. Use the other pages and come back here.")
+    else:
+        st.dataframe(
+            stats[['kind', 'site', 'count', 'errors', 'avg_ms', 'p50_ms', 'p95_ms', 'max_ms', 'rows']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'kind': "Kind",
+                'site': "Call site",
+                'count': st.column_config.NumberColumn("Count", format="%d"),
+                'errors': st.column_config.NumberColumn("Errors", format="%d"),
+                'avg_ms': st.column_config.NumberColumn("Avg (ms)", format="%.1f"),
+                'p50_ms': st.column_config.NumberColumn("p50 (ms)", format="%.1f"),
+                'p95_ms': st.column_config.NumberColumn("p95 (ms)", format="%.1f"),
+                'max_ms': st.column_config.NumberColumn("Max (ms)", format="%.1f"),
+                'rows': st.column_config.NumberColumn("Rows", format="%d")
+            }
+        )
+    
+    entries = slow_queries()
+    with st.expander(f"🐢 Slow Queries ({len(entries)})"):
+        if not entries:
+            st.write("No slow queries recorded.")
+        for entry in reversed(entries):
+            st.markdown(f"**{entry['ms']:.0f} ms** · `{entry['site']}` · {entry['time']}")
+            st.code(entry['sql'], language='sql')
+            if entry['params']:
+                st.caption(f"Parameters: {entry['params']}")
+            if isinstance(entry['explain'], list):
+                st.dataframe(pd.DataFrame(entry['explain']), use_container_width=True, hide_index=True)
+            elif entry['explain']:
+                st.caption(entry['explain'])
+            else:
+                st.caption("EXPLAIN pending...")
+    
+    metrics = render_metrics()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download metrics",
+            data=metrics,
+            file_name="express_wash_metrics.txt",
+            mime="text/plain"
+        )
+    with col2:
+        if st.button("🔄 Reset statistics"):
+            REGISTRY.reset()
+            st.rerun()
+    
+    with st.expander("📄 Metrics text"):
+        st.code(metrics, language='text')
@@ -0,0 +1,216 @@
+"""
+Pricing Page for the Express Wash Streamlit App
+Current rates and the what-if pricing simulator.
+"""
+
+import streamlit as st
+import mysql.connector
+import pandas as pd
+import plotly.express as px
+
+from pricing import SERVICES, SERVICE_LABELS, SERVICE_UNITS, format_rate
+from pricing_simulator import OrderHistory, simulate
+from .common import DB_CONFIG, get_pricing_engine
+
+# Longer names and descriptions of the first services; others show their catalogue label
+SERVICE_DESCRIPTIONS = {
+    'regular_clothes': ('Regular Clothes', 'Daily wear clothes, shirts, pants, etc.'),
+    'blankets': ('Blankets / Bedsheets / Rugs / Duvets', 'Heavy items requiring special care'),
+    'white_clothes': ('White Clothes', 'White clothes that need special treatment')
+}
+
+@st.cache_resource(ttl=300)
+def load_order_history():
+    """Load per-month, per-customer order sums for the pricing simulator"""
+    return OrderHistory.from_db(DB_CONFIG)
+
+def pricing_simulator_section(price_list):
+    """What-if simulator: re-price the order history with proposed rates"""
+    st.markdown("### 🔮 What-if Pricing Simulator")
+    if not st.checkbox("Simulate a rate change on past orders", key="sim_enabled"):
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    proposed_rates = {}
+    for col, service in zip((col1, col2, col3), SERVICES):
+        with col:
+            proposed_rates[service] = st.number_input(
+                f"{SERVICE_LABELS[service]} (₹/{SERVICE_UNITS[service]})",
+                min_value=0.0, value=float(price_list.rates[service]), step=1.0, key=f"sim_{service}")
+    
+    try:
+        history = load_order_history()
+    except mysql.connector.Error as err:
+        st.error(f"❌ Database error: {err}")
+        return
+    
+    if len(history) == 0:
+        st.info("📝 No orders yet to simulate against.")
+        return
+    
+    result = simulate(history, proposed_rates, top_customers=10)
+    change = result.proposed_revenue - result.current_revenue
+    change_pct = change / result.current_revenue * 100 if result.current_revenue else 0
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Current Revenue", f"₹{result.current_revenue:,.2f}")
+    with col2:
+        st.metric("Proposed Revenue", f"₹{result.proposed_revenue:,.2f}")
+    with col3:
+        st.metric("Change", f"₹{change:,.2f}", f"{change_pct:+.1f}%")
+    
+    fig_months = px.bar(result.by_month, x='month', y='delta',
+                        title=f'Revenue Change by Month ({result.orders:,} orders re-priced)',
+                        labels={'month': 'Month', 'delta': 'Change (₹)'})
+    fig_months.update_layout(height=350)
+    st.plotly_chart(fig_months, use_container_width=True)
+    
+    st.write("**Customers most affected:**")
+    st.dataframe(result.by_customer.rename(columns={
+        'customer': 'Mobile / Name',
+        'customer_name': 'Customer Name',
+        'orders': 'Orders',
+        'current_revenue': 'Current (₹)',
+        'proposed_revenue': 'Proposed (₹)',
+        'delta': 'Change (₹)'
+    }), use_container_width=True)
+
+def pricing_page():
+    """Page for pricing information"""
+    st.markdown('<h2 class="sub-header">💰 Pricing Information</h2>', unsafe_allow_html=True)
+    
+    st.markdown("""
+    ### 🧺 Express Wash Services & Pricing
+    
+    All services include **washing and folding** only.
+    """)
+    
+    # Pricing table (current price list, every service on sale)
+    engine = get_pricing_engine()
+    price_list = engine.current()
+    services = [service for service in engine.services if service.active]
+    pricing_data = {
+        'Service Category': [
+            f"{SERVICE_DESCRIPTIONS.get(service.code, (service.label,))[0]} (per {service.unit})"
+            for service in services
+        ],
+        'Rate': [format_rate(price_list, service.code, service.unit) for service in services],
+        'Description': [SERVICE_DESCRIPTIONS.get(service.code, ('', ''))[1] for service in services]
+    }
+    
+    pricing_df = pd.DataFrame(pricing_data)
+    st.dataframe(pricing_df, use_container_width=True)
+    
+    pricing_simulator_section(price_list)
+    
+    # Additional information
+    st.markdown("""
+    ### 📋 Additional Information
+    
+    - **Minimum Order:** No minimum order requirement
+    - **Turnaround Time:** 24-48 hours (depending on load)
+    - **Payment:** Cash on delivery
+    - **Quality Guarantee:** 100% satisfaction guaranteed
+    """)
+    
+    # Why Choose Express Wash section with better styling
+    st.markdown('<div class="form-section">', unsafe_allow_html=True)
+    st.markdown("### 🎯 Why Choose Express Wash?")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        **🏆 Professional Service**
+        - Experienced staff with years of expertise
+        - Modern equipment and quality detergents
+        - Attention to detail in every order
+        
+        **💰 Competitive Pricing**
+        - Transparent pricing with no hidden costs
+        - Bulk order discounts available
+        - Special rates for regular customers
+        
+        **⚡ Quick Turnaround**
+        - Same day service for urgent orders
+        - Regular orders completed in 24-48 hours
+        - Express service available
+        """)
+    
+    with col2:
+        st.markdown("""
+        **🧼 Quality Assurance**
+        - 100% satisfaction guarantee
+        - Quality check before delivery
+        - Free re-wash if not satisfied
+        
+        **🚚 Convenient Location**
+        - Located in Warje, Pune
+        - Easy access and parking
+        - Home pickup and delivery available
+        
+        **📞 Excellent Support**
+        - 24/7 customer support
+        - WhatsApp booking available
+        - Quick response to queries
+        """)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Payment Options section with better styling
+    st.markdown('<div class="form-section">', unsafe_allow_html=True)
+    st.markdown("### 💳 Payment Options")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+        **💰 Cash on Delivery**
+        - Pay when you collect your clothes
+        - No advance payment required
+        - Most popular option
+        """)
+    
+    with col2:
+        st.markdown("""
+        **📱 UPI Payment**
+        - Quick and secure digital payment
+        - Multiple UPI apps supported
+        - Instant payment confirmation
+        """)
+    
+    with col3:
+        st.markdown("""
+        **🏦 Bank Transfer**
+        - Direct bank transfer available
+        - Account details provided on request
+        - Receipt sent via WhatsApp
+        """)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Contact information
+    st.markdown('<div class="form-section">', unsafe_allow_html=True)
+    st.markdown("### 📞 Contact Information")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        **Express Wash**  
+        📱 Mobile: +91 7499902809  
+        📧 Email: expresswash@gmail.com  
+        📍 Address: Mai Nivas, Bhalekar Wasti, Warje Jakat Naka, Pune - 411058
+        """)
+    
+    with col2:
+        st.markdown("""
+        **🕒 Business Hours**  
+        Monday - Sunday: 8:00 AM - 8:00 PM  
+        
+        **🗺️ Location**  
+        18°29'02.3"N 73°48'43.1"E
+        """)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for Express Wash Laundry Billing System
+Generates large, reproducible order histories for load testing: repeat
+customers with a few regulars and many occasional ones, weekend and monsoon
+peaks, and collection delays that leave recent orders pending.
+
+The same --seed and --end always produce the same orders, whatever the number
+of workers, because every chunk of orders has its own random stream.
+
+    python synthetic_data.py --orders 1000000 --years 3 --mysql
+    python synthetic_data.py --orders 100000 --end 2025-12-31 --csv benchmarks/fixtures/orders_100k.csv
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from pricing import PricingEngine
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '16021995',
+    'database': 'express_wash'
+}
+
+ORDER_COLUMNS = [
+    'receipt_number', 'customer_name', 'mobile_number', 'order_date',
+    'regular_clothes_kg', 'blankets_kg', 'white_clothes_pieces', 'total_amount',
+    'price_list_id', 'collection_date', 'created_at'
+]
+
+CHUNK_SIZE = 100_000
+
+FIRST_NAMES = [
+    "Rahul", "Priya", "Amit", "Neha", "Rajesh", "Sita", "Mohan", "Anjali", "Vikram", "Pooja",
+    "Sanjay", "Kavita", "Deepak", "Sunita", "Arun", "Meera", "Suresh", "Lakshmi", "Ganesh", "Radha",
+    "Aditya", "Sneha", "Rohan", "Swati", "Nikhil", "Aarti", "Vivek", "Shruti", "Manoj", "Rekha",
+    "Kiran", "Asha", "Prakash", "Nisha", "Ajay", "Divya", "Sachin", "Madhuri", "Anil", "Jyoti"
+]
+
+LAST_NAMES = [
+    "Sharma", "Patel", "Kumar", "Singh", "Verma", "Devi", "Das", "Gupta", "Malhotra", "Reddy",
+    "Joshi", "Iyer", "Mehta", "Rao", "Khanna", "Nair", "Menon", "Pillai", "Krishnan", "Venkat",
+    "Kulkarni", "Deshpande", "Patil", "Jadhav", "Pawar", "Bhosale", "Chavan", "Shinde", "More", "Gaikwad"
+]
+
+# Relative demand Monday..Sunday (weekends are the busiest days)
+WEEKDAY_WEIGHTS = np.array([1.0, 0.9, 0.9, 1.0, 1.1, 1.5, 1.3])
+
+
+class GeneratorSettings:
+    """Parameters shared by every chunk of a generation run"""
+
+    def __init__(self, orders, seed=42, end=None, years=3, customers=None,
+                 uncollected_ratio=0.03, receipt_prefix='S', price_lists=None):
+        self.orders = orders
+        self.seed = seed
+        self.end = end or date.today()
+        self.start = self.end - timedelta(days=int(round(365.25 * years)))
+        # Roughly a dozen visits per customer on average, heavily skewed to regulars
+        self.customers = customers or max(50, orders // 12)
+        self.uncollected_ratio = uncollected_ratio
+        self.receipt_prefix = receipt_prefix
+        self.receipt_width = max(6, len(str(orders)))
+        self.price_lists = price_lists
+
+
+def _day_weights(start, end):
+    """Order volume per day: weekday pattern, monsoon peak and steady growth"""
+    days = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    weekday = (days.astype('datetime64[D]').view('int64') - 4) % 7  # 1970-01-01 was a Thursday
+    month = days.astype('datetime64[M]').astype(int) % 12 + 1
+    growth = np.linspace(1.0, 1.5, len(days))
+    monsoon = np.where((month >= 6) & (month <= 9), 1.2, 1.0)
+    weights = WEEKDAY_WEIGHTS[weekday] * monsoon * growth
+    return days, weights / weights.sum()
+
+
+def _customer_pool(settings):
+    """Names, mobiles and visit weights of every customer (same for all chunks)"""
+    rng = np.random.default_rng([settings.seed, 0xC0FFEE])
+    count = settings.customers
+    index = np.arange(count)
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), count)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), count)]
+    names = first + ' ' + last
+
+    # Multiplying by an odd number not divisible by 5 permutes 0..4e9-1, so mobiles are unique
+    mobiles = (6_000_000_000 + (index.astype(np.int64) * 2_654_435_761) % 4_000_000_000).astype(str).astype(object)
+    walk_ins = rng.random(count) < 0.08
+    mobiles[walk_ins] = ''
+
+    # Skewed visit rates: weekly regulars next to customers who came once or twice
+    popularity = rng.lognormal(0.0, 1.0, count)
+    return names, mobiles, popularity / popularity.sum()
+
+
+def generate_chunk(settings, chunk_index, chunk_size=CHUNK_SIZE, pool=None, calendar=None, engine=None):
+    """Generate one chunk of orders as a DataFrame with ORDER_COLUMNS"""
+    first_order = chunk_index * chunk_size
+    count = min(chunk_size, settings.orders - first_order)
+    if count <= 0:
+        return pd.DataFrame(columns=ORDER_COLUMNS)
+
+    rng = np.random.default_rng([settings.seed, chunk_index])
+    names, mobiles, popularity = pool if pool is not None else _customer_pool(settings)
+    days, day_weights = calendar if calendar is not None else _day_weights(settings.start, settings.end)
+    engine = engine or PricingEngine(settings.price_lists)
+
+    customer = rng.choice(len(names), size=count, p=popularity)
+    order_date = rng.choice(days, size=count, p=day_weights)
+
+    # Quantities: most orders have regular clothes; blankets and whites are occasional
+    regular = np.round(rng.lognormal(np.log(3.0), 0.5, count) * 2) / 2
+    regular[rng.random(count) < 0.1] = 0
+    blankets = np.where(rng.random(count) < 0.3, np.round(rng.uniform(1, 6, count) * 2) / 2, 0.0)
+    white = np.where(rng.random(count) < 0.4, rng.poisson(5, count) + 1, 0)
+    empty = (regular == 0) & (blankets == 0) & (white == 0)
+    regular[empty] = 1.0
+
+    price_rows = engine.rows_for(order_date, count=count)
+    total = engine.total_paise(regular, blankets, white, order_dates=order_date) / 100
+    ids = np.array([p.id for p in engine.price_lists], dtype=object)[price_rows]
+
+    # Orders come in during business hours (8:00-20:00)
+    created_at = order_date.astype('datetime64[s]') + rng.integers(8 * 3600, 20 * 3600, count).astype('timedelta64[s]')
+
+    # Pick-up a day to a couple of weeks later; some orders are never collected
+    delay = ((1 + rng.gamma(2.0, 1.5, count)) * 86400).astype('int64').astype('timedelta64[s]')
+    collection = created_at + delay
+    now = np.datetime64(settings.end) + np.timedelta64(1, 'D')
+    pending = (collection >= now) | (rng.random(count) < settings.uncollected_ratio)
+    collection = pd.Series(collection).where(~pending)
+
+    receipts = pd.Series(np.arange(first_order + 1, first_order + count + 1)).astype(str).str.zfill(settings.receipt_width)
+
+    return pd.DataFrame({
+        'receipt_number': settings.receipt_prefix + receipts,
+        'customer_name': names[customer],
+        'mobile_number': mobiles[customer],
+        'order_date': order_date.astype('datetime64[D]'),
+        'regular_clothes_kg': regular,
+        'blankets_kg': blankets,
+        'white_clothes_pieces': white,
+        'total_amount': total,
+        'price_list_id': ids,
+        'collection_date': collection,
+        'created_at': created_at
+    }, columns=ORDER_COLUMNS)
+
+
+# --- Worker processes ---
+
+_worker_state = {}
+
+
+def _init_worker(settings, chunk_size, db_config):
+    _worker_state['settings'] = settings
+    _worker_state['chunk_size'] = chunk_size
+    _worker_state['db_config'] = db_config
+    _worker_state['pool'] = _customer_pool(settings)
+    _worker_state['calendar'] = _day_weights(settings.start, settings.end)
+    _worker_state['engine'] = PricingEngine(settings.price_lists)
+
+
+def _worker_generate(chunk_index):
+    return generate_chunk(_worker_state['settings'], chunk_index, _worker_state['chunk_size'],
+                          _worker_state['pool'], _worker_state['calendar'], _worker_state['engine'])
+
+
+def _worker_load(chunk_index):
+    df = _worker_generate(chunk_index)
+    load_into_mysql(df, _worker_state['db_config'])
+    return len(df)
+
+
+def _worker_load_and_return(chunk_index):
+    df = _worker_generate(chunk_index)
+    load_into_mysql(df, _worker_state['db_config'])
+    return df
+
+
+# --- Writers ---
+
+def _csv_frame(df):
+    """Write DATE columns without a time part"""
+    return df.assign(order_date=df['order_date'].to_numpy().astype('datetime64[D]').astype(str))
+
+
+def load_into_mysql(df, db_config):
+    """Bulk load a chunk with LOAD DATA LOCAL INFILE (batched INSERT if the server refuses it)"""
+    import mysql.connector
+
+    conn = mysql.connector.connect(allow_local_infile=True, **db_config)
+    try:
+        cursor = conn.cursor()
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            _csv_frame(df).to_csv(path, index=False, header=False, na_rep='\\N', date_format='%Y-%m-%d %H:%M:%S')
+            # IGNORE skips receipts that already exist, so a repeated run is harmless
+            cursor.execute(f'''
+                LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE orders
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                ({', '.join(ORDER_COLUMNS)})
+            ''', (path.replace('\\', '/'),))
+        except mysql.connector.Error:
+            conn.rollback()
+            _insert_batches(cursor, df)
+        finally:
+            os.remove(path)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _insert_batches(cursor, df, batch_size=5000):
+    statement = (f"INSERT IGNORE INTO orders ({', '.join(ORDER_COLUMNS)}) "
+                 f"VALUES ({', '.join(['%s'] * len(ORDER_COLUMNS))})")
+    records = df.astype(object).where(df.notna(), None)
+    for start in range(0, len(records), batch_size):
+        rows = [
+            tuple(value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for value in row)
+            for row in records.iloc[start:start + batch_size].itertuples(index=False, name=None)
+        ]
+        cursor.executemany(statement, rows)
+
+
+class FixtureWriter:
+    """Streams chunks to CSV and/or Parquet files"""
+
+    def __init__(self, csv_path=None, parquet_path=None):
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self._csv_header = True
+        self._parquet = None
+        for path in (csv_path, parquet_path):
+            if path and os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def write(self, df):
+        if self.csv_path:
+            _csv_frame(df).to_csv(self.csv_path, index=False, header=self._csv_header,
+                      mode='w' if self._csv_header else 'a', date_format='%Y-%m-%d %H:%M:%S')
+            self._csv_header = False
+        if self.parquet_path:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise SystemExit("❌ Parquet output needs pyarrow: pip install pyarrow")
+            table = pa.Table.from_pandas(df.astype({'price_list_id': 'float64'}), preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.parquet_path, table.schema)
+            self._parquet.write_table(table)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def load_fixture(path):
+    """Read a CSV or Parquet fixture back into a DataFrame with proper dtypes"""
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, dtype={'receipt_number': str, 'mobile_number': str},
+                         parse_dates=['order_date', 'collection_date', 'created_at'], keep_default_na=False,
+                         na_values={'collection_date': [''], 'price_list_id': ['']})
+    df['mobile_number'] = df['mobile_number'].fillna('')
+    return df
+
+
+def generate(settings, workers=None, chunk_size=CHUNK_SIZE, db_config=None, writer=None, progress=True):
+    """Generate every chunk in worker processes, loading into MySQL and/or writing fixtures"""
+    chunks = (settings.orders + chunk_size - 1) // chunk_size
+    workers = max(1, min(workers or os.cpu_count() or 1, chunks))
+    task = _worker_generate
+    if db_config:
+        task = _worker_load_and_return if writer else _worker_load
+
+    done = 0
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(settings, chunk_size, db_config)) as pool:
+        # imap keeps chunk order, so fixture files are identical for any worker count
+        for result in pool.imap(task, range(chunks)):
+            if writer is not None:
+                writer.write(result)
+            done += result if isinstance(result, int) else len(result)
+            if progress:
+                rate = done / max(time.perf_counter() - start, 1e-9)
+                print(f"\r⏳ {done:,}/{settings.orders:,} orders ({rate:,.0f}/s)", end='', flush=True)
+    if progress:
+        print()
+    if db_config:
+        link_loaded_orders(db_config)
+    return done
+
+
+def link_loaded_orders(db_config):
+    """Create the customers and service items of freshly loaded orders and set their customer_id"""
+    import mysql.connector
+    from customers import backfill_customers
+    from data_version import bump_data_version
+    from service_catalog import backfill_order_items
+
+    conn = mysql.connector.connect(**db_config)
+    try:
+        cursor = conn.cursor()
+        backfill_customers(cursor)
+        backfill_order_items(cursor)
+        bump_data_version(cursor)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Express Wash synthetic order generator")
+    parser.add_argument('--orders', type=int, default=100_000, help="number of orders (default: 100,000)")
+    parser.add_argument('--years', type=float, default=3, help="years of history ending at --end (default: 3)")
+    parser.add_argument('--end', type=date.fromisoformat, default=date.today(),
+                        help="last order date, YYYY-MM-DD (default: today; set it for reproducible output)")
+    parser.add_argument('--seed', type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument('--customers', type=int, help="number of distinct customers (default: orders / 12)")
+    parser.add_argument('--uncollected-ratio', type=float, default=0.03,
+                        help="share of orders never picked up (default: 0.03)")
+    parser.add_argument('--receipt-prefix', default='S', help="prefix of generated receipt numbers (default: S)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="orders per chunk")
+    parser.add_argument('--mysql', action='store_true', help="bulk load the orders into the MySQL database")
+    parser.add_argument('--csv', metavar='PATH', help="write the orders to a CSV fixture")
+    parser.add_argument('--parquet', metavar='PATH', help="write the orders to a Parquet fixture (needs pyarrow)")
+    args = parser.parse_args()
+
+    if not (args.mysql or args.csv or args.parquet):
+        parser.error("choose at least one output: --mysql, --csv or --parquet")
+
+    price_lists = None
+    if args.mysql:
+        # Price orders with the stored price lists so price_list_id matches the database
+        import mysql.connector
+        from schema import ensure_schema
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        ensure_schema(cursor)
+        conn.commit()
+        price_lists = PricingEngine.from_cursor(cursor).price_lists
+        conn.close()
+
+    settings = GeneratorSettings(args.orders, seed=args.seed, end=args.end, years=args.years,
+                                 customers=args.customers, uncollected_ratio=args.uncollected_ratio,
+                                 receipt_prefix=args.receipt_prefix, price_lists=price_lists)
+    writer = FixtureWriter(args.csv, args.parquet) if (args.csv or args.parquet) else None
+
+    start = time.perf_counter()
+    try:
+        total = generate(settings, args.workers, args.chunk_size, DB_CONFIG if args.mysql else None, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Generated {total:,} orders for {settings.customers:,} customers in {elapsed:.1f}s")
+    print(f"📅 Date range: {settings.start.strftime('%B %d, %Y')} to {settings.end.strftime('%B %d, %Y')}")
+    for path in (args.csv, args.parquet):
+        if path:
+            print(f"📄 {path}")
+
+
+if __name__ == "__main__":
+    main()
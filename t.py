@@ -5,6 +5,7 @@ This version uses ttkbootstrap for a modern and clean user interface.
 All core logic from the original tkinter_app.py is preserved.
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk, filedialog
 import ttkbootstrap as ttk
@@ -14,18 +15,37 @@ from ttkbootstrap.scrolled import ScrolledText
 from ttkbootstrap.widgets import DateEntry
 
 import mysql.connector
-import pandas as pd
 from datetime import datetime, date
 import os
 import webbrowser
 import shutil
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# Set a consistent style for matplotlib charts
-plt.style.use('seaborn-v0_8-whitegrid')
-# Set a default font size for better readability in charts
-plt.rcParams.update({'font.size': 10})
+from db import get_connection, warm_pool
+from instrumentation import install_tk_instrumentation, start_metrics_server_from_env
+from tk_watchdog import StallWatchdog
+from invoice_store import InvoiceStore
+from order_archive import orders_source
+from pricing import SERVICES, PricingEngine
+from customer_autocomplete import CustomerAutocomplete
+from customer_index import CustomerIndex
+from customers import find_or_create_customer
+from data_version import bump_data_version
+from schema import ensure_schema
+from service_catalog import delete_order_items, load_order_items, save_order_items
+
+_pyplot = None
+
+
+def get_pyplot():
+    """Import matplotlib on first use; only the reports window draws charts."""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+        # Set a consistent style for matplotlib charts
+        plt.style.use('seaborn-v0_8-whitegrid')
+        # Set a default font size for better readability in charts
+        plt.rcParams.update({'font.size': 10})
+        _pyplot = plt
+    return _pyplot
 
 
 class ExpressWashAppModern:
@@ -34,6 +54,13 @@ class ExpressWashAppModern:
         self.root.title("🧺 Express Wash - Smart Laundry Billing System")
         self.root.geometry("1400x850") # Adjusted size for better fit
         
+        # Time every button command, event binding and after() callback
+        install_tk_instrumentation()
+        start_metrics_server_from_env()
+        
+        # Record every time the window freezes, with the code that was running
+        self.watchdog = StallWatchdog.from_env(self.root)
+        
         # --- Configuration ---
         self.DB_CONFIG = {
             'host': 'localhost',
@@ -42,46 +69,51 @@ class ExpressWashAppModern:
             'database': 'express_wash'
         }
         
-        self.PRICING = {
-            'regular_clothes': 50,  # ₹50/kg
-            'blankets': 100,        # ₹100/kg
-            'white_clothes': 40     # ₹40/piece
-        }
+        # Generated invoices are kept in date-sharded folders under invoices/
+        self.invoice_store = InvoiceStore()
+        
+        # Returning customers for the name/mobile suggestions (loaded once the database is ready)
+        self.customer_index = CustomerIndex(self.DB_CONFIG)
         
         # --- Initialization ---
-        self.init_database()
+        self.init_database()  # connects in the background while the window is built
         self.create_widgets()
+        self.root.after(50, self.poll_database_ready)
         
     def init_database(self):
-        """Initialize MySQL database connection and schema."""
-        try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    receipt_number VARCHAR(32) UNIQUE,
-                    customer_name VARCHAR(255) NOT NULL,
-                    mobile_number VARCHAR(20),
-                    order_date DATE NOT NULL,
-                    regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
-                    blankets_kg DECIMAL(5,2) DEFAULT 0,
-                    white_clothes_pieces INT DEFAULT 0,
-                    total_amount DECIMAL(10,2) NOT NULL,
-                    collection_date DATETIME NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        """Start connecting, checking the schema and loading price lists in the background."""
+        self._pricing = None
+        self.database_ready = warm_pool(self.DB_CONFIG, setup=self.prepare_database)
+
+    @staticmethod
+    def prepare_database(cursor):
+        """Create/upgrade the schema and load the price lists."""
+        ensure_schema(cursor)  # orders + price_lists, upgrading older databases
+        return PricingEngine.from_cursor(cursor)
+
+    @property
+    def pricing(self):
+        """Price lists (waits for the background database setup if still running)."""
+        return self._pricing or self.finish_database_init()
+
+    def finish_database_init(self):
+        """Apply the result of the background database setup."""
+        if self._pricing is None:
             try:
-                # Ensure collection_date column exists
-                cursor.execute('ALTER TABLE orders ADD COLUMN collection_date DATETIME NULL')
-            except mysql.connector.Error:
-                pass  # Column already exists
-            conn.commit()
-            conn.close()
-        except mysql.connector.Error as err:
-            Messagebox.show_error(f"Database Connection Failed:\n{err}\nPlease check your database credentials in DB_CONFIG.", "Database Error")
-            self.root.quit()
+                self._pricing = self.database_ready.result()
+                self.customer_index.refresh_async()
+            except Exception as err:
+                self._pricing = PricingEngine()
+                Messagebox.show_error(f"Database Connection Failed:\n{err}\nPlease check your database credentials in DB_CONFIG.", "Database Error")
+                self.root.quit()
+        return self._pricing
+
+    def poll_database_ready(self):
+        """Finish startup once the background database setup is done."""
+        if self.database_ready.done():
+            self.finish_database_init()
+        else:
+            self.root.after(50, self.poll_database_ready)
 
     def create_widgets(self):
         """Create the main GUI layout and widgets."""
@@ -131,6 +163,10 @@ class ExpressWashAppModern:
         self.mobile_entry = ttk.Entry(customer_frame, textvariable=self.mobile_var)
         self.mobile_entry.grid(row=0, column=3, sticky=EW, padx=5, pady=5)
 
+        # Suggest returning customers while the name or mobile number is typed
+        self.customer_autocomplete = CustomerAutocomplete(
+            self.customer_index, [self.customer_name_entry, self.mobile_entry], self.fill_customer)
+
         ttk.Label(customer_frame, text="Order Date:", font=('Helvetica', 10, 'bold')).grid(row=1, column=2, sticky=W, padx=15, pady=5)
         self.order_date_entry = DateEntry(customer_frame, bootstyle="primary", dateformat="%Y-%m-%d")
         self.order_date_entry.grid(row=1, column=3, sticky=EW, padx=5, pady=5)
@@ -275,21 +311,20 @@ class ExpressWashAppModern:
             blankets_kg = float(self.blankets_var.get() or 0)
             white_pieces = int(self.white_clothes_var.get() or 0)
 
-            regular_cost = regular_kg * self.PRICING['regular_clothes']
-            blankets_cost = blankets_kg * self.PRICING['blankets']
-            white_cost = white_pieces * self.PRICING['white_clothes']
-            total = regular_cost + blankets_cost + white_cost
+            bill = self.pricing.price(regular_kg, blankets_kg, white_pieces, on_date=self.order_date_entry.entry.get().strip())
+            rates = bill['rates']
+            regular_cost, blankets_cost, white_cost, total = bill['regular_cost'], bill['blankets_cost'], bill['white_cost'], bill['total']
             
             self.bill_text.text.config(state='normal')
             self.bill_text.delete(1.0, tk.END)
             
             lines = ["🧺 Express Wash - Bill Summary\n\n"]
             if regular_kg > 0:
-                lines.append(f"{'Regular Clothes:':<25} {regular_kg:>5.2f}kg x ₹{self.PRICING['regular_clothes']:<5.2f} = ₹{regular_cost:>8.2f}")
+                lines.append(f"{'Regular Clothes:':<25} {regular_kg:>5.2f}kg x ₹{rates['regular_clothes']:<5.2f} = ₹{regular_cost:>8.2f}")
             if blankets_kg > 0:
-                lines.append(f"{'Blankets/Bedsheets:':<25} {blankets_kg:>5.2f}kg x ₹{self.PRICING['blankets']:<5.2f} = ₹{blankets_cost:>8.2f}")
+                lines.append(f"{'Blankets/Bedsheets:':<25} {blankets_kg:>5.2f}kg x ₹{rates['blankets']:<5.2f} = ₹{blankets_cost:>8.2f}")
             if white_pieces > 0:
-                lines.append(f"{'White Clothes:':<25} {white_pieces:>5} pcs x ₹{self.PRICING['white_clothes']:<5.2f} = ₹{white_cost:>8.2f}")
+                lines.append(f"{'White Clothes:':<25} {white_pieces:>5} pcs x ₹{rates['white_clothes']:<5.2f} = ₹{white_cost:>8.2f}")
             
             lines.append("\n" + "─" * 50)
             lines.append(f"{'💵 TOTAL AMOUNT:':<40} ₹{total:>8.2f}")
@@ -316,21 +351,25 @@ class ExpressWashAppModern:
             regular_kg = float(self.regular_clothes_var.get() or 0)
             blankets_kg = float(self.blankets_var.get() or 0)
             white_pieces = int(self.white_clothes_var.get() or 0)
-            total = (regular_kg * self.PRICING['regular_clothes'] + 
-                     blankets_kg * self.PRICING['blankets'] + 
-                     white_pieces * self.PRICING['white_clothes'])
+            bill = self.pricing.price(regular_kg, blankets_kg, white_pieces, on_date=order_date)
+            total = bill['total']
 
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
+            mobile_number = self.mobile_var.get().strip()
+            customer_id = find_or_create_customer(cursor, customer_name, mobile_number)
             cursor.execute('''
-                INSERT INTO orders (receipt_number, customer_name, mobile_number, order_date, 
-                                   regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (receipt_number, customer_name, self.mobile_var.get().strip(), order_date, 
-                  regular_kg, blankets_kg, white_pieces, total))
+                INSERT INTO orders (receipt_number, customer_id, customer_name, mobile_number, order_date, 
+                                   regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, price_list_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ''', (receipt_number, customer_id, customer_name, mobile_number, order_date, 
+                  regular_kg, blankets_kg, white_pieces, total, bill['price_list_id']))
+            save_order_items(cursor, cursor.lastrowid, order_date, bill['items'])
+            bump_data_version(cursor)
             conn.commit()
             conn.close()
             Messagebox.show_info(f"Order saved successfully!\nReceipt Number: {receipt_number}", "Success")
+            self.customer_index.refresh_async()
             self.clear_form()
             # If order window is open, refresh it
             if hasattr(self, 'order_window') and self.order_window.winfo_exists():
@@ -342,6 +381,12 @@ class ExpressWashAppModern:
         except Exception as e:
             Messagebox.show_error(f"An unexpected error occurred: {e}", "Error")
 
+    def fill_customer(self, customer):
+        """Fill in a returning customer chosen from the suggestions."""
+        self.customer_name_var.set(customer['name'])
+        self.mobile_var.set(customer['mobile_number'])
+        self.regular_clothes_entry.focus_set()
+
     def clear_form(self):
         """Clear all entry fields in the new order form."""
         self.receipt_number_var.set("")
@@ -365,7 +410,7 @@ class ExpressWashAppModern:
             self.tree.delete(item)
         
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, receipt_number, customer_name, mobile_number, order_date, 
@@ -400,17 +445,20 @@ class ExpressWashAppModern:
             self.tree.delete(item)
             
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
-            query = '''
+            # Also match customers whose names are spelled differently
+            customer_ids = [customer['id'] for customer in self.customer_index.fuzzy_search(search_term)]
+            customer_filter = f"OR customer_id IN ({', '.join(['%s'] * len(customer_ids))})" if customer_ids else ""
+            query = f'''
                 SELECT id, receipt_number, customer_name, mobile_number, order_date, 
                        collection_date, total_amount, created_at
                 FROM orders 
-                WHERE LOWER(receipt_number) LIKE %s OR LOWER(customer_name) LIKE %s
+                WHERE LOWER(receipt_number) LIKE %s OR LOWER(customer_name) LIKE %s {customer_filter}
                 ORDER BY created_at DESC
             '''
             like_term = f'%{search_term}%'
-            cursor.execute(query, (like_term, like_term))
+            cursor.execute(query, (like_term, like_term, *customer_ids))
             orders = cursor.fetchall()
             conn.close()
             
@@ -440,20 +488,25 @@ class ExpressWashAppModern:
         order_id = self.tree.item(selection[0], 'values')[0]
 
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM orders WHERE id = %s", (order_id,))
+            cursor.execute('''
+                SELECT id, receipt_number, customer_name, mobile_number, order_date, regular_clothes_kg,
+                       blankets_kg, white_clothes_pieces, total_amount, collection_date, created_at
+                FROM orders WHERE id = %s
+            ''', (order_id,))
             order_data = cursor.fetchone()
+            items = load_order_items(cursor, order_id)
             conn.close()
             
             if order_data:
-                self.create_edit_window(order_data)
+                self.create_edit_window(order_data, items)
             else:
                 Messagebox.show_error("Could not find the selected order in the database.", "Order Not Found")
         except Exception as e:
             Messagebox.show_error(f"Error fetching order data: {e}", "Database Error")
     
-    def create_edit_window(self, order_data):
+    def create_edit_window(self, order_data, items=()):
         """Create the modal window for editing an order."""
         edit_window = tk.Toplevel(self.root)
         edit_window.title("✏️ Edit Order")
@@ -497,11 +550,14 @@ class ExpressWashAppModern:
         white_pcs_var = tk.IntVar(value=white_pcs)
         ttk.Entry(form_frame, textvariable=white_pcs_var).grid(row=6, column=1, sticky=EW, padx=5, pady=8)
 
+        # This form has no entries for the other catalogue services; the order keeps them as they are
+        extra = {item.service.code: item.quantity for item in items if item.service.code not in SERVICES}
+
         def update_order_action():
             try:
-                new_total = (reg_kg_var.get() * self.PRICING['regular_clothes'] +
-                             blan_kg_var.get() * self.PRICING['blankets'] +
-                             white_pcs_var.get() * self.PRICING['white_clothes'])
+                bill = self.pricing.price(reg_kg_var.get(), blan_kg_var.get(), white_pcs_var.get(), on_date=date_var.get(),
+                                          extra=extra)
+                new_total = bill['total']
                 
                 confirm = Messagebox.ask_yes_no(
                     f"Confirm Update\n\nNew Total will be ₹{new_total:.2f}. Proceed?",
@@ -510,15 +566,19 @@ class ExpressWashAppModern:
                 if not confirm:
                     return
 
-                conn_update = mysql.connector.connect(**self.DB_CONFIG)
+                conn_update = get_connection(self.DB_CONFIG)
                 cursor_update = conn_update.cursor()
+                customer_id = find_or_create_customer(cursor_update, name_var.get(), mobile_var.get(), order_id)
                 cursor_update.execute('''
                     UPDATE orders SET 
-                    receipt_number = %s, customer_name = %s, mobile_number = %s, order_date = %s,
-                    regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s, total_amount = %s
+                    receipt_number = %s, customer_id = %s, customer_name = %s, mobile_number = %s, order_date = %s,
+                    regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s, total_amount = %s,
+                    price_list_id = %s
                     WHERE id = %s
-                ''', (receipt_var.get(), name_var.get(), mobile_var.get(), date_var.get(),
-                      reg_kg_var.get(), blan_kg_var.get(), white_pcs_var.get(), new_total, order_id))
+                ''', (receipt_var.get(), customer_id, name_var.get(), mobile_var.get(), date_var.get(),
+                      reg_kg_var.get(), blan_kg_var.get(), white_pcs_var.get(), new_total, bill['price_list_id'], order_id))
+                save_order_items(cursor_update, order_id, date_var.get(), bill['items'])
+                bump_data_version(cursor_update)
                 conn_update.commit()
                 conn_update.close()
                 
@@ -546,9 +606,11 @@ class ExpressWashAppModern:
 
         try:
             order_id = self.tree.item(selection[0], 'values')[0]
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             cursor.execute('DELETE FROM orders WHERE id = %s', (order_id,))
+            delete_order_items(cursor, order_id)
+            bump_data_version(cursor)
             conn.commit()
             conn.close()
             Messagebox.show_info("Order deleted successfully!", "Success")
@@ -559,10 +621,12 @@ class ExpressWashAppModern:
     def export_data(self):
         """Export all orders to a CSV file."""
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM orders')
-            if cursor.fetchone()[0] == 0:
+            # The export includes archived orders
+            source = orders_source(cursor)
+            cursor.execute(f'SELECT 1 FROM {source} LIMIT 1')
+            if cursor.fetchone() is None:
                 Messagebox.show_warning("There is no data to export.", "No Data")
                 conn.close()
                 return
@@ -573,9 +637,11 @@ class ExpressWashAppModern:
                 title="Save Orders As CSV"
             )
             if not filepath:
+                conn.close()
                 return
 
-            df = pd.read_sql_query('SELECT * FROM orders ORDER BY created_at DESC', conn)
+            import pandas as pd
+            df = pd.read_sql_query(f'SELECT * FROM {source} ORDER BY created_at DESC', conn)
             conn.close()
             
             df.to_csv(filepath, index=False)
@@ -591,7 +657,7 @@ class ExpressWashAppModern:
             return
 
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             cursor.execute('SELECT collection_date FROM orders WHERE receipt_number = %s', (receipt_number,))
             result = cursor.fetchone()
@@ -608,6 +674,7 @@ class ExpressWashAppModern:
             confirm = Messagebox.ask_yes_no(f"Mark order '{receipt_number}' as collected?", "Confirm Collection")
             if confirm:
                 cursor.execute('UPDATE orders SET collection_date = NOW() WHERE receipt_number = %s', (receipt_number,))
+                bump_data_version(cursor)
                 conn.commit()
                 Messagebox.show_info("Order marked as collected!", "Success")
                 self.collection_receipt_var.set("")
@@ -642,7 +709,7 @@ class ExpressWashAppModern:
 
         # Now, use the obtained receipt_number to get all data directly from the database.
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor(dictionary=True)  # Fetch as a dictionary for easy access
             cursor.execute("SELECT * FROM orders WHERE receipt_number = %s", (receipt_number,))
             order = cursor.fetchone()
@@ -659,10 +726,13 @@ class ExpressWashAppModern:
             Messagebox.show_warning("This order has not been collected yet. Cannot generate invoice.", "Order Not Collected")
             return
 
-        # Costs calculation
-        regular_cost = float(order['regular_clothes_kg']) * self.PRICING['regular_clothes']
-        blanket_cost = float(order['blankets_kg']) * self.PRICING['blankets']
-        white_cost = float(order['white_clothes_pieces']) * self.PRICING['white_clothes']
+        # Costs calculation with the rates the order was billed under
+        bill = self.pricing.price(order['regular_clothes_kg'], order['blankets_kg'], order['white_clothes_pieces'],
+                                  price_list=self.pricing.resolve(order.get('price_list_id'), order['order_date']))
+        rates = bill['rates']
+        regular_cost = bill['regular_cost']
+        blanket_cost = bill['blankets_cost']
+        white_cost = bill['white_cost']
 
         # HTML invoice template
         html_invoice = f"""
@@ -710,9 +780,9 @@ class ExpressWashAppModern:
                 </td>
             </tr>
             <tr class="heading"><td>Service</td><td style="text-align:center;">Quantity</td><td style="text-align:center;">Rate</td><td style="text-align:right;">Price</td></tr>
-            <tr class="item"><td>Regular Clothes</td><td style="text-align:center;">{order['regular_clothes_kg']} kg</td><td style="text-align:center;">₹{self.PRICING['regular_clothes']:.2f}</td><td style="text-align:right;">₹{regular_cost:.2f}</td></tr>
-            <tr class="item"><td>Blankets/Bedsheets</td><td style="text-align:center;">{order['blankets_kg']} kg</td><td style="text-align:center;">₹{self.PRICING['blankets']:.2f}</td><td style="text-align:right;">₹{blanket_cost:.2f}</td></tr>
-            <tr class="item"><td>White Clothes</td><td style="text-align:center;">{order['white_clothes_pieces']} pcs</td><td style="text-align:center;">₹{self.PRICING['white_clothes']:.2f}</td><td style="text-align:right;">₹{white_cost:.2f}</td></tr>
+            <tr class="item"><td>Regular Clothes</td><td style="text-align:center;">{order['regular_clothes_kg']} kg</td><td style="text-align:center;">₹{rates['regular_clothes']:.2f}</td><td style="text-align:right;">₹{regular_cost:.2f}</td></tr>
+            <tr class="item"><td>Blankets/Bedsheets</td><td style="text-align:center;">{order['blankets_kg']} kg</td><td style="text-align:center;">₹{rates['blankets']:.2f}</td><td style="text-align:right;">₹{blanket_cost:.2f}</td></tr>
+            <tr class="item"><td>White Clothes</td><td style="text-align:center;">{order['white_clothes_pieces']} pcs</td><td style="text-align:center;">₹{rates['white_clothes']:.2f}</td><td style="text-align:right;">₹{white_cost:.2f}</td></tr>
             <tr class="total"><td colspan="3"></td><td>Total: ₹{order['total_amount']:.2f}</td></tr>
         </table>
     </div>
@@ -720,9 +790,7 @@ class ExpressWashAppModern:
 </html>
 """
         # Save and open the invoice
-        invoice_filename = f"invoice_{order['receipt_number']}.html"
-        with open(invoice_filename, 'w', encoding='utf-8') as f:
-            f.write(html_invoice)
+        invoice_filename = self.invoice_store.save(order['receipt_number'], html_invoice, order['order_date'])
         
         webbrowser.open(f"file://{os.path.abspath(invoice_filename)}")
 
@@ -736,8 +804,11 @@ class ExpressWashAppModern:
         reports_window.grab_set()
 
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            df = pd.read_sql("SELECT * FROM orders", conn)
+            import pandas as pd
+            conn = get_connection(self.DB_CONFIG)
+            # Reports cover the archived orders too
+            source = orders_source(conn.cursor())
+            df = pd.read_sql(f"SELECT * FROM {source}", conn)
             conn.close()
             if not df.empty:
                 df['order_date'] = pd.to_datetime(df['order_date'])
@@ -757,20 +828,52 @@ class ExpressWashAppModern:
         # Tab 1: Revenue Over Time
         revenue_tab = ttk.Frame(notebook, padding=10)
         notebook.add(revenue_tab, text="💰 Revenue Trends")
-        self.create_revenue_trend_chart(revenue_tab, df)
 
         # Tab 2: Service Popularity
         service_tab = ttk.Frame(notebook, padding=10)
         notebook.add(service_tab, text="🧺 Service Popularity")
-        self.create_service_popularity_chart(service_tab, df)
         
         # Tab 3: Order Status
         status_tab = ttk.Frame(notebook, padding=10)
         notebook.add(status_tab, text="📋 Order Status")
-        self.create_order_status_chart(status_tab, df)
+
+        # Tab 4: Performance (live latency of queries and UI commands)
+        performance_tab = ttk.Frame(notebook, padding=10)
+        notebook.add(performance_tab, text="⚡ Performance")
+        from performance_panel import PerformancePanel
+        PerformancePanel(performance_tab, bg=ttk.Style().colors.bg).pack(fill=BOTH, expand=True)
+
+        # Each chart is drawn the first time its tab is shown
+        chart_builders = {
+            str(revenue_tab): (revenue_tab, self.create_revenue_trend_chart),
+            str(service_tab): (service_tab, self.create_service_popularity_chart),
+            str(status_tab): (status_tab, self.create_order_status_chart),
+        }
+
+        def build_selected_tab(event=None):
+            selected = notebook.select()
+            if selected in chart_builders:
+                tab, create_chart = chart_builders.pop(selected)
+                create_chart(tab, df)
+
+        notebook.bind("<<NotebookTabChanged>>", build_selected_tab)
+        build_selected_tab()
+
+    @staticmethod
+    def embed_figure(fig, master):
+        """Draw a matplotlib figure into a Tk widget and release pyplot's reference to it."""
+        plt = get_pyplot()
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        canvas = FigureCanvasTkAgg(fig, master)
+        canvas.draw()
+        # pyplot keeps every figure from plt.subplots() until it is closed; the
+        # canvas holds its own reference, so the figure is freed with the widget
+        plt.close(fig)
+        return canvas
 
     def create_revenue_trend_chart(self, parent, df):
         """Creates and embeds a revenue trend chart."""
+        plt = get_pyplot()
         fig, ax = plt.subplots(figsize=(12, 6))
         daily_revenue = df.groupby(df['order_date'].dt.to_period('D'))['total_amount'].sum()
         
@@ -783,20 +886,21 @@ class ExpressWashAppModern:
             fig.autofmt_xdate() # Auto-formats the x-axis labels (like rotation)
             plt.tight_layout() # Adjust plot to fit into figure area
         
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
+        canvas = self.embed_figure(fig, parent)
         canvas.get_tk_widget().pack(fill=BOTH, expand=True, padx=10, pady=10)
 
     def create_service_popularity_chart(self, parent, df):
         """Creates a pie chart for service popularity based on revenue."""
+        plt = get_pyplot()
         fig, ax = plt.subplots(figsize=(8, 8))
         
-        revenue_regular = (df['regular_clothes_kg'] * self.PRICING['regular_clothes']).sum()
-        revenue_blankets = (df['blankets_kg'] * self.PRICING['blankets']).sum()
-        revenue_white = (df['white_clothes_pieces'] * self.PRICING['white_clothes']).sum()
+        # Each order is priced with the price list it was billed under
+        revenues = self.pricing.service_paise(
+            df['regular_clothes_kg'], df['blankets_kg'], df['white_clothes_pieces'],
+            order_dates=df['order_date'], price_list_ids=df['price_list_id']
+        ).sum(axis=0) / 100
         
         labels = ['Regular Clothes', 'Blankets/Bedsheets', 'White Clothes']
-        revenues = [revenue_regular, revenue_blankets, revenue_white]
         colors = [ttk.Style().colors.info, ttk.Style().colors.success, ttk.Style().colors.warning]
         
         ax.pie(revenues, labels=labels, autopct='%1.1f%%', startangle=140, colors=colors,
@@ -805,12 +909,12 @@ class ExpressWashAppModern:
         ax.axis('equal')
         plt.tight_layout()
         
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
+        canvas = self.embed_figure(fig, parent)
         canvas.get_tk_widget().pack(fill=BOTH, expand=True, padx=10, pady=10)
         
     def create_order_status_chart(self, parent, df):
         """Creates a bar chart showing pending vs. collected orders."""
+        plt = get_pyplot()
         fig, ax = plt.subplots(figsize=(8, 6))
         
         collected_count = df['collection_date'].notna().sum()
@@ -828,15 +932,25 @@ class ExpressWashAppModern:
         ax.grid(axis='y', linestyle='--', linewidth=0.5)
         plt.tight_layout()
         
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
+        canvas = self.embed_figure(fig, parent)
         canvas.get_tk_widget().pack(fill=BOTH, expand=True, padx=10, pady=10)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Express Wash desktop billing app (modern UI)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="trace memory, widgets and figures and write a growth report")
+    parser.add_argument('--memory-interval', type=float, default=60,
+                        help="seconds between memory samples (default: 60)")
+    parser.add_argument('--memory-report', default='memory_report.txt', help="memory report file")
+    args = parser.parse_args()
+
     # Use ttkbootstrap for modern styling
     # Available themes: litera, cosmo, flatly, journal, lumen, minty, pulse, sandstone,
     # united, yeti, darkly, superhero, solar, cyborg
     root = ttk.Window(themename="litera")
     app = ExpressWashAppModern(root)
+    if args.profile_memory:
+        from memory_monitor import MemoryMonitor
+        MemoryMonitor.attach(root, args.memory_interval, args.memory_report)
     root.mainloop()
\ No newline at end of file
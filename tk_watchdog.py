@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tk Stall Watchdog for Express Wash Laundry Billing System
+Detects when the Tk main loop stops servicing events (the window freezes).
+
+A heartbeat after() callback stamps the time on the main thread; a background
+thread notices when no heartbeat arrived for longer than the threshold and
+samples the main thread's stack with sys._current_frames() until the loop
+runs again. Each stall is recorded with its duration and stacks: in the
+instrumentation registry (kind 'stall', shown in the Performance tab) and as
+a JSON line in stalls.log.
+
+    python tk_watchdog.py                  # summarise stalls.log by call site
+    python tk_watchdog.py other.log --top 5
+
+Set EXPRESS_WASH_STALL_MS to change the threshold (0 disables the watchdog).
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+
+from instrumentation import REGISTRY
+
+DEFAULT_THRESHOLD_MS = 200
+HEARTBEAT_MS = 50
+STALL_LOG = 'stalls.log'
+STALL_HISTORY = 100
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class StallWatchdog:
+    """Heartbeat on the Tk main loop plus a thread that records when it stops"""
+
+    def __init__(self, root, threshold_ms=DEFAULT_THRESHOLD_MS, heartbeat_ms=HEARTBEAT_MS,
+                 log_path=STALL_LOG):
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.log_path = log_path
+        self.events = deque(maxlen=STALL_HISTORY)
+        self._main_ident = threading.main_thread().ident
+        self._last_beat = None  # set by the first heartbeat, so startup is not a stall
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, root):
+        """Create and start a watchdog unless EXPRESS_WASH_STALL_MS is 0"""
+        try:
+            threshold_ms = int(os.environ.get('EXPRESS_WASH_STALL_MS', DEFAULT_THRESHOLD_MS))
+        except ValueError:
+            threshold_ms = DEFAULT_THRESHOLD_MS
+        if threshold_ms <= 0:
+            return None
+        watchdog = cls(root, threshold_ms=threshold_ms)
+        watchdog.start()
+        return watchdog
+
+    def start(self):
+        """Schedule the heartbeat and start the watching thread"""
+        self.root.after(self.heartbeat_ms, self._beat)
+        self._thread = threading.Thread(target=self._watch, name='tk-stall-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+        if self._stop.is_set():
+            return
+        try:
+            self.root.after(self.heartbeat_ms, self._beat)
+        except Exception:
+            # The window was destroyed
+            self._stop.set()
+
+    def _watch(self):
+        interval = self.heartbeat_ms / 2000
+        expected = self.heartbeat_ms / 1000
+        while not self._stop.wait(interval):
+            last_beat = self._last_beat
+            if last_beat is None or time.monotonic() - last_beat - expected < self.threshold:
+                continue
+
+            # Stalled: sample the main thread's stack until the heartbeat comes back
+            started = datetime.now()
+            samples = []
+            while self._last_beat == last_beat and not self._stop.is_set():
+                stack = self.main_thread_stack()
+                if stack is None:
+                    # The main thread has exited
+                    self._stop.set()
+                    return
+                samples.append(stack)
+                self._stop.wait(self.threshold)
+            if self._last_beat != last_beat:
+                duration_ms = max(self._last_beat - last_beat - expected, 0) * 1000
+                self.record(started, duration_ms, samples)
+
+    def main_thread_stack(self):
+        """Return the main thread's stack as [(file, line, function), ...], innermost last"""
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return None
+        return [(os.path.relpath(f.filename, PROJECT_DIR) if f.filename.startswith(PROJECT_DIR) else f.filename,
+                 f.lineno, f.name)
+                for f in traceback.extract_stack(frame)]
+
+    def record(self, started, duration_ms, samples):
+        """Store a stall event, add it to the registry and append it to the log"""
+        sites = Counter(stall_site(stack) for stack in samples)
+        site = sites.most_common(1)[0][0] if sites else 'unknown'
+        event = {
+            'time': started.isoformat(timespec='seconds'),
+            'ms': round(duration_ms, 1),
+            'site': site,
+            'samples': len(samples),
+            # The most frequent stack is where the loop spent the stall
+            'stack': [f"{file}:{line} in {name}" for file, line, name in
+                      Counter(tuple(stack) for stack in samples).most_common(1)[0][0]] if samples else []
+        }
+        self.events.append(event)
+        REGISTRY.observe('stall', site, duration_ms)
+        print(f"🧊 UI stalled for {duration_ms:.0f} ms in {site}")
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            except OSError as err:
+                print(f"⚠️ Could not write stall log: {err}")
+
+
+def stall_site(stack):
+    """Innermost project frame of a stack as 'file:function' (the code to fix)"""
+    for file, _, name in reversed(stack):
+        if not os.path.isabs(file) and not file.startswith('..') and file != 'tk_watchdog.py':
+            return f"{os.path.splitext(file)[0]}:{name}"
+    return f"{os.path.basename(stack[-1][0])}:{stack[-1][2]}" if stack else 'unknown'
+
+
+def summarize(log_path, top=10):
+    """Print stalls from a log grouped by call site, worst total first"""
+    groups = {}
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            group = groups.setdefault(event['site'], {'count': 0, 'total': 0.0, 'max': 0.0, 'stacks': Counter()})
+            group['count'] += 1
+            group['total'] += event['ms']
+            group['max'] = max(group['max'], event['ms'])
+            group['stacks'][tuple(event['stack'])] += 1
+
+    if not groups:
+        print("✅ No stalls recorded")
+        return
+
+    ranked = sorted(groups.items(), key=lambda item: item[1]['total'], reverse=True)
+    print(f"{'Call site':<48}{'Stalls':>8}{'Total (ms)':>12}{'Max (ms)':>10}")
+    print("-" * 78)
+    for site, group in ranked[:top]:
+        print(f"{site[:47]:<48}{group['count']:>8}{group['total']:>12,.0f}{group['max']:>10,.0f}")
+    for site, group in ranked[:top]:
+        stack, _ = group['stacks'].most_common(1)[0]
+        print(f"\n🧊 {site}")
+        for frame in stack[-8:]:
+            print(f"   {frame}")
+
+
+def main():
+    """Summarise a stall log"""
+    parser = argparse.ArgumentParser(description="Summarise Express Wash UI stalls")
+    parser.add_argument('log', nargs='?', default=STALL_LOG, help="stall log (default: stalls.log)")
+    parser.add_argument('--top', type=int, default=10, help="number of call sites to show")
+    args = parser.parse_args()
+
+    try:
+        summarize(args.log, args.top)
+    except FileNotFoundError:
+        print(f"❌ {args.log} not found")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,76 @@ Express Wash - Professional Tkinter Desktop Application
 Simple GUI with CRUD operations, collection tracking, and professional design
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import mysql.connector
-import pandas as pd
 from datetime import datetime, date, timedelta
 import json
 import os
-from PIL import Image, ImageTk
 import threading
 import webbrowser
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from db import get_connection, warm_pool
+from instrumentation import install_tk_instrumentation, start_metrics_server_from_env
+from tk_watchdog import StallWatchdog
+from customer_autocomplete import CustomerAutocomplete
+from customer_index import CustomerIndex
+from customers import find_or_create_customer
+from data_version import bump_data_version
+from invoice_store import InvoiceStore
+from order_archive import orders_source
+from order_repository import Order, OrderBatch, period_start
+from pricing import PricingEngine, DEFAULT_PRICE_LIST, SERVICES, SERVICE_LABELS, SERVICE_UNITS, format_rate, rupees
+from schema import ensure_schema
+from service_catalog import delete_order_items, load_order_items, save_order_items, service_totals
+
+# pandas and matplotlib are imported where they are used: only exports and the
+# reports window need them, and loading them up front delays the first window
+
+ORDER_TREE_CHUNK = 200  # orders added to the order list at a time, more as it is scrolled down
+ORDER_PAGE_ROWS = 1000  # orders read from the database at a time for the unfiltered list
+
+# Sortable order list columns: heading -> order field, and the ORDER BY columns
+# that match an index on orders (schema.py), so a sorted page reads no more than a page.
+# Each ends with id (part of every InnoDB index) so tied rows, such as orders
+# without a receipt number, keep a fixed order from page to page
+ORDER_SORT_FIELDS = {
+    'Receipt': 'receipt_number',
+    'Customer': 'customer_name',
+    'Date': 'order_date',
+    'Collection': 'collection_date',
+    'Total': 'total_amount',
+    'Created': 'created_at'
+}
+ORDER_SORT_INDEXES = {
+    'receipt_number': ('receipt_number', 'id'),
+    'customer_name': ('customer_name', 'id'),
+    'order_date': ('order_date', 'collection_date', 'total_amount', 'id'),
+    'collection_date': ('collection_date', 'id'),
+    'total_amount': ('total_amount', 'id'),
+    'created_at': ('created_at', 'id')
+}
+
+def keyset_condition(columns, values, descending):
+    """WHERE condition and parameters for the rows after values in ORDER BY columns (all ASC or all DESC)
+
+    MySQL sorts NULL first ascending and last descending, and a row comparison such as
+    (receipt_number, id) > (%s, %s) is never true for NULL, so the condition is spelt out
+    column by column: the same index range, without skipping orders that have no receipt.
+    """
+    terms, params = [], []
+    for position, (column, value) in enumerate(zip(columns, values)):
+        if value is None:
+            if descending:
+                continue  # nothing sorts after NULL descending
+            after, after_params = f"{column} IS NOT NULL", []
+        elif descending:
+            after, after_params = f"({column} < %s OR {column} IS NULL)", [value]
+        else:
+            after, after_params = f"{column} > %s", [value]
+        equal = [f"{earlier} <=> %s" for earlier in columns[:position]]
+        terms.append(f"({' AND '.join(equal + [after])})")
+        params += list(values[:position]) + after_params
+    return f"({' OR '.join(terms)})", params
 
 class ExpressWashApp:
     def __init__(self, root):
@@ -24,6 +82,13 @@ class ExpressWashApp:
         self.root.geometry("1400x900")
         self.root.configure(bg='white')
         
+        # Time every button command, event binding and after() callback
+        install_tk_instrumentation()
+        start_metrics_server_from_env()
+        
+        # Record every time the window freezes, with the code that was running
+        self.watchdog = StallWatchdog.from_env(self.root)
+        
         # Database configuration
         self.DB_CONFIG = {
             'host': 'localhost',
@@ -32,56 +97,87 @@ class ExpressWashApp:
             'database': 'express_wash'
         }
         
-        # Pricing configuration
-        self.PRICING = {
-            'regular_clothes': 50,  # ₹50/kg
-            'blankets': 100,        # ₹100/kg
-            'white_clothes': 40     # ₹40/piece
-        }
+        # Generated invoices are kept in date-sharded folders under invoices/
+        self.invoice_store = InvoiceStore()
+        
+        # Returning customers for the name/mobile suggestions (loaded once the database is ready)
+        self.customer_index = CustomerIndex(self.DB_CONFIG)
         
-        # Initialize database
+        # Initialize database (connects in the background while the window is built)
         self.init_database()
         
         # Create main interface
         self.create_widgets()
         
-        # Load initial data
-        self.load_orders()
+        # Show the real rates as soon as the price lists are loaded
+        self.root.after(50, self.poll_database_ready)
         
     def init_database(self):
-        """Initialize MySQL database connection with enhanced schema"""
-        try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            
-            # Create enhanced orders table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    receipt_number VARCHAR(32) UNIQUE,
-                    customer_name VARCHAR(255) NOT NULL,
-                    mobile_number VARCHAR(20),
-                    order_date DATE NOT NULL,
-                    regular_clothes_kg DECIMAL(5,2) DEFAULT 0,
-                    blankets_kg DECIMAL(5,2) DEFAULT 0,
-                    white_clothes_pieces INT DEFAULT 0,
-                    total_amount DECIMAL(10,2) NOT NULL,
-                    collection_date DATETIME NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Add collection_date column if upgrading existing database
+        """Start connecting, checking the schema and loading price lists in the background"""
+        self._pricing = None
+        self.database_ready = warm_pool(self.DB_CONFIG, setup=self.prepare_database)
+    
+    @staticmethod
+    def prepare_database(cursor):
+        """Create/upgrade orders and price_lists tables and load the price lists"""
+        ensure_schema(cursor)
+        return PricingEngine.from_cursor(cursor)
+    
+    @property
+    def pricing(self):
+        """Pricing configuration (waits for the background database setup if still running)"""
+        return self._pricing or self.finish_database_init()
+    
+    def finish_database_init(self):
+        """Apply the result of the background database setup"""
+        if self._pricing is None:
             try:
-                cursor.execute('ALTER TABLE orders ADD COLUMN collection_date DATETIME NULL')
-            except Exception:
-                pass
-                
-            conn.commit()
-            conn.close()
-            print("✅ Database initialized successfully!")
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
+                self._pricing = self.database_ready.result()
+                print("✅ Database initialized successfully!")
+                self.customer_index.refresh_async()
+            except Exception as err:
+                self._pricing = PricingEngine()
+                messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
+            self.refresh_rate_labels()
+        return self._pricing
+    
+    def poll_database_ready(self):
+        """Finish startup once the background database setup is done"""
+        if self.database_ready.done():
+            self.finish_database_init()
+        else:
+            self.root.after(50, self.poll_database_ready)
+    
+    def refresh_rate_labels(self):
+        """Show the rates of the current price list next to the service entries"""
+        self.add_other_service_entries()
+        price_list = self.pricing.current()
+        for service, label in getattr(self, 'rate_labels', {}).items():
+            label.config(text=format_rate(price_list, service, self.pricing.service(service).unit))
+    
+    def add_other_service_entries(self):
+        """Add an entry for each catalogue service without a column on orders (once the catalogue has loaded)"""
+        if self._pricing is None or not hasattr(self, 'service_frame'):
+            return
+        price_list = self._pricing.current()
+        for service in self._pricing.other_services():
+            if service.code in self.other_service_vars:
+                continue
+            # Two services per row, after White Clothes
+            slot = len(SERVICES) + len(self.other_service_vars)
+            row, column = slot // 2, slot % 2 * 2
+            tk.Label(self.service_frame, text=f"{service.label} ({service.unit}):", 
+                    font=('Arial', 10, 'bold'), bg='white').grid(row=row, column=column, sticky='w', pady=3, padx=3)
+            self.other_service_vars[service.code] = tk.StringVar()
+            tk.Entry(self.service_frame, textvariable=self.other_service_vars[service.code],
+                    font=('Arial', 10), width=8).grid(row=row, column=column + 1, padx=3, pady=3, sticky='w')
+            self.rate_labels[service.code] = tk.Label(self.service_frame, 
+                    text=format_rate(price_list, service.code, service.unit), font=('Arial', 9), bg='white', fg='#0891b2')
+            self.rate_labels[service.code].grid(row=row, column=column + 1, padx=(60, 0), pady=3, sticky='w')
+    
+    def other_service_quantities(self):
+        """Quantities entered for the other catalogue services, by code"""
+        return {code: float(var.get() or 0) for code, var in self.other_service_vars.items()}
     
     def create_widgets(self):
         """Create the main GUI widgets with simple design"""
@@ -176,6 +272,10 @@ class ExpressWashApp:
                                     font=('Arial', 11), width=20)
         self.mobile_entry.grid(row=1, column=1, padx=5, pady=5, sticky='w')
         
+        # Suggest returning customers while the name or mobile number is typed
+        self.customer_autocomplete = CustomerAutocomplete(
+            self.customer_index, [self.customer_name_entry, self.mobile_entry], self.fill_customer)
+        
         tk.Label(customer_frame, text="Order Date *", 
                 font=('Arial', 10, 'bold'), bg='white').grid(row=1, column=2, sticky='w', pady=5, padx=5)
         self.order_date_var = tk.StringVar(value=date.today().strftime('%Y-%m-%d'))
@@ -203,8 +303,12 @@ class ExpressWashApp:
         self.regular_clothes_entry = tk.Entry(service_frame, textvariable=self.regular_clothes_var,
                                              font=('Arial', 10), width=8)
         self.regular_clothes_entry.grid(row=0, column=1, padx=3, pady=3, sticky='w')
-        tk.Label(service_frame, text="₹50/kg", 
-                font=('Arial', 9), bg='white', fg='#059669').grid(row=0, column=1, padx=(60, 0), pady=3, sticky='w')
+        # Default rates until the price lists have loaded (see refresh_rate_labels)
+        price_list = self._pricing.current() if self._pricing else DEFAULT_PRICE_LIST
+        self.rate_labels = {}
+        self.rate_labels['regular_clothes'] = tk.Label(service_frame, text=format_rate(price_list, 'regular_clothes'), 
+                font=('Arial', 9), bg='white', fg='#059669')
+        self.rate_labels['regular_clothes'].grid(row=0, column=1, padx=(60, 0), pady=3, sticky='w')
         
         tk.Label(service_frame, text="Blankets/Bedsheets (kg):", 
                 font=('Arial', 10, 'bold'), bg='white').grid(row=0, column=2, sticky='w', pady=3, padx=3)
@@ -212,8 +316,9 @@ class ExpressWashApp:
         self.blankets_entry = tk.Entry(service_frame, textvariable=self.blankets_var,
                                       font=('Arial', 10), width=8)
         self.blankets_entry.grid(row=0, column=3, padx=3, pady=3, sticky='w')
-        tk.Label(service_frame, text="₹100/kg", 
-                font=('Arial', 9), bg='white', fg='#d97706').grid(row=0, column=3, padx=(60, 0), pady=3, sticky='w')
+        self.rate_labels['blankets'] = tk.Label(service_frame, text=format_rate(price_list, 'blankets'), 
+                font=('Arial', 9), bg='white', fg='#d97706')
+        self.rate_labels['blankets'].grid(row=0, column=3, padx=(60, 0), pady=3, sticky='w')
         
         # White Clothes in second row
         tk.Label(service_frame, text="White Clothes (pieces):", 
@@ -222,8 +327,14 @@ class ExpressWashApp:
         self.white_clothes_entry = tk.Entry(service_frame, textvariable=self.white_clothes_var,
                                            font=('Arial', 10), width=8)
         self.white_clothes_entry.grid(row=1, column=1, padx=3, pady=3, sticky='w')
-        tk.Label(service_frame, text="₹40/piece", 
-                font=('Arial', 9), bg='white', fg='#7c3aed').grid(row=1, column=1, padx=(60, 0), pady=3, sticky='w')
+        self.rate_labels['white_clothes'] = tk.Label(service_frame, text=format_rate(price_list, 'white_clothes'), 
+                font=('Arial', 9), bg='white', fg='#7c3aed')
+        self.rate_labels['white_clothes'].grid(row=1, column=1, padx=(60, 0), pady=3, sticky='w')
+        
+        # Services added to the catalogue since (express, ironing...) follow White Clothes
+        self.service_frame = service_frame
+        self.other_service_vars = {}
+        self.add_other_service_entries()
         
         # Bill Summary Section - more compact
         bill_frame = tk.LabelFrame(scrollable_frame, text="💰 Bill Summary", 
@@ -439,15 +550,17 @@ class ExpressWashApp:
         columns = ('ID', 'Receipt', 'Customer', 'Mobile', 'Date', 'Collection', 'Total', 'Created')
         self.tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
         
-        # Define headings
-        self.tree.heading('ID', text='ID')
-        self.tree.heading('Receipt', text='Receipt Number')
-        self.tree.heading('Customer', text='Customer Name')
-        self.tree.heading('Mobile', text='Mobile')
-        self.tree.heading('Date', text='Order Date')
-        self.tree.heading('Collection', text='Collection Date')
-        self.tree.heading('Total', text='Total (₹)')
-        self.tree.heading('Created', text='Created At')
+        # Define headings (clicking a sortable heading sorts by it, clicking again reverses)
+        self.tree_headings = {'ID': 'ID', 'Receipt': 'Receipt Number', 'Customer': 'Customer Name',
+                              'Mobile': 'Mobile', 'Date': 'Order Date', 'Collection': 'Collection Date',
+                              'Total': 'Total (₹)', 'Created': 'Created At'}
+        for column, text in self.tree_headings.items():
+            if column in ORDER_SORT_FIELDS:
+                self.tree.heading(column, text=text, command=lambda c=column: self.sort_orders(c))
+            else:
+                self.tree.heading(column, text=text)
+        self.order_sort = ('Created', True)  # (heading, descending)
+        self.update_sort_headings()
         
         # Define columns
         self.tree.column('ID', width=50)
@@ -459,13 +572,18 @@ class ExpressWashApp:
         self.tree.column('Total', width=80)
         self.tree.column('Created', width=120)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar (scrolling near the end adds the next orders)
+        self.tree_scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.order_batch = OrderBatch.from_rows([])
+        self.shown_orders = 0
+        self.more_orders_pending = False
+        self.more_orders_in_db = False
+        self.order_list_filter = None  # (condition, params) of the search shown, None for every order
         
         # Pack tree and scrollbar
         self.tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        self.tree_scrollbar.pack(side='right', fill='y')
         
         # Bind selection event
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
@@ -474,7 +592,7 @@ class ExpressWashApp:
         """Generate a unique, sequential receipt number for today"""
         today_str = date.today().strftime('%Y%m%d')
         prefix = f"RW-{today_str}-"
-        conn = mysql.connector.connect(**self.DB_CONFIG)
+        conn = get_connection(self.DB_CONFIG)
         cursor = conn.cursor()
         cursor.execute("SELECT receipt_number FROM orders WHERE receipt_number LIKE %s ORDER BY id DESC LIMIT 1", (prefix+'%',))
         last = cursor.fetchone()
@@ -492,19 +610,23 @@ class ExpressWashApp:
             regular_kg = float(self.regular_clothes_var.get() or 0)
             blankets_kg = float(self.blankets_var.get() or 0)
             white_pieces = int(self.white_clothes_var.get() or 0)
-            regular_cost = regular_kg * self.PRICING['regular_clothes']
-            blankets_cost = blankets_kg * self.PRICING['blankets']
-            white_cost = white_pieces * self.PRICING['white_clothes']
-            total = regular_cost + blankets_cost + white_cost
+            bill = self.pricing.price(regular_kg, blankets_kg, white_pieces, on_date=self.order_date_var.get().strip(),
+                                      extra=self.other_service_quantities())
+            rates = bill['rates']
+            regular_cost, blankets_cost, white_cost, total = bill['regular_cost'], bill['blankets_cost'], bill['white_cost'], bill['total']
             self.bill_text.delete(1.0, tk.END)
             lines = ["🧺 Express Wash - Bill Summary\n"]
             # Only show nonzero services
             if regular_kg > 0:
-                lines.append(f"Regular Clothes: {regular_kg}kg × ₹{self.PRICING['regular_clothes']} = ₹{regular_cost:.2f}")
+                lines.append(f"Regular Clothes: {regular_kg}kg × ₹{rates['regular_clothes']:g} = ₹{regular_cost:.2f}")
             if blankets_kg > 0:
-                lines.append(f"Blankets/Bedsheets: {blankets_kg}kg × ₹{self.PRICING['blankets']} = ₹{blankets_cost:.2f}")
+                lines.append(f"Blankets/Bedsheets: {blankets_kg}kg × ₹{rates['blankets']:g} = ₹{blankets_cost:.2f}")
             if white_pieces > 0:
-                lines.append(f"White Clothes: {white_pieces} pieces × ₹{self.PRICING['white_clothes']} = ₹{white_cost:.2f}")
+                lines.append(f"White Clothes: {white_pieces} pieces × ₹{rates['white_clothes']:g} = ₹{white_cost:.2f}")
+            for item in bill['items']:
+                if item.service.code not in SERVICES:
+                    lines.append(f"{item.service.label}: {item.quantity:g} {item.service.unit} × ₹{item.rate:g} = "
+                                 f"₹{rupees(item.paise):.2f}")
             lines.append("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
             lines.append(f"💵 TOTAL AMOUNT: ₹{total:.2f}\n")
             lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -530,20 +652,25 @@ class ExpressWashApp:
             regular_kg = float(self.regular_clothes_var.get() or 0)
             blankets_kg = float(self.blankets_var.get() or 0)
             white_pieces = int(self.white_clothes_var.get() or 0)
-            total = (regular_kg * self.PRICING['regular_clothes'] + 
-                    blankets_kg * self.PRICING['blankets'] + 
-                    white_pieces * self.PRICING['white_clothes'])
+            bill = self.pricing.price(regular_kg, blankets_kg, white_pieces, on_date=order_date,
+                                      extra=self.other_service_quantities())
+            total = bill['total']
             
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
+            customer_id = find_or_create_customer(cursor, customer_name, mobile_number)
             cursor.execute('''
-                INSERT INTO orders (receipt_number, customer_name, mobile_number, order_date, 
-                                   regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ''', (receipt_number, customer_name, mobile_number, order_date, regular_kg, blankets_kg, white_pieces, total))
+                INSERT INTO orders (receipt_number, customer_id, customer_name, mobile_number, order_date, 
+                                   regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, price_list_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ''', (receipt_number, customer_id, customer_name, mobile_number, order_date, regular_kg, blankets_kg,
+                  white_pieces, total, bill['price_list_id']))
+            save_order_items(cursor, cursor.lastrowid, order_date, bill['items'])
+            bump_data_version(cursor)
             conn.commit()
             conn.close()
             messagebox.showinfo("Success", f"✅ Order saved successfully!\nReceipt Number: {receipt_number}")
+            self.customer_index.refresh_async()
             self.clear_form()
             self.load_orders()
         except ValueError:
@@ -551,6 +678,12 @@ class ExpressWashApp:
         except Exception as e:
             messagebox.showerror("Error", f"Error saving order: {str(e)}")
     
+    def fill_customer(self, customer):
+        """Fill in a returning customer chosen from the suggestions"""
+        self.customer_name_var.set(customer['name'])
+        self.mobile_var.set(customer['mobile_number'])
+        self.regular_clothes_entry.focus_set()
+    
     def clear_form(self):
         """Clear the order form"""
         self.receipt_number_var.set("")
@@ -560,99 +693,151 @@ class ExpressWashApp:
         self.regular_clothes_var.set("")
         self.blankets_var.set("")
         self.white_clothes_var.set("")
+        for var in self.other_service_vars.values():
+            var.set("")
         self.bill_text.delete(1.0, tk.END)
     
     def load_orders(self):
-        """Load orders from database"""
+        """Load the first page of orders from database, in the chosen sort order"""
+        try:
+            self.order_list_filter = None
+            orders = self.fetch_order_page()
+            
+            # If no records found, display a message in the tree view
+            self.show_orders(orders, ("", "No records found", "Please add new orders", "", "", "", "", ""))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error loading orders: {str(e)}")
+    
+    def fetch_order_page(self, after=None):
+        """ORDER_PAGE_ROWS orders of the list (searched or not) after order `after`, sorted in SQL on the sort column's index
+
+        A page starts from the sort key of the last order shown instead of an OFFSET,
+        so a page deep in the list reads one page of the index, not every page before it.
+        """
+        heading, descending = self.order_sort
+        direction = 'DESC' if descending else 'ASC'
+        sort_columns = ORDER_SORT_INDEXES[ORDER_SORT_FIELDS[heading]]
+        order_by = ', '.join(f"{column} {direction}" for column in sort_columns)
+        conditions, params = ([self.order_list_filter[0]], list(self.order_list_filter[1])) if self.order_list_filter else ([], [])
+        if after is not None:
+            condition, keys = keyset_condition(sort_columns, [getattr(after, column) for column in sort_columns], descending)
+            conditions.append(condition)
+            params += keys
+        list_filter = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = get_connection(self.DB_CONFIG)
         try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            conn = mysql.connector.connect(**self.DB_CONFIG)
             cursor = conn.cursor()
-            cursor.execute('''
+            cursor.execute(f'''
                 SELECT id, receipt_number, customer_name, mobile_number, order_date, 
                        regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, 
-                       collection_date, created_at
-                FROM orders 
-                ORDER BY created_at DESC
-            ''')
-            orders = cursor.fetchall()
-            
-            if not orders:
-                # If no records found, display a message in the tree view
-                self.tree.insert('', 'end', values=(
-                    "", "No records found", "Please add new orders", "", "", "", "", ""
-                ))
-            else:
-                # Display the orders
-                for order in orders:
-                    self.tree.insert('', 'end', values=(
-                        order[0],  # ID
-                        order[1],  # Receipt Number
-                        order[2],  # Customer Name
-                        order[3] or "",  # Mobile
-                        order[4],  # Order Date
-                        order[9] if order[9] else "Not Collected",  # Collection Date
-                        f"₹{order[8]:.2f}",  # Total
-                        order[10].strftime('%Y-%m-%d %H:%M') if order[10] else ""  # Created
-                    ))
+                       price_list_id, collection_date, created_at
+                FROM orders {list_filter}
+                ORDER BY {order_by}
+                LIMIT %s
+            ''', (*params, ORDER_PAGE_ROWS))
+            orders = OrderBatch.from_rows(cursor.fetchall())
+        finally:
             conn.close()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error loading orders: {str(e)}")
+        self.more_orders_in_db = len(orders) == ORDER_PAGE_ROWS
+        return orders
     
     def filter_orders(self, *args):
         """Filter orders based on search term"""
         search_term = self.search_var.get().strip()
         
-        # Clear current display
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         if not search_term:
             # If no search term, show all orders
             self.load_orders()
             return
         
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
-            cursor = conn.cursor()
-            
-            # Search by receipt number or customer name
-            cursor.execute('''
-                SELECT id, receipt_number, customer_name, mobile_number, order_date, 
-                       regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, 
-                       collection_date, created_at
-                FROM orders 
-                WHERE receipt_number LIKE %s OR customer_name LIKE %s
-                ORDER BY created_at DESC
-            ''', (f'%{search_term}%', f'%{search_term}%'))
-            
-            orders = cursor.fetchall()
-            conn.close()
+            # Search by receipt number or customer name, plus names spelled differently;
+            # the matches are paged in the chosen sort order like the full list
+            customer_ids = [customer['id'] for customer in self.customer_index.fuzzy_search(search_term)]
+            customer_filter = f"OR customer_id IN ({', '.join(['%s'] * len(customer_ids))})" if customer_ids else ""
+            self.order_list_filter = (f"(receipt_number LIKE %s OR customer_name LIKE %s {customer_filter})",
+                                      (f'%{search_term}%', f'%{search_term}%', *customer_ids))
+            orders = self.fetch_order_page()
             
-            # Display filtered results
-            if not orders:
-                # If no matching records found, display a message
-                self.tree.insert('', 'end', values=(
-                    "", "No matching records", f"No results for '{search_term}'", "", "", "", "", ""
-                ))
-            else:
-                # Display the matching orders
-                for order in orders:
-                    self.tree.insert('', 'end', values=(
-                        order[0],  # ID
-                        order[1],  # Receipt Number
-                        order[2],  # Customer Name
-                        order[3] or "",  # Mobile
-                        order[4],  # Order Date
-                        order[9] if order[9] else "Not Collected",  # Collection Date
-                        f"₹{order[8]:.2f}",  # Total
-                        order[10].strftime('%Y-%m-%d %H:%M') if order[10] else ""  # Created
-                    ))
+            # If no matching records found, display a message
+            self.show_orders(orders, ("", "No matching records", f"No results for '{search_term}'", "", "", "", "", ""))
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error searching orders: {str(e)}")
     
+    def show_orders(self, orders, empty_values):
+        """Replace the order list with a batch of orders; only the first rows are formatted"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.order_batch = orders
+        self.shown_orders = 0
+        if not orders:
+            self.tree.insert('', 'end', values=empty_values)
+            return
+        self.show_more_orders()
+    
+    def show_more_orders(self):
+        """Add the next ORDER_TREE_CHUNK orders of the batch to the order list"""
+        self.more_orders_pending = False
+        if self.shown_orders >= len(self.order_batch) and self.more_orders_in_db:
+            try:
+                self.order_batch.extend(self.fetch_order_page(self.order_batch[-1]))
+            except Exception as e:
+                self.more_orders_in_db = False
+                messagebox.showerror("Error", f"Error loading orders: {str(e)}")
+        end = min(self.shown_orders + ORDER_TREE_CHUNK, len(self.order_batch))
+        for index in range(self.shown_orders, end):
+            order = self.order_batch[index]
+            # The item id is the position in the batch (see selected_order)
+            self.tree.insert('', 'end', iid=str(index), values=(
+                order.id,
+                order.receipt_number,
+                order.customer_name,
+                order.mobile_number or "",
+                order.order_date,
+                order.collection_date if order.collected else "Not Collected",
+                f"₹{order.total_amount:.2f}",
+                order.created_at.strftime('%Y-%m-%d %H:%M') if order.created_at else ""
+            ))
+        self.shown_orders = end
+    
+    def on_tree_scroll(self, first, last):
+        """Move the scrollbar; near the end of the shown orders, add the next ones"""
+        self.tree_scrollbar.set(first, last)
+        more = self.shown_orders < len(self.order_batch) or self.more_orders_in_db
+        if float(last) > 0.9 and more and not self.more_orders_pending:
+            # Not from inside the Treeview's own scroll callback
+            self.more_orders_pending = True
+            self.root.after_idle(self.show_more_orders)
+    
+    def sort_orders(self, heading):
+        """Sort the order list by a column; the same column again reverses the order"""
+        current, descending = self.order_sort
+        if heading == current:
+            self.order_sort = (heading, not descending)
+        else:
+            # Text columns start A-Z, dates and amounts newest/largest first
+            self.order_sort = (heading, heading not in ('Receipt', 'Customer'))
+        self.update_sort_headings()
+        
+        # The list (searched or not) is paged from the database in the new order
+        self.filter_orders()
+    
+    def update_sort_headings(self):
+        """Mark the sort column's heading with the direction"""
+        heading, descending = self.order_sort
+        for column, text in self.tree_headings.items():
+            arrow = (' ▼' if descending else ' ▲') if column == heading else ''
+            self.tree.heading(column, text=text + arrow)
+    
+    def selected_order(self):
+        """Order record of the selected list row, or None (nothing or the placeholder row selected)"""
+        selection = self.tree.selection()
+        if not selection or not selection[0].isdigit():
+            return None
+        return self.order_batch[int(selection[0])]
+    
     def on_select(self, event):
         """Handle order selection"""
         selection = self.tree.selection()
@@ -667,40 +852,37 @@ class ExpressWashApp:
     
     def edit_order(self):
         """Edit selected order"""
-        selection = self.tree.selection()
-        if not selection:
+        selected = self.selected_order()
+        if selected is None:
             messagebox.showwarning("Warning", "Please select an order to edit!")
             return
         
-        # Get selected order ID from tree
-        item = self.tree.item(selection[0])
-        order_id = item['values'][0]  # ID is the first column
-        
-        # Fetch complete order data from database
+        # Fetch complete order data from database (the list may be out of date)
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, receipt_number, customer_name, mobile_number, order_date, 
                        regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount, 
-                       collection_date, created_at
+                       price_list_id, collection_date, created_at
                 FROM orders 
                 WHERE id = %s
-            ''', (order_id,))
-            order_data = cursor.fetchone()
+            ''', (selected.id,))
+            row = cursor.fetchone()
+            items = load_order_items(cursor, selected.id)
             conn.close()
             
-            if order_data:
+            if row:
                 # Create edit window with complete database data
-                self.create_edit_window(order_data)
+                self.create_edit_window(Order(*row), items)
             else:
                 messagebox.showerror("Error", "Order not found in database!")
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error fetching order data: {str(e)}")
     
-    def create_edit_window(self, order_data):
-        """Create edit order window"""
+    def create_edit_window(self, order, items=()):
+        """Create edit order window (items: the order's BillItems, for the other catalogue services)"""
         edit_window = tk.Toplevel(self.root)
         edit_window.title("✏️ Edit Order")
         edit_window.geometry("600x800")
@@ -710,7 +892,7 @@ class ExpressWashApp:
         edit_window.grab_set()
         
         # Order ID
-        order_id = order_data[0]
+        order_id = order.id
         
         # Create scrollable frame
         canvas = tk.Canvas(edit_window, bg='#f0f8ff', highlightthickness=0)
@@ -734,53 +916,64 @@ class ExpressWashApp:
         
         # Receipt Number
         tk.Label(form_frame, text="Receipt Number:", font=('Arial', 10, 'bold'), bg='white').grid(row=0, column=0, sticky='w', pady=5)
-        receipt_number_var = tk.StringVar(value=order_data[1])
+        receipt_number_var = tk.StringVar(value=order.receipt_number)
         receipt_number_entry = tk.Entry(form_frame, textvariable=receipt_number_var, font=('Arial', 10), width=25, state='normal')
         receipt_number_entry.grid(row=0, column=1, padx=(10, 0), pady=5, sticky='w')
         
         # Customer Name
         tk.Label(form_frame, text="Customer Name:", font=('Arial', 10, 'bold'), bg='white').grid(row=1, column=0, sticky='w', pady=5)
-        customer_name_var = tk.StringVar(value=order_data[2])
+        customer_name_var = tk.StringVar(value=order.customer_name)
         customer_name_entry = tk.Entry(form_frame, textvariable=customer_name_var, font=('Arial', 10), width=25, state='normal')
         customer_name_entry.grid(row=1, column=1, padx=(10, 0), pady=5, sticky='w')
         
         tk.Label(form_frame, text="Mobile Number:", font=('Arial', 10, 'bold'), bg='white').grid(row=2, column=0, sticky='w', pady=5)
-        mobile_var = tk.StringVar(value=order_data[3] or "")
+        mobile_var = tk.StringVar(value=order.mobile_number or "")
         mobile_entry = tk.Entry(form_frame, textvariable=mobile_var, font=('Arial', 10), width=25, state='normal')
         mobile_entry.grid(row=2, column=1, padx=(10, 0), pady=5, sticky='w')
         
         tk.Label(form_frame, text="Order Date:", font=('Arial', 10, 'bold'), bg='white').grid(row=3, column=0, sticky='w', pady=5)
-        order_date_var = tk.StringVar(value=order_data[4])
+        order_date_var = tk.StringVar(value=str(order.order_date))
         order_date_entry = tk.Entry(form_frame, textvariable=order_date_var, font=('Arial', 10), width=25, state='normal')
         order_date_entry.grid(row=3, column=1, padx=(10, 0), pady=5, sticky='w')
         
         # Service Details
         tk.Label(form_frame, text="Regular Clothes (kg):", font=('Arial', 10, 'bold'), bg='white').grid(row=4, column=0, sticky='w', pady=5)
-        regular_kg_var = tk.DoubleVar(value=float(order_data[5]))
+        regular_kg_var = tk.DoubleVar(value=float(order.regular_clothes_kg))
         regular_kg_entry = tk.Entry(form_frame, textvariable=regular_kg_var, font=('Arial', 10), width=15, state='normal')
         regular_kg_entry.grid(row=4, column=1, padx=(10, 0), pady=5, sticky='w')
         
         tk.Label(form_frame, text="Blankets (kg):", font=('Arial', 10, 'bold'), bg='white').grid(row=5, column=0, sticky='w', pady=5)
-        blankets_kg_var = tk.DoubleVar(value=float(order_data[6]))
+        blankets_kg_var = tk.DoubleVar(value=float(order.blankets_kg))
         blankets_kg_entry = tk.Entry(form_frame, textvariable=blankets_kg_var, font=('Arial', 10), width=15, state='normal')
         blankets_kg_entry.grid(row=5, column=1, padx=(10, 0), pady=5, sticky='w')
         
         tk.Label(form_frame, text="White Clothes (pieces):", font=('Arial', 10, 'bold'), bg='white').grid(row=6, column=0, sticky='w', pady=5)
-        white_pieces_var = tk.IntVar(value=int(order_data[7]))
+        white_pieces_var = tk.IntVar(value=int(order.white_clothes_pieces))
         white_pieces_entry = tk.Entry(form_frame, textvariable=white_pieces_var, font=('Arial', 10), width=15, state='normal')
         white_pieces_entry.grid(row=6, column=1, padx=(10, 0), pady=5, sticky='w')
         
+        # Other catalogue services: those on sale, and retired ones this order already has
+        quantities = {item.service.code: item.quantity for item in items}
+        other_services = self.pricing.other_services() + [
+            item.service for item in items if item.service.code not in SERVICES and not item.service.active]
+        other_vars = {}
+        for row, service in enumerate(other_services, start=7):
+            tk.Label(form_frame, text=f"{service.label} ({service.unit}):", font=('Arial', 10, 'bold'), bg='white').grid(row=row, column=0, sticky='w', pady=5)
+            other_vars[service.code] = tk.DoubleVar(value=float(quantities.get(service.code, 0)))
+            tk.Entry(form_frame, textvariable=other_vars[service.code], font=('Arial', 10), width=15, state='normal').grid(row=row, column=1, padx=(10, 0), pady=5, sticky='w')
+        next_row = 7 + len(other_services)
+        
         # Set focus to the first entry field
         receipt_number_entry.focus_set()
         
         # Current Total Display
-        current_total = order_data[8] if len(order_data) > 8 else 0
-        tk.Label(form_frame, text="Current Total:", font=('Arial', 10, 'bold'), bg='white').grid(row=7, column=0, sticky='w', pady=5)
-        tk.Label(form_frame, text=f"₹{current_total:.2f}", font=('Arial', 10, 'bold'), bg='white', fg='#059669').grid(row=7, column=1, sticky='w', pady=5, padx=(10, 0))
+        current_total = order.total_amount or 0
+        tk.Label(form_frame, text="Current Total:", font=('Arial', 10, 'bold'), bg='white').grid(row=next_row, column=0, sticky='w', pady=5)
+        tk.Label(form_frame, text=f"₹{current_total:.2f}", font=('Arial', 10, 'bold'), bg='white', fg='#059669').grid(row=next_row, column=1, sticky='w', pady=5, padx=(10, 0))
         
         # Button Frame
         button_frame = tk.Frame(form_frame, bg='white')
-        button_frame.grid(row=8, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=next_row + 1, column=0, columnspan=2, pady=20)
         
         # Update button
         def update_order():
@@ -799,8 +992,9 @@ class ExpressWashApp:
                     regular_kg = regular_kg_var.get()
                     blankets_kg = blankets_kg_var.get()
                     white_pieces = white_pieces_var.get()
+                    extra = {code: var.get() for code, var in other_vars.items()}
                     
-                    if regular_kg < 0 or blankets_kg < 0 or white_pieces < 0:
+                    if regular_kg < 0 or blankets_kg < 0 or white_pieces < 0 or min(extra.values(), default=0) < 0:
                         messagebox.showerror("Validation Error", "❌ Quantities cannot be negative!")
                         return
                         
@@ -808,10 +1002,10 @@ class ExpressWashApp:
                     messagebox.showerror("Validation Error", "❌ Please enter valid numbers for quantities!")
                     return
                 
-                # Calculate new total
-                total = (regular_kg * self.PRICING['regular_clothes'] + 
-                        blankets_kg * self.PRICING['blankets'] + 
-                        white_pieces * self.PRICING['white_clothes'])
+                # Calculate new total with the price list in effect on the order date
+                bill = self.pricing.price(regular_kg, blankets_kg, white_pieces, on_date=order_date_var.get().strip(),
+                                          extra=extra)
+                total = bill['total']
                 
                 # Show confirmation dialog
                 confirmation = messagebox.askyesno("Confirm Update", 
@@ -824,17 +1018,20 @@ class ExpressWashApp:
                     return
                 
                 # Update database
-                conn = mysql.connector.connect(**self.DB_CONFIG)
+                conn = get_connection(self.DB_CONFIG)
                 cursor = conn.cursor()
+                customer_id = find_or_create_customer(cursor, customer_name_var.get(), mobile_var.get(), order_id)
                 
                 cursor.execute('''
                     UPDATE orders 
-                    SET receipt_number = %s, customer_name = %s, mobile_number = %s, order_date = %s,
+                    SET receipt_number = %s, customer_id = %s, customer_name = %s, mobile_number = %s, order_date = %s,
                         regular_clothes_kg = %s, blankets_kg = %s, white_clothes_pieces = %s,
-                        total_amount = %s
+                        total_amount = %s, price_list_id = %s
                     WHERE id = %s
-                ''', (receipt_number_var.get(), customer_name_var.get(), mobile_var.get(), order_date_var.get(),
-                     regular_kg, blankets_kg, white_pieces, total, order_id))
+                ''', (receipt_number_var.get(), customer_id, customer_name_var.get(), mobile_var.get(),
+                     order_date_var.get(), regular_kg, blankets_kg, white_pieces, total, bill['price_list_id'], order_id))
+                save_order_items(cursor, order_id, order_date_var.get(), bill['items'])
+                bump_data_version(cursor)
                 
                 conn.commit()
                 conn.close()
@@ -898,8 +1095,8 @@ class ExpressWashApp:
 
     def delete_order(self):
         """Delete selected order"""
-        selection = self.tree.selection()
-        if not selection:
+        order = self.selected_order()
+        if order is None:
             messagebox.showwarning("Warning", "Please select an order to delete!")
             return
         
@@ -910,15 +1107,13 @@ class ExpressWashApp:
             return
         
         try:
-            # Get order ID
-            item = self.tree.item(selection[0])
-            order_id = item['values'][0]
-            
             # Delete from database
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             
-            cursor.execute('DELETE FROM orders WHERE id = %s', (order_id,))
+            cursor.execute('DELETE FROM orders WHERE id = %s', (order.id,))
+            delete_order_items(cursor, order.id)
+            bump_data_version(cursor)
             conn.commit()
             conn.close()
             
@@ -932,13 +1127,15 @@ class ExpressWashApp:
         """Export data to CSV"""
         try:
             # Check if there's data to export
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM orders')
-            count = cursor.fetchone()[0]
+            # The export includes archived orders
+            source = orders_source(cursor)
+            cursor.execute(f'SELECT 1 FROM {source} LIMIT 1')
+            has_orders = cursor.fetchone() is not None
             conn.close()
             
-            if count == 0:
+            if not has_orders:
                 messagebox.showwarning("No Data", "No orders found to export!")
                 return
             
@@ -949,8 +1146,9 @@ class ExpressWashApp:
             )
             
             if filename:
-                conn = mysql.connector.connect(**self.DB_CONFIG)
-                df = pd.read_sql_query('''
+                import pandas as pd
+                conn = get_connection(self.DB_CONFIG)
+                df = pd.read_sql_query(f'''
                     SELECT 
                         receipt_number as 'Receipt Number',
                         customer_name as 'Customer Name',
@@ -962,13 +1160,13 @@ class ExpressWashApp:
                         total_amount as 'Total Amount (₹)',
                         collection_date as 'Collection Date',
                         created_at as 'Created At'
-                    FROM orders 
+                    FROM {source} 
                     ORDER BY created_at DESC
                 ''', conn)
                 conn.close()
                 
                 df.to_csv(filename, index=False)
-                messagebox.showinfo("Export Success", f"✅ {count} orders exported to:\n{filename}")
+                messagebox.showinfo("Export Success", f"✅ {len(df)} orders exported to:\n{filename}")
                 
         except Exception as e:
             messagebox.showerror("Export Error", f"Error exporting data: {str(e)}")
@@ -982,7 +1180,7 @@ class ExpressWashApp:
             return
         
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             
             # First, check if the order exists and get its details
@@ -1034,6 +1232,7 @@ Services:
                 SET collection_date = NOW()
                 WHERE receipt_number = %s
             ''', (receipt_number,))
+            bump_data_version(cursor)
             
             conn.commit()
             conn.close()
@@ -1047,96 +1246,76 @@ Services:
 
     def generate_invoice(self):
         """Generate and display invoice for selected order or by receipt number"""
-        receipt_number = None
-        values = None
-        
         # Check if we have a receipt number from the collection tracking section
         if hasattr(self, 'collection_receipt_var') and self.collection_receipt_var.get().strip():
             receipt_number = self.collection_receipt_var.get().strip()
             
             # Get order details from database using receipt number
             try:
-                conn = mysql.connector.connect(**self.DB_CONFIG)
+                conn = get_connection(self.DB_CONFIG)
                 cursor = conn.cursor()
                 cursor.execute('''
-                SELECT id, receipt_number, customer_name, mobile_number, order_date, collection_date, total_amount,
-                       regular_clothes_kg, blankets_kg, white_clothes_pieces
+                SELECT id, receipt_number, customer_name, mobile_number, order_date,
+                       regular_clothes_kg, blankets_kg, white_clothes_pieces, total_amount,
+                       price_list_id, collection_date, created_at
                 FROM orders WHERE receipt_number = %s
                 ''', (receipt_number,))
                 
-                order_details = cursor.fetchone()
+                row = cursor.fetchone()
                 conn.close()
             except Exception as e:
                 messagebox.showerror("Database Error", f"Error retrieving order details: {e}")
                 return
             
-            if not order_details:
+            if not row:
                 messagebox.showerror("Error", "No order found with this receipt number")
                 return
-                
-            # Create values list similar to treeview selection
-            values = list(order_details)
-            customer_name = values[2]
-            mobile_number = values[3]
-            order_date = values[4]
-            collection_date = values[5]
-            total_amount = float(values[6])
+            order = Order(*row)
             
         else:
             # Try to get selected order from treeview if available
             try:
-                selection = self.tree.selection()
-                if not selection:
+                order = self.selected_order()
+                if order is None:
                     messagebox.showwarning("Warning", "Please select an order or enter a receipt number in the Collection Tracking section!")
                     return
-                
-                # Get selected order data
-                item = self.tree.item(selection[0])
-                values = item['values']
-                receipt_number = values[1]
-                customer_name = values[2]
-                mobile_number = values[3]
-                order_date = values[4]
-                collection_date = values[5]
-                total_amount = values[6]
             except (IndexError, AttributeError):
                 messagebox.showerror("Error", "Please enter a receipt number in the Collection Tracking section")
                 return
         
-        if collection_date == "Not Collected":
+        if not order.collected:
             messagebox.showwarning("Warning", "This order has not been collected yet. Cannot generate invoice.")
             return
 
-        # Get service details based on where the data came from
+        receipt_number = order.receipt_number
+        customer_name = order.customer_name
+        mobile_number = order.mobile_number
+        order_date = order.order_date
+        collection_date = order.collection_date
+        total_amount = float(order.total_amount)
+        
+        # The services as billed: quantities, rates and amounts from order_items
         try:
-            regular_clothes = values[7]
-            blankets = values[8]
-            white_clothes = values[9]
-        except (IndexError, TypeError):
-            # If we can't get from values, try to get from database
-            try:
-                conn = mysql.connector.connect(**self.DB_CONFIG)
-                cursor = conn.cursor()
-                cursor.execute('''
-                SELECT regular_clothes_kg, blankets_kg, white_clothes_pieces
-                FROM orders WHERE receipt_number = %s
-                ''', (receipt_number,))
-                
-                service_details = cursor.fetchone()
-                conn.close()
-            except Exception as e:
-                messagebox.showerror("Database Error", f"Error retrieving service details: {e}")
-                return
-            
-            if service_details:
-                regular_clothes, blankets, white_clothes = service_details
-            else:
-                regular_clothes = blankets = white_clothes = 0
-        
-        # Calculate service costs
-        regular_cost = float(regular_clothes) * self.PRICING['regular_clothes']
-        blanket_cost = float(blankets) * self.PRICING['blankets']
-        white_cost = float(white_clothes) * self.PRICING['white_clothes']
+            conn = get_connection(self.DB_CONFIG)
+            items = load_order_items(conn.cursor(), order.id)
+            conn.close()
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Error retrieving order items: {e}")
+            return
+        if not items:
+            # Not backfilled yet: price the columns with the rates the order was billed under
+            items = self.pricing.price(order.regular_clothes_kg, order.blankets_kg, order.white_clothes_pieces,
+                                       price_list=self.pricing.resolve(order.price_list_id, order_date))['items']
+        service_lines = "\n".join(
+            f"{item.service.label}: {item.quantity:g} {item.service.unit} × ₹{item.rate:g} = ₹{rupees(item.paise):.2f}"
+            for item in items)
+        service_rows = "".join(f"""
+            <tr>
+                <td>{item.service.label}</td>
+                <td>{item.quantity:g} {item.service.unit}</td>
+                <td>₹{item.rate:g}</td>
+                <td>₹{rupees(item.paise):.2f}</td>
+            </tr>""" for item in items)
         
         invoice_text = f"""
 🧺 Express Wash - Invoice
@@ -1149,9 +1328,7 @@ Collection Date: {collection_date}
 
 Service Details:
 ----------------------------------------
-Regular Clothes: {regular_clothes}kg × ₹{self.PRICING['regular_clothes']} = ₹{regular_cost:.2f}
-Blankets/Bedsheets: {blankets}kg × ₹{self.PRICING['blankets']} = ₹{blanket_cost:.2f}
-White Clothes: {white_clothes} pieces × ₹{self.PRICING['white_clothes']} = ₹{white_cost:.2f}
+{service_lines}
 
 Total Amount: ₹{total_amount:.2f}
 ========================================
@@ -1195,25 +1372,7 @@ Total Amount: ₹{total_amount:.2f}
                 <th>Quantity</th>
                 <th>Rate</th>
                 <th>Amount</th>
-            </tr>
-            <tr>
-                <td>Regular Clothes</td>
-                <td>{regular_clothes}kg</td>
-                <td>₹{self.PRICING['regular_clothes']}</td>
-                <td>₹{regular_cost:.2f}</td>
-            </tr>
-            <tr>
-                <td>Blankets/Bedsheets</td>
-                <td>{blankets}kg</td>
-                <td>₹{self.PRICING['blankets']}</td>
-                <td>₹{blanket_cost:.2f}</td>
-            </tr>
-            <tr>
-                <td>White Clothes</td>
-                <td>{white_clothes} pieces</td>
-                <td>₹{self.PRICING['white_clothes']}</td>
-                <td>₹{white_cost:.2f}</td>
-            </tr>
+            </tr>{service_rows}
         </table>
         <div class="total">
             <p>Total Amount: ₹{total_amount:.2f}</p>
@@ -1227,10 +1386,8 @@ Total Amount: ₹{total_amount:.2f}
 </html>
 """
         
-        # Save HTML invoice to file
-        invoice_filename = f"invoice_{receipt_number}.html"
-        with open(invoice_filename, 'w') as f:
-            f.write(html_invoice)
+        # Save HTML invoice into the invoice store (sharded by order date)
+        invoice_filename = self.invoice_store.save(receipt_number, html_invoice, order_date)
         
         # Create invoice window
         invoice_window = tk.Toplevel(self.root)
@@ -1371,30 +1528,142 @@ Total Amount: ₹{total_amount:.2f}
         time_frame = tk.Frame(notebook, bg='#f0f8ff')
         notebook.add(time_frame, text="⏰ Time-based Reports")
         
+        # Tab 5: What-if Pricing (not affected by the visualization type)
+        simulator_frame = tk.Frame(notebook, bg='#f0f8ff')
+        notebook.add(simulator_frame, text="🔮 What-if Pricing")
+        self.create_pricing_simulator(simulator_frame)
+        
+        # Tab 6: Performance (live latency of queries and UI commands)
+        performance_frame = tk.Frame(notebook, bg='#f0f8ff')
+        notebook.add(performance_frame, text="⚡ Performance")
+        self.create_performance_panel(performance_frame)
+        
         # Store visualization type and notebook for later reference
         self.current_viz_type = viz_var
         self.reports_notebook = notebook
         
+        # Tabs are built the first time they are shown (each one queries and draws charts)
+        tab_builders = {
+            str(summary_frame): (summary_frame, self.create_summary_dashboard),
+            str(revenue_frame): (revenue_frame, self.create_revenue_analysis),
+            str(status_frame): (status_frame, self.create_order_status_analysis),
+            str(time_frame): (time_frame, self.create_time_based_reports)
+        }
+        built_tabs = set()
+        
+        def build_selected_tab(event=None):
+            selected = notebook.select()
+            if selected in tab_builders and selected not in built_tabs:
+                built_tabs.add(selected)
+                frame, create_tab = tab_builders[selected]
+                create_tab(frame, viz_var.get())
+        
         # Function to update visualizations based on selected type
         def update_visualizations(event=None):
-            viz_type = viz_var.get()
-            # Clear all frames
-            for frame in [summary_frame, revenue_frame, status_frame, time_frame]:
+            # Clear all frames; they are rebuilt with the new type when shown
+            for frame, _ in tab_builders.values():
                 for widget in frame.winfo_children():
                     widget.destroy()
-            
-            # Create content for each tab with selected visualization type
-            self.create_summary_dashboard(summary_frame, viz_type)
-            self.create_revenue_analysis(revenue_frame, viz_type)
-            self.create_order_status_analysis(status_frame, viz_type)
-            self.create_time_based_reports(time_frame, viz_type)
+            built_tabs.clear()
+            build_selected_tab()
         
         # Bind the dropdown to update visualizations
         viz_dropdown.bind("<<ComboboxSelected>>", update_visualizations)
+        notebook.bind("<<NotebookTabChanged>>", build_selected_tab)
         
         # Initial creation of visualizations
         update_visualizations()
 
+    def create_performance_panel(self, parent):
+        """Create the live query and UI latency panel"""
+        from performance_panel import PerformancePanel
+        PerformancePanel(parent).pack(fill='both', expand=True)
+
+    def create_pricing_simulator(self, parent):
+        """Create what-if simulator that re-prices past orders with proposed rates"""
+        input_frame = tk.Frame(parent, bg='#f0f8ff')
+        input_frame.pack(fill='x', padx=20, pady=20)
+        
+        current = self.pricing.current()
+        rate_vars = {}
+        for i, service in enumerate(SERVICES):
+            tk.Label(input_frame, text=f"{SERVICE_LABELS[service]} (₹/{SERVICE_UNITS[service]}):",
+                    font=('Arial', 10, 'bold'), bg='#f0f8ff').grid(row=0, column=i * 2, sticky='w', padx=(0, 5))
+            rate_vars[service] = tk.StringVar(value=f"{current.rates[service]:g}")
+            tk.Entry(input_frame, textvariable=rate_vars[service], font=('Arial', 10),
+                    width=8).grid(row=0, column=i * 2 + 1, sticky='w', padx=(0, 15))
+        
+        result_text = tk.Text(parent, font=('Courier', 10), bg='white', fg='#374151', wrap='none')
+        result_text.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        # Order history is loaded on the first run and reused while the window is open
+        history_cache = {}
+        
+        def run_simulation():
+            from pricing_simulator import OrderHistory, simulate
+            
+            try:
+                rates = {service: float(var.get()) for service, var in rate_vars.items()}
+            except ValueError:
+                messagebox.showerror("Validation Error", "❌ Please enter valid numbers for the proposed rates!")
+                return
+            
+            try:
+                if 'history' not in history_cache:
+                    history_cache['history'] = OrderHistory.from_db(self.DB_CONFIG)
+                history = history_cache['history']
+            except Exception as e:
+                messagebox.showerror("Database Error", f"Error loading order history: {str(e)}")
+                return
+            
+            result = simulate(history, rates, top_customers=10)
+            change = result.proposed_revenue - result.current_revenue
+            change_pct = change / result.current_revenue * 100 if result.current_revenue else 0
+            
+            lines = [
+                "🔮 WHAT-IF PRICING SIMULATION",
+                "=" * 72,
+                f"Orders re-priced:  {result.orders:,}",
+                f"Current revenue:   ₹{result.current_revenue:,.2f}",
+                f"Proposed revenue:  ₹{result.proposed_revenue:,.2f}",
+                f"Change:            ₹{change:+,.2f} ({change_pct:+.1f}%)",
+                "",
+                "BY MONTH",
+                "-" * 72,
+                f"{'Month':<10}{'Orders':>8}{'Current (₹)':>18}{'Proposed (₹)':>18}{'Change (₹)':>16}"
+            ]
+            for row in result.by_month.itertuples(index=False):
+                lines.append(f"{row.month:<10}{row.orders:>8,}{row.current_revenue:>18,.2f}"
+                             f"{row.proposed_revenue:>18,.2f}{row.delta:>+16,.2f}")
+            lines += [
+                "",
+                "CUSTOMERS MOST AFFECTED",
+                "-" * 72,
+                f"{'Customer':<24}{'Mobile':<14}{'Orders':>8}{'Current (₹)':>13}{'Change (₹)':>13}"
+            ]
+            for row in result.by_customer.itertuples(index=False):
+                lines.append(f"{str(row.customer_name)[:23]:<24}{str(row.customer)[:13]:<14}{row.orders:>8,}"
+                             f"{row.current_revenue:>13,.2f}{row.delta:>+13,.2f}")
+            
+            result_text.delete('1.0', tk.END)
+            result_text.insert('1.0', "\n".join(lines))
+        
+        tk.Button(input_frame, text="🔮 Simulate", command=run_simulation,
+                 font=('Arial', 10, 'bold'), bg='#8b5cf6', fg='white',
+                 relief='raised', bd=2, padx=15, pady=5).grid(row=0, column=len(SERVICES) * 2, padx=(10, 0))
+
+    @staticmethod
+    def embed_figure(fig, master):
+        """Draw a matplotlib figure into a Tk widget and release pyplot's reference to it"""
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        canvas = FigureCanvasTkAgg(fig, master)
+        canvas.draw()
+        # pyplot keeps every figure from plt.subplots() until it is closed; the
+        # canvas holds its own reference, so the figure is freed with the widget
+        plt.close(fig)
+        return canvas
+
     def create_summary_dashboard(self, parent, viz_type="Bar Charts"):
         """Create summary dashboard with key metrics"""
         # Get summary data
@@ -1459,6 +1728,7 @@ Total Amount: ₹{total_amount:.2f}
 
     def create_order_status_analysis(self, parent, viz_type="Bar Charts"):
         """Create order status analysis with different visualization types"""
+        import matplotlib.pyplot as plt
         # Status breakdown
         status_data = self.get_status_data()
         
@@ -1484,18 +1754,19 @@ Total Amount: ₹{total_amount:.2f}
             # These chart types don't make much sense for just two categories,
             # so we'll create a more detailed time-based status chart
             try:
-                conn = mysql.connector.connect(**self.DB_CONFIG)
+                conn = get_connection(self.DB_CONFIG)
                 cursor = conn.cursor()
                 
                 # Get status counts by date for the last 30 days
-                cursor.execute('''
-                    SELECT DATE(order_date) as date,
+                source = orders_source(cursor, date.today() - timedelta(days=30))
+                cursor.execute(f'''
+                    SELECT order_date as date,
                            SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END) as pending,
                            SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END) as collected
-                    FROM orders
+                    FROM {source}
                     WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-                    GROUP BY DATE(order_date)
-                    ORDER BY date
+                    GROUP BY order_date
+                    ORDER BY order_date
                 ''')
                 
                 results = cursor.fetchall()
@@ -1534,8 +1805,7 @@ Total Amount: ₹{total_amount:.2f}
                 ax.set_title('Order Status Distribution', fontsize=14, fontweight='bold')
         
         # Embed chart in tkinter
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
+        canvas = self.embed_figure(fig, parent)
         canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
 
     def create_time_based_reports(self, parent, viz_type="Bar Charts"):
@@ -1564,16 +1834,17 @@ Total Amount: ₹{total_amount:.2f}
     def get_summary_data(self):
         """Get summary statistics"""
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             
-            # Total orders and revenue
-            cursor.execute('''
+            # Total orders and revenue (in paise, an exact integer), archived orders included
+            source = orders_source(cursor)
+            cursor.execute(f'''
                 SELECT COUNT(*) as total_orders, 
-                       SUM(total_amount) as total_revenue,
+                       CAST(SUM(total_amount) * 100 AS SIGNED) as total_revenue_paise,
                        SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END) as pending_orders,
                        SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END) as collected_orders
-                FROM orders
+                FROM {source}
             ''')
             
             result = cursor.fetchone()
@@ -1581,7 +1852,7 @@ Total Amount: ₹{total_amount:.2f}
             
             return {
                 'total_orders': result[0] or 0,
-                'total_revenue': result[1] or 0,
+                'total_revenue': rupees(result[1] or 0),
                 'pending_orders': result[2] or 0,
                 'collected_orders': result[3] or 0
             }
@@ -1592,49 +1863,40 @@ Total Amount: ₹{total_amount:.2f}
     def get_status_data(self):
         """Get order status breakdown"""
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT 
-                    CASE 
-                        WHEN collection_date IS NULL THEN 'pending'
-                        ELSE 'collected'
-                    END as status,
-                    COUNT(*) as count
-                FROM orders
-                GROUP BY 
-                    CASE 
-                        WHEN collection_date IS NULL THEN 'pending'
-                        ELSE 'collected'
-                    END
+            # One aggregate row: grouping by a CASE expression needs a temporary table
+            source = orders_source(cursor)
+            cursor.execute(f'''
+                SELECT SUM(CASE WHEN collection_date IS NULL THEN 1 ELSE 0 END) as pending,
+                       SUM(CASE WHEN collection_date IS NOT NULL THEN 1 ELSE 0 END) as collected
+                FROM {source}
             ''')
             
-            results = cursor.fetchall()
+            pending, collected = cursor.fetchone()
             conn.close()
             
-            status_data = {'pending': 0, 'collected': 0}
-            for status, count in results:
-                status_data[status] = count
-            
-            return status_data
+            return {'pending': int(pending or 0), 'collected': int(collected or 0)}
         except Exception as e:
             print(f"Error getting status data: {e}")
             return {'pending': 0, 'collected': 0}
 
     def create_revenue_chart(self, parent):
         """Create revenue trend chart"""
+        import matplotlib.pyplot as plt
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             
-            # Get last 30 days revenue
-            cursor.execute('''
-                SELECT DATE(order_date) as date, SUM(total_amount) as revenue
-                FROM orders
+            # Get last 30 days revenue (paise per day)
+            source = orders_source(cursor, date.today() - timedelta(days=30))
+            cursor.execute(f'''
+                SELECT order_date as date, CAST(SUM(total_amount) * 100 AS SIGNED) as revenue_paise
+                FROM {source}
                 WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-                GROUP BY DATE(order_date)
-                ORDER BY date
+                GROUP BY order_date
+                ORDER BY order_date
             ''')
             
             results = cursor.fetchall()
@@ -1642,7 +1904,7 @@ Total Amount: ₹{total_amount:.2f}
             
             if results:
                 dates = [row[0] for row in results]
-                revenues = [float(row[1]) for row in results]
+                revenues = [row[1] / 100 for row in results]
                 
                 fig, ax = plt.subplots(figsize=(10, 6))
                 ax.plot(dates, revenues, marker='o', linewidth=2, markersize=6)
@@ -1654,8 +1916,7 @@ Total Amount: ₹{total_amount:.2f}
                 # Rotate x-axis labels
                 plt.setp(ax.get_xticklabels(), rotation=45)
                 
-                canvas = FigureCanvasTkAgg(fig, parent)
-                canvas.draw()
+                canvas = self.embed_figure(fig, parent)
                 canvas.get_tk_widget().pack(side='left', fill='both', expand=True, padx=(0, 10))
             
         except Exception as e:
@@ -1663,27 +1924,21 @@ Total Amount: ₹{total_amount:.2f}
 
     def create_service_chart(self, parent):
         """Create service breakdown chart"""
+        import matplotlib.pyplot as plt
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT 
-                    SUM(regular_clothes_kg) as regular,
-                    SUM(blankets_kg) as blankets,
-                    SUM(white_clothes_pieces) as white
-                FROM orders
-            ''')
-            
-            result = cursor.fetchone()
+            # One index range of order_items per service (archived orders included)
+            totals = service_totals(cursor)
             conn.close()
             
-            if result and any(result):
-                services = ['Regular Clothes', 'Blankets/Bedsheets', 'White Clothes']
-                quantities = [float(result[0] or 0), float(result[1] or 0), float(result[2] or 0)]
+            if totals:
+                services = [service.label for service, _, _ in totals]
+                quantities = [quantity for _, quantity, _ in totals]
                 
                 fig, ax = plt.subplots(figsize=(8, 6))
-                bars = ax.bar(services, quantities, color=['#3b82f6', '#10b981', '#f59e0b'])
+                bars = ax.bar(services, quantities, color=['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6', '#ef4444'])
                 ax.set_title('Service Usage Breakdown', fontsize=14, fontweight='bold')
                 ax.set_ylabel('Quantity')
                 
@@ -1693,8 +1948,7 @@ Total Amount: ₹{total_amount:.2f}
                     ax.text(bar.get_x() + bar.get_width()/2., height + max(quantities)*0.01,
                            f'{value:.1f}', ha='center', va='bottom')
                 
-                canvas = FigureCanvasTkAgg(fig, parent)
-                canvas.draw()
+                canvas = self.embed_figure(fig, parent)
                 canvas.get_tk_widget().pack(side='right', fill='both', expand=True, padx=(10, 0))
             
         except Exception as e:
@@ -1702,6 +1956,8 @@ Total Amount: ₹{total_amount:.2f}
 
     def update_revenue_chart(self, parent, days):
         """Update revenue chart based on selected period and visualization type"""
+        import matplotlib.pyplot as plt
+        from chart_resampling import BUCKET_DAYS, downsample
         # Clear existing chart
         for widget in self.revenue_chart_frame.winfo_children():
             widget.destroy()
@@ -1715,17 +1971,19 @@ Total Amount: ₹{total_amount:.2f}
             loading_label.pack(pady=20)
             self.revenue_chart_frame.update()
             
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor(buffered=True)
             
-            # Optimize query with index hint if available
+            # order_date is a DATE: grouping on the column itself lets order_date_idx
+            # serve the range, the grouping and the sort; revenue comes back in paise
+            source = orders_source(cursor, date.today() - timedelta(days=int(days)))
             cursor.execute(f'''
-                SELECT DATE(order_date) as date, SUM(total_amount) as revenue
-                FROM orders USE INDEX (order_date_idx)
-                WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL {days} DAY)
-                GROUP BY DATE(order_date)
-                ORDER BY date
-            ''')
+                SELECT order_date as date, CAST(SUM(total_amount) * 100 AS SIGNED) as revenue_paise
+                FROM {source}
+                WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
+                GROUP BY order_date
+                ORDER BY order_date
+            ''', (int(days),))
             
             results = cursor.fetchall()
             conn.close()
@@ -1735,22 +1993,24 @@ Total Amount: ₹{total_amount:.2f}
             
             if results:
                 dates = [row[0] for row in results]
-                revenues = [float(row[1]) for row in results]
-                
-                # Limit data points to improve performance
-                if len(dates) > 30:
-                    # If we have too many data points, sample them
-                    step = len(dates) // 30 + 1
-                    dates = dates[::step]
-                    revenues = revenues[::step]
+                revenues = [row[1] / 100 for row in results]
                 
                 # Use a smaller figure size for better performance
                 fig, ax = plt.subplots(figsize=(10, 5), dpi=80)
                 
+                # Fit the days into the plot width without dropping revenue: bars, areas and pies
+                # sum days into weeks or months, lines and scatter plots thin the daily points (LTTB)
+                kind = 'line' if viz_type in ("Line Charts", "Scatter Plots") else 'bar'
+                width_px = int(ax.get_position().width * fig.get_figwidth() * fig.dpi)
+                dates, revenues, period = downsample(dates, revenues, width_px, kind)
+                dates = list(dates.astype(object))
+                revenues = list(revenues)
+                per = {'day': '', 'week': ', per Week', 'month': ', per Month'}[period]
+                
                 # Create different chart types based on selection
                 if viz_type == "Bar Charts":
-                    ax.bar(dates, revenues, color='#3b82f6', alpha=0.8, width=0.7)
-                    ax.set_title(f'Revenue Trend - Bar Chart (Last {days} Days)', fontsize=12, fontweight='bold')
+                    ax.bar(dates, revenues, color='#3b82f6', alpha=0.8, width=0.7 * BUCKET_DAYS[period])
+                    ax.set_title(f'Revenue Trend - Bar Chart (Last {days} Days{per})', fontsize=12, fontweight='bold')
                 
                 elif viz_type == "Line Charts":
                     ax.plot(dates, revenues, marker='o', linewidth=1.5, markersize=5, color='#3b82f6')
@@ -1759,16 +2019,17 @@ Total Amount: ₹{total_amount:.2f}
                 elif viz_type == "Area Charts":
                     ax.fill_between(dates, revenues, color='#3b82f6', alpha=0.5)
                     ax.plot(dates, revenues, color='#3b82f6', linewidth=1.5)
-                    ax.set_title(f'Revenue Trend - Area Chart (Last {days} Days)', fontsize=12, fontweight='bold')
+                    ax.set_title(f'Revenue Trend - Area Chart (Last {days} Days{per})', fontsize=12, fontweight='bold')
                 
                 elif viz_type == "Pie Charts":
                     # For pie chart, we'll show revenue distribution by date
-                    # Only show the last 5 days in pie chart to avoid too many slices
+                    # Only show the last 5 days (or weeks, months) in pie chart to avoid too many slices
                     if len(dates) > 5:
                         dates = dates[-5:]
                         revenues = revenues[-5:]
-                    ax.pie(revenues, labels=[d.strftime('%m/%d') for d in dates], autopct='%1.1f%%', startangle=90)
-                    ax.set_title(f'Revenue Distribution - Pie Chart (Last {min(5, len(dates))} Days)', fontsize=12, fontweight='bold')
+                    label_format = '%b %Y' if period == 'month' else '%m/%d'
+                    ax.pie(revenues, labels=[d.strftime(label_format) for d in dates], autopct='%1.1f%%', startangle=90)
+                    ax.set_title(f'Revenue Distribution - Pie Chart (Last {len(dates)} {period.title()}s)', fontsize=12, fontweight='bold')
                 
                 elif viz_type == "Scatter Plots":
                     ax.scatter(dates, revenues, s=80, color='#3b82f6', alpha=0.7)
@@ -1790,8 +2051,7 @@ Total Amount: ₹{total_amount:.2f}
                 # Use tight layout to optimize space
                 plt.tight_layout()
                 
-                canvas = FigureCanvasTkAgg(fig, self.revenue_chart_frame)
-                canvas.draw()
+                canvas = self.embed_figure(fig, self.revenue_chart_frame)
                 canvas.get_tk_widget().pack(fill='both', expand=True)
             
         except Exception as e:
@@ -1812,39 +2072,37 @@ Total Amount: ₹{total_amount:.2f}
         self.time_report_frame.update()
         
         try:
-            conn = mysql.connector.connect(**self.DB_CONFIG)
+            conn = get_connection(self.DB_CONFIG)
             cursor = conn.cursor(buffered=True)
             
-            # Limit the amount of data to improve performance
+            # Days are grouped by the indexed order_date column and rolled up into
+            # weeks/months here; grouping by YEARWEEK() or DATE_FORMAT() needs a temporary table
+            today = date.today()
             if report_type == "daily":
-                cursor.execute('''
-                    SELECT DATE(order_date) as date, COUNT(*) as orders, SUM(total_amount) as revenue
-                    FROM orders USE INDEX (order_date_idx)
-                    WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-                    GROUP BY DATE(order_date)
-                    ORDER BY date DESC
-                    LIMIT 30
-                ''')
+                period, periods, since = 'day', 30, today - timedelta(days=30)
             elif report_type == "weekly":
-                cursor.execute('''
-                    SELECT YEARWEEK(order_date) as week, COUNT(*) as orders, SUM(total_amount) as revenue
-                    FROM orders USE INDEX (order_date_idx)
-                    WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 12 WEEK)
-                    GROUP BY YEARWEEK(order_date)
-                    ORDER BY week DESC
-                    LIMIT 12
-                ''')
+                period, periods, since = 'week', 12, today - timedelta(weeks=12)
             else:  # monthly
-                cursor.execute('''
-                    SELECT DATE_FORMAT(order_date, '%Y-%m') as month, COUNT(*) as orders, SUM(total_amount) as revenue
-                    FROM orders USE INDEX (order_date_idx)
-                    WHERE order_date >= DATE_SUB(CURDATE(), INTERVAL 12 MONTH)
-                    GROUP BY DATE_FORMAT(order_date, '%Y-%m')
-                    ORDER BY month DESC
-                    LIMIT 12
-                ''')
+                period, periods = 'month', 12
+                since = date(today.year - 1, today.month, min(today.day, 28))
             
-            results = cursor.fetchall()
+            source = orders_source(cursor, since)
+            cursor.execute(f'''
+                SELECT order_date, COUNT(*) as orders, CAST(SUM(total_amount) * 100 AS SIGNED) as revenue_paise
+                FROM {source}
+                WHERE order_date >= %s
+                GROUP BY order_date
+                ORDER BY order_date DESC
+            ''', (since,))
+            
+            totals = {}
+            for order_date, orders, revenue_paise in cursor.fetchall():
+                label = period_start(order_date, period)
+                if report_type == "weekly":
+                    label = f"Week of {label}"
+                count, paise = totals.get(label, (0, 0))
+                totals[label] = (count + orders, paise + revenue_paise)
+            results = [(label, count, amount) for label, (count, amount) in totals.items()][:periods]
             conn.close()
             
             # Remove loading message
@@ -1856,19 +2114,19 @@ Total Amount: ₹{total_amount:.2f}
                 report_text += "=" * 50 + "\n\n"
                 
                 total_orders = 0
-                total_revenue = 0
+                total_paise = 0
                 
                 for row in results:
                     period = row[0]
                     orders = row[1]
-                    revenue = float(row[2])
+                    revenue_paise = row[2]
                     
-                    report_text += f"{period}: {orders} orders, ₹{revenue:.2f}\n"
+                    report_text += f"{period}: {orders} orders, ₹{rupees(revenue_paise)}\n"
                     total_orders += orders
-                    total_revenue += revenue
+                    total_paise += revenue_paise
                 
                 report_text += "\n" + "=" * 50 + "\n"
-                report_text += f"Total: {total_orders} orders, ₹{total_revenue:.2f}\n"
+                report_text += f"Total: {total_orders} orders, ₹{rupees(total_paise)}\n"
                 
                 text_widget = tk.Text(self.time_report_frame, height=20, width=60, 
                                      font=('Courier', 10), bg='#f9fafb', fg='#374151')
@@ -1879,10 +2137,24 @@ Total Amount: ₹{total_amount:.2f}
         except Exception as e:
             print(f"Error updating time report: {e}")
 
+def parse_args():
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Express Wash desktop billing app")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="trace memory, widgets and figures and write a growth report")
+    parser.add_argument('--memory-interval', type=float, default=60,
+                        help="seconds between memory samples (default: 60)")
+    parser.add_argument('--memory-report', default='memory_report.txt', help="memory report file")
+    return parser.parse_args()
+
 def main():
     """Main function"""
+    args = parse_args()
     root = tk.Tk()
     app = ExpressWashApp(root)
+    if args.profile_memory:
+        from memory_monitor import MemoryMonitor
+        MemoryMonitor.attach(root, args.memory_interval, args.memory_report)
     root.mainloop()
 
 if __name__ == "__main__":